@@ -4,20 +4,36 @@ from typing import Optional, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from auth.cache import token_cache, token_key
 from auth.jwt_jose_provider import JoseJWTProvider
 from auth.jwt_provider import JWTProtocol
 from core.exceptions import InvalidCredentialsError
 from core.settings import Settings
 from schemas.auth_schemas import TokenData
 
+SUPER_USER_ROLE = "super_user"
+USER_ROLE = "user"
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/user/login")
 jwt_provider: JWTProtocol = JoseJWTProvider(
     algorithm=Settings.ALGORITHM, secret_key=Settings.SECRET_KEY
 )
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(
+    data: dict,
+    expires_delta: Optional[timedelta] = None,
+    is_super_user: Optional[bool] = None,
+) -> str:
     to_encode = data.copy()
+    if is_super_user is not None:
+        # signed role claim, trusted while "ver" matches Settings.TOKEN_VERSION
+        to_encode.update(
+            {
+                "role": SUPER_USER_ROLE if is_super_user else USER_ROLE,
+                "ver": Settings.TOKEN_VERSION,
+            }
+        )
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
@@ -36,6 +52,12 @@ def verify_token(token: str) -> Union[TokenData, None]:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # entries expire together with the token, so a hit is always still valid
+    cache_key = token_key(token)
+    token_data = token_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+
     try:
         payload = jwt_provider.decode(token=token)
         email: str = payload.get("user")
@@ -56,7 +78,10 @@ def verify_token(token: str) -> Union[TokenData, None]:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        token_data = TokenData(email=email)
+        token_data = TokenData(
+            email=email, role=payload.get("role"), version=payload.get("ver")
+        )
+        token_cache.set(cache_key, token_data, expires_at=parsed_expire.timestamp())
         return token_data
     except InvalidCredentialsError:
         raise credentials_exception
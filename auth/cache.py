@@ -0,0 +1,25 @@
+"""Caches for decoded access tokens and super user lookups."""
+
+import hashlib
+
+from core.cache import TTLCache
+from core.settings import Settings
+
+# token digest -> TokenData, never kept past the token's own expiry
+token_cache = TTLCache(
+    "tokens", maxsize=Settings.AUTH_CACHE_SIZE, ttl=Settings.AUTH_CACHE_TTL
+)
+
+# email -> is_super_user
+principal_cache = TTLCache(
+    "principals", maxsize=Settings.AUTH_CACHE_SIZE, ttl=Settings.AUTH_CACHE_TTL
+)
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def invalidate_user(email: str) -> None:
+    """Forget everything cached about the user with ``email``."""
+    principal_cache.delete(email)
@@ -1,11 +1,148 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
 from passlib.context import CryptContext
 
+from core.settings import Settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def verify_password(plain_password, hashed_password):
+def _verify(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password):
+def _hash(password):
     return pwd_context.hash(password)
+
+
+class HashingPoolFullError(Exception):
+    """Raised when ``queue_limit`` hashes are already waiting for a worker."""
+
+
+class HashingPool:
+    """Bounded worker pool for bcrypt hashing and verification.
+
+    At most ``workers`` hashes run at once; further calls queue inside the
+    executor instead of piling up on the event loop or the request threadpool.
+    Once ``queue_limit`` of them are waiting, new calls are refused with
+    ``HashingPoolFullError`` rather than queued for longer than a client would
+    wait.
+    """
+
+    def __init__(self, mode: str, workers: int, queue_limit: int) -> None:
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing pool mode: {mode}")
+
+        self.mode = mode
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected = 0
+        self.completed = 0
+        self.total_latency = 0.0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        # created lazily so importing the app doesn't spawn workers
+        with self._lock:
+            if self._executor is None:
+                executor_class = (
+                    ProcessPoolExecutor
+                    if self.mode == "process"
+                    else ThreadPoolExecutor
+                )
+                self._executor = executor_class(max_workers=self.workers)
+            return self._executor
+
+    def submit(self, function: Callable, *args: Any) -> Future:
+        submitted = time.perf_counter()
+
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise HashingPoolFullError(
+                    f"{self.queue_limit} password hashes are already queued"
+                )
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        def done(_: Future) -> None:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_latency += time.perf_counter() - submitted
+
+        future = self.executor.submit(function, *args)
+        future.add_done_callback(done)
+        return future
+
+    def run(self, function: Callable, *args: Any) -> Any:
+        return self.submit(function, *args).result()
+
+    async def run_async(self, function: Callable, *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(function, *args))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "queue_depth": max(self.in_flight - self.workers, 0),
+                "queue_limit": self.queue_limit,
+                "max_in_flight": self.max_in_flight,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "avg_latency_ms": (
+                    self.total_latency / self.completed * 1000
+                    if self.completed
+                    else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+hashing_pool = HashingPool(
+    Settings.HASHING_POOL_MODE,
+    Settings.HASHING_POOL_WORKERS,
+    Settings.HASHING_QUEUE_LIMIT,
+)
+
+
+def verify_password(plain_password, hashed_password):
+    return hashing_pool.run(_verify, plain_password, hashed_password)
+
+
+def get_password_hash(password):
+    return hashing_pool.run(_hash, password)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await hashing_pool.run_async(_verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password):
+    return await hashing_pool.run_async(_hash, password)
+
+
+async def get_password_hashes_async(passwords: Sequence[str]) -> List[str]:
+    # a worker count at a time, so that bulk creation leaves the queue to others
+    hashes = []
+
+    for start in range(0, len(passwords), hashing_pool.workers):
+        chunk = passwords[start : start + hashing_pool.workers]
+        hashes.extend(await asyncio.gather(*map(get_password_hash_async, chunk)))
+
+    return hashes
@@ -0,0 +1,7 @@
+"""Throughput and latency benchmarks.
+
+The database (SQLite by default, or a local PostgreSQL) is seeded from
+``mock_data`` and request mixes are replayed against the app in process.
+RPS and p50/p95/p99 latencies per endpoint are written to, or compared
+with, a JSON baseline. See ``python -m benchmarks --help``.
+"""
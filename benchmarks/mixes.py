@@ -0,0 +1,117 @@
+"""Request mixes replayed against the app.
+
+A mix is a list of weighted endpoints. Each endpoint builds one request
+from the seeded rows; its name is the route template it exercises, which is
+also the key of its results in the baseline file.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.seed import PASSWORD, Seeded
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    weight: int
+    build: Callable[[random.Random, Seeded], Request]
+
+
+def _prefix(rng: random.Random, seeded: Seeded) -> str:
+    return rng.choice(seeded.titles)[:3]
+
+
+def _word(rng: random.Random, seeded: Seeded) -> str:
+    return rng.choice(rng.choice(seeded.titles).split())
+
+
+def _course(rng: random.Random, seeded: Seeded) -> dict:
+    return {
+        "owner": "benchmark",
+        "title": f"Benchmark {rng.randrange(1_000_000)}",
+        "slug": "benchmark",
+        "overview": "Benchmark course",
+        "module": {"title": "Benchmark module", "description": "Benchmark"},
+        "subject": {"title": "Benchmark subject", "slug": "benchmark"},
+    }
+
+
+READ = [
+    Endpoint("GET /courses", 20, lambda rng, s: ("GET", "/courses", {})),
+    Endpoint(
+        "GET /courses/{course_id}",
+        30,
+        lambda rng, s: ("GET", f"/courses/{rng.choice(s.course_ids)}", {}),
+    ),
+    Endpoint(
+        "GET /courses/search",
+        10,
+        lambda rng, s: ("GET", "/courses/search", {"params": {"q": _word(rng, s)}}),
+    ),
+    Endpoint(
+        "POST /courses/batch_get",
+        5,
+        lambda rng, s: (
+            "POST",
+            "/courses/batch_get",
+            {"json": {"ids": rng.sample(s.course_ids, min(50, len(s.course_ids)))}},
+        ),
+    ),
+    Endpoint(
+        "GET /autocomplete",
+        15,
+        lambda rng, s: ("GET", "/autocomplete", {"params": {"q": _prefix(rng, s)}}),
+    ),
+    Endpoint("GET /modules", 5, lambda rng, s: ("GET", "/modules", {})),
+    Endpoint(
+        "GET /modules/{module_id}",
+        5,
+        lambda rng, s: ("GET", f"/modules/{rng.choice(s.module_ids)}", {}),
+    ),
+    Endpoint("GET /subjects", 5, lambda rng, s: ("GET", "/subjects", {})),
+    Endpoint(
+        "GET /subjects/{subject_id}",
+        5,
+        lambda rng, s: ("GET", f"/subjects/{rng.choice(s.subject_ids)}", {}),
+    ),
+]
+
+WRITE = [
+    Endpoint(
+        "POST /courses",
+        10,
+        lambda rng, s: ("POST", "/courses", {"json": _course(rng, s)}),
+    ),
+    Endpoint(
+        "PUT /courses/{course_id}",
+        10,
+        lambda rng, s: (
+            "PUT",
+            f"/courses/{rng.choice(s.course_ids)}",
+            {"json": {"overview": f"Updated {rng.randrange(1_000_000)}"}},
+        ),
+    ),
+]
+
+AUTH = [
+    Endpoint(
+        "POST /user/login",
+        1,
+        lambda rng, s: (
+            "POST",
+            "/user/login",
+            {"data": {"username": rng.choice(s.emails), "password": PASSWORD}},
+        ),
+    ),
+]
+
+MIXES: Dict[str, List[Endpoint]] = {
+    "read": READ,
+    "write": WRITE,
+    "auth": AUTH,
+    "mixed": [*READ, *WRITE, *AUTH],
+}
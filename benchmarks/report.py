@@ -0,0 +1,76 @@
+"""Baseline files and regression checks.
+
+A baseline holds, for every endpoint of a run, its request and error
+counts, RPS and p50/p95/p99 latencies. A later run regresses an endpoint
+when its RPS dropped, or its p95 latency grew, by more than ``threshold``
+(a fraction) of the baseline's, or when a larger share of its requests
+failed. p50 and p99 are reported only: the former rarely moves alone and
+the latter is too noisy on short runs to gate on.
+"""
+
+import json
+from typing import Any, Dict, List
+
+# latency changes smaller than this are noise whatever their ratio
+MIN_LATENCY_DELTA_MS = 1.0
+
+
+def write_baseline(path: str, meta: Dict[str, Any], endpoints: Dict[str, Any]) -> None:
+    with open(path, "w") as file:
+        baseline = {"meta": meta, "endpoints": endpoints}
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def read_baseline(path: str) -> Dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def regressions(
+    baseline: Dict[str, Any], endpoints: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Descriptions of the endpoints that regressed against ``baseline``."""
+    found = []
+
+    for name, current in sorted(endpoints.items()):
+        previous = baseline["endpoints"].get(name)
+
+        if previous is None:
+            continue
+
+        if current["rps"] < previous["rps"] * (1 - threshold):
+            found.append(
+                f"{name}: {current['rps']:.1f} RPS, baseline {previous['rps']:.1f}"
+            )
+
+        p95, baseline_p95 = current["p95_ms"], previous["p95_ms"]
+        if (
+            p95 > baseline_p95 * (1 + threshold)
+            and p95 - baseline_p95 > MIN_LATENCY_DELTA_MS
+        ):
+            found.append(f"{name}: p95 {p95:.2f} ms, baseline {baseline_p95:.2f} ms")
+
+        error_rate = current["errors"] / current["requests"]
+        baseline_error_rate = previous["errors"] / previous["requests"]
+        if error_rate > baseline_error_rate:
+            found.append(
+                f"{name}: {error_rate:.1%} errors, baseline {baseline_error_rate:.1%}"
+            )
+
+    return found
+
+
+def format_table(endpoints: Dict[str, Any]) -> str:
+    header = f"{'endpoint':<32} {'requests':>8} {'errors':>6} {'rps':>9} "
+    header += f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    lines = [header]
+
+    for name, stats in sorted(endpoints.items()):
+        lines.append(
+            f"{name:<32} {stats['requests']:>8} {stats['errors']:>6} "
+            f"{stats['rps']:>9.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f}"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+"""Replay a request mix against the app in process.
+
+``concurrency`` clients share one ``httpx.AsyncClient`` over an ASGI
+transport, so requests go through the whole middleware and routing stack
+without a server or a socket. Each client draws endpoints by weight from
+its own seeded random generator, which makes runs repeatable.
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+import httpx
+
+from auth.authenticate import create_access_token
+from benchmarks.mixes import Endpoint
+from benchmarks.seed import Seeded
+from core.instrumentation import percentile
+
+
+class Results:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.seconds = 0.0
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(name, []).append(seconds)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Requests, errors, RPS and latency percentiles in ms per endpoint."""
+        summary = {}
+
+        for name, latencies in sorted(self.latencies.items()):
+            ordered = sorted(latencies)
+            summary[name] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(name, 0),
+                "rps": len(ordered) / self.seconds if self.seconds else 0.0,
+                **{
+                    f"p{percent}_ms": percentile(ordered, percent) * 1000
+                    for percent in (50, 95, 99)
+                },
+            }
+
+        return summary
+
+
+async def _client(
+    client: httpx.AsyncClient,
+    mix: List[Endpoint],
+    seeded: Seeded,
+    results: Results,
+    rng: random.Random,
+    deadline: float,
+    requests: int,
+) -> None:
+    weights = [endpoint.weight for endpoint in mix]
+    sent = 0
+
+    while time.perf_counter() < deadline and sent < requests:
+        (endpoint,) = rng.choices(mix, weights)
+        method, url, options = endpoint.build(rng, seeded)
+
+        start = time.perf_counter()
+        response = await client.request(method, url, **options)
+        results.record(endpoint.name, time.perf_counter() - start, response.is_success)
+        sent += 1
+
+
+async def run(
+    app,
+    mix: List[Endpoint],
+    seeded: Seeded,
+    concurrency: int,
+    seconds: float,
+    requests: int,
+    seed: int,
+) -> Results:
+    """Replay ``mix`` for ``seconds`` or ``requests`` per client, first reached."""
+    token = create_access_token(data={"user": "benchmark"}, is_super_user=True)
+    results = Results()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _client(
+                    client,
+                    mix,
+                    seeded,
+                    results,
+                    random.Random(seed + number),
+                    start + seconds,
+                    requests,
+                )
+                for number in range(concurrency)
+            )
+        )
+        results.seconds = time.perf_counter() - start
+
+    return results
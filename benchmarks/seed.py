@@ -0,0 +1,99 @@
+"""Seed the benchmark database from ``mock_data``.
+
+At scale ``n`` every mock course and user is inserted ``n`` times, with a
+copy number in the titles, slugs and emails so that the copies don't
+collide. Courses go through the bulk import used by ``/courses/course_many``
+and users share a single bcrypt hash, computed once.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List
+
+from sqlalchemy import insert
+
+from auth.hashing import get_password_hash
+from crud.aio.courses_import import db_import_courses
+from models.session import AsyncSessionLocal
+from models.user_models import UserModel
+from schemas import CourseBase
+from utils import generate_id
+
+MOCK_DATA = os.path.join(os.path.dirname(os.path.dirname(__file__)), "mock_data")
+COURSES_FILE = os.path.join(MOCK_DATA, "MOCK_DATA_sample_courses.json")
+USERS_FILE = os.path.join(MOCK_DATA, "MOCK_DATA_sample_users.json")
+PASSWORD = "benchmark-password"
+BATCH_SIZE = 5000
+
+
+@dataclass
+class Seeded:
+    """IDs and text of the seeded rows that request mixes draw from."""
+
+    course_ids: List[str] = field(default_factory=list)
+    module_ids: List[str] = field(default_factory=list)
+    subject_ids: List[str] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+
+
+def _load(path: str) -> list:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _copy(course: dict, copy: int) -> CourseBase:
+    if copy == 0:
+        return CourseBase.model_validate(course)
+
+    subject = course["subject"]
+    return CourseBase.model_validate(
+        {
+            **course,
+            "title": f"{course['title']} {copy}",
+            "slug": f"{course['slug']} {copy}",
+            "subject": {**subject, "title": f"{subject['title']} {copy}"},
+        }
+    )
+
+
+async def seed(scale: int) -> Seeded:
+    seeded = Seeded()
+    mock_courses = _load(COURSES_FILE)
+    courses = [_copy(course, copy) for copy in range(scale) for course in mock_courses]
+
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(courses), BATCH_SIZE):
+            batch = courses[start : start + BATCH_SIZE]
+            created, _ = await db_import_courses(db, batch)
+
+            for course in created:
+                seeded.course_ids.append(course["id"])
+                seeded.module_ids.append(course["module_id"])
+                seeded.subject_ids.append(course["subject_id"])
+                seeded.titles.append(course["title"])
+
+        password = get_password_hash(PASSWORD)
+        users = []
+        for copy in range(scale):
+            for user in _load(USERS_FILE):
+                name, domain = user["email"].split("@")
+                users.append(
+                    {
+                        "id": generate_id(),
+                        "first_name": user["first_name"],
+                        "last_name": user["last_name"],
+                        "email": f"{name}+{copy}@{domain}",
+                        "password": password,
+                        "job_title": user["job_title"],
+                        "is_super_user": user["is_super_user"] == "true",
+                    }
+                )
+
+        for start in range(0, len(users), BATCH_SIZE):
+            await db.execute(insert(UserModel), users[start : start + BATCH_SIZE])
+        await db.commit()
+
+    seeded.emails = [user["email"] for user in users]
+    return seeded
@@ -0,0 +1,140 @@
+"""In-process prefix index for type-ahead over titles."""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (id, title) of a change, with no title for a removal
+Change = Tuple[str, Optional[str]]
+
+
+def normalize(text: str) -> str:
+    """Case fold and collapse whitespace, for titles and prefixes alike."""
+    return " ".join(text.casefold().split())
+
+
+class PrefixIndex:
+    """Thread safe sorted array of ``(normalized title, id)`` pairs.
+
+    A lookup is a binary search for the prefix followed by a scan of the
+    entries that start with it, so it costs O(log n + limit) whatever the
+    number of titles. Additions and removals shift the array in place, a
+    ``memmove`` that stays well under a millisecond at a million entries.
+
+    A rebuild reads its rows while the index keeps serving and changing, so
+    ``start_rebuild`` records the changes made meanwhile and ``rebuild``
+    replays them over the rows it was given.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._entries: List[Tuple[str, str]] = []
+        self._titles: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # wall clock time of the last rebuild, None until the first one
+        self.built_at: Optional[float] = None
+        # the latest rebuild started, and the changes made since it started
+        self._generation = 0
+        self._changes: Optional[List[Change]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, id_: str) -> None:
+        title = self._titles.pop(id_, None)
+
+        if title is not None:
+            entry = (normalize(title), id_)
+            del self._entries[bisect_left(self._entries, entry)]
+
+    def _add(self, id_: str, title: str) -> None:
+        entry = (normalize(title), id_)
+
+        self._remove(id_)
+        self._entries.insert(bisect_left(self._entries, entry), entry)
+        self._titles[id_] = title
+
+    def _change(self, id_: str, title: Optional[str]) -> None:
+        with self._lock:
+            if title is None:
+                self._remove(id_)
+            else:
+                self._add(id_, title)
+
+            if self._changes is not None:
+                self._changes.append((id_, title))
+
+    def add(self, id_: str, title: str) -> None:
+        """Index a title, replacing the previous title with the same id."""
+        self._change(id_, title)
+
+    def remove(self, id_: str) -> None:
+        self._change(id_, None)
+
+    def start_rebuild(self) -> int:
+        """Record changes from now on, for the rebuild from rows read after this.
+
+        Returns the generation to pass to ``rebuild``.
+        """
+        with self._lock:
+            self._generation += 1
+            self._changes = []
+            return self._generation
+
+    def rebuild(
+        self, rows: Iterable[Tuple[str, str]], generation: Optional[int] = None
+    ) -> None:
+        """Replace the whole index with ``(id, title)`` rows.
+
+        With the ``generation`` of ``start_rebuild``, the changes made since
+        are applied on top of the rows, and a rebuild overtaken by a later one
+        is dropped.
+        """
+        titles = {id_: title for id_, title in rows}
+        entries = sorted((normalize(title), id_) for id_, title in titles.items())
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries, self._titles = entries, titles
+
+            if generation is not None:
+                for id_, title in self._changes or ():
+                    if title is None:
+                        self._remove(id_)
+                    else:
+                        self._add(id_, title)
+                self._changes = None
+
+            self.built_at = time.time()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries, self._titles = [], {}
+            self.built_at = None
+            # rebuilds in progress read rows from before the clear
+            self._generation += 1
+            self._changes = None
+
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, str, str]]:
+        """Up to ``limit`` ``(normalized title, id, title)`` starting with ``prefix``.
+
+        Matches come in alphabetical order of their normalized title.
+        """
+        prefix = normalize(prefix)
+        matches: List[Tuple[str, str, str]] = []
+
+        if not prefix:
+            return matches
+
+        with self._lock:
+            position = bisect_left(self._entries, (prefix,))
+
+            for key, id_ in self._entries[position : position + limit]:
+                if not key.startswith(prefix):
+                    break
+                matches.append((key, id_, self._titles[id_]))
+
+        return matches
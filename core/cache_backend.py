@@ -0,0 +1,63 @@
+"""Pluggable key/value backends for cached responses."""
+
+import time
+from typing import Optional, Protocol
+
+from core.cache import TTLCache
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per process LRU backend. Invalidations are not seen by other workers."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.cache = TTLCache("responses", maxsize=maxsize, ttl=float("inf"))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.cache.set(key, value, expires_at=time.time() + ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend for any client exposing the ``redis.asyncio`` get/set/delete API."""
+
+    def __init__(self, client, prefix: str = "courses-api:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+
+def create_cache_backend(url: Optional[str], maxsize: int) -> CacheBackend:
+    if not url:
+        return MemoryCacheBackend(maxsize=maxsize)
+
+    try:
+        from redis import asyncio as redis
+    except ImportError as exc:
+        raise RuntimeError(
+            "RESPONSE_CACHE_URL is set but the redis package is not installed"
+        ) from exc
+
+    return RedisCacheBackend(redis.from_url(url))
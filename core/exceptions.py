@@ -7,3 +7,15 @@ class InvalidCredentialsError(Exception):
     """
     Raised when an invalid username or password is provided.
     """
+
+
+class InvalidCursorError(Exception):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+class InvalidPayloadError(Exception):
+    """
+    Raised when a streamed request body is not valid JSON or NDJSON.
+    """
@@ -0,0 +1,155 @@
+"""Per-request timing and SQL query accounting.
+
+Each request gets a ``RequestTimings`` in a context variable. Cursor
+execution hooks on the engines add every statement's duration and row count
+to it, serializers add the time they spend encoding, and once the response
+is sent the totals are folded into per-route samples for percentiles.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.settings import Settings
+
+METRICS = ("wall_ms", "db_ms", "queries", "rows", "serialization_ms")
+PERCENTILES = (50, 95, 99)
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_name(scope: Dict[str, Any]) -> str:
+    """Method and path template of the route that handled ``scope``."""
+    # set by the router once a route matches
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+
+    return f"{scope['method']} {path}" if path else UNMATCHED_ROUTE
+
+
+class RequestTimings:
+    __slots__ = ("scope", "db", "queries", "rows", "serialization")
+
+    def __init__(self, scope: Optional[Dict[str, Any]] = None) -> None:
+        # ASGI scope of the request, for its route
+        self.scope = scope
+        self.db = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.serialization = 0.0
+
+    def server_timing(self, wall: float) -> str:
+        """``Server-Timing`` header value, durations in milliseconds."""
+        return (
+            f"app;dur={wall * 1000:.2f}, "
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f"ser;dur={self.serialization * 1000:.2f}"
+        )
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+def record_serialization(seconds: float) -> None:
+    timings = current_timings.get()
+
+    if timings is not None:
+        timings.serialization += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    timings = current_timings.get()
+
+    if timings is not None:
+        timings.db += elapsed
+        timings.queries += 1
+        # rows returned or affected; SQLite reports -1 for SELECT statements
+        timings.rows += max(cursor.rowcount, 0)
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Account the statements run by ``engine`` to the current request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def percentile(ordered: List[float], percent: int) -> float:
+    """Nearest rank ``percent`` percentile of the sorted ``ordered``."""
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class RouteStats:
+    """The last ``samples`` requests of each route, for percentiles.
+
+    Routes are keyed by method and path template (``GET /courses/{course_id}``)
+    so that every ID doesn't get a series of its own.
+    """
+
+    def __init__(self, samples: int) -> None:
+        self.samples = samples
+        self._routes: Dict[str, Tuple[List[int], Deque[Tuple[float, ...]]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, wall: float, timings: RequestTimings) -> None:
+        sample = (
+            wall * 1000,
+            timings.db * 1000,
+            timings.queries,
+            timings.rows,
+            timings.serialization * 1000,
+        )
+
+        with self._lock:
+            count, samples = self._routes.setdefault(
+                route, ([0], deque(maxlen=self.samples))
+            )
+            count[0] += 1
+            samples.append(sample)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            routes = {
+                route: (count[0], list(samples))
+                for route, (count, samples) in self._routes.items()
+            }
+
+        stats = []
+        for route, (count, samples) in sorted(routes.items()):
+            entry: Dict[str, Any] = {
+                "route": route,
+                "count": count,
+                "samples": len(samples),
+            }
+            for metric, values in zip(METRICS, zip(*samples)):
+                ordered = sorted(values)
+                entry[metric] = {
+                    f"p{percent}": percentile(ordered, percent)
+                    for percent in PERCENTILES
+                }
+                entry[metric]["max"] = ordered[-1]
+            stats.append(entry)
+
+        return stats
+
+
+route_stats = RouteStats(Settings.REQUEST_STATS_SAMPLES)
@@ -0,0 +1,454 @@
+"""Background jobs for bulk work that should not hold the request open.
+
+A job is a list of batches of JSON rows. Workers claim batches one at a time
+from a ``JobStore`` and hand them, with a fresh database session, to the
+handler registered for the job's kind. The in-memory store is per process
+and loses queued work on restart; the SQLite store survives restarts and can
+be shared by the workers of several processes on one host. Its claims are
+leases that the worker renews while it runs the batch, so a batch whose
+worker died is claimed again once its lease expires.
+
+Jobs of a kind registered as ``pinned`` only run in the process that
+submitted them, for rows that refer to data kept in that process' memory.
+They are never finished if the process stops first.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from collections import deque
+from contextlib import closing
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+Rows = List[Dict[str, Any]]
+# job id, job kind, batch number, rows
+Batch = Tuple[str, str, int, Rows]
+Handler = Callable[[Any, Rows], Awaitable[int]]
+
+
+class JobStore(Protocol):
+    # seconds a claim lasts unless renewed, None when claims never expire
+    lease: Optional[float]
+
+    async def create(
+        self, kind: str, batches: List[Rows], owner: Optional[str] = None
+    ) -> str: ...
+
+    # batches of jobs created with an owner are only claimed by that owner
+    async def claim(self, owner: str) -> Optional[Batch]: ...
+
+    async def renew(self, job_id: str, number: int) -> None: ...
+
+    async def finish_batch(
+        self, job_id: str, number: int, rows: int, error: Optional[str] = None
+    ) -> None: ...
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]: ...
+
+
+def _new_job(job_id: str, kind: str, batches: List[Rows]) -> Dict[str, Any]:
+    created = time.time()
+
+    return {
+        "id": job_id,
+        "kind": kind,
+        "rows_total": sum(len(batch) for batch in batches),
+        "rows_done": 0,
+        "batches_total": len(batches),
+        "batches_done": 0,
+        "errors": [],
+        "created": created,
+        "started": None,
+        # a job without rows has nothing left to do
+        "finished": None if batches else created,
+    }
+
+
+class MemoryJobStore(JobStore):
+    # batches are lost with the process anyway, and only its workers see them
+    lease = None
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.pending: Deque[Batch] = deque()
+
+    async def create(
+        self, kind: str, batches: List[Rows], owner: Optional[str] = None
+    ) -> str:
+        job_id = str(uuid.uuid4())
+        self.jobs[job_id] = _new_job(job_id, kind, batches)
+        self.pending.extend(
+            (job_id, kind, number, rows) for number, rows in enumerate(batches)
+        )
+        return job_id
+
+    async def claim(self, owner: str) -> Optional[Batch]:
+        if not self.pending:
+            return None
+
+        batch = self.pending.popleft()
+        job = self.jobs[batch[0]]
+        job["started"] = job["started"] or time.time()
+        return batch
+
+    async def renew(self, job_id: str, number: int) -> None:
+        pass
+
+    async def finish_batch(
+        self, job_id: str, number: int, rows: int, error: Optional[str] = None
+    ) -> None:
+        job = self.jobs[job_id]
+        job["rows_done"] += rows
+        job["batches_done"] += 1
+
+        if error is not None:
+            job["errors"].append(error)
+        if job["batches_done"] == job["batches_total"]:
+            job["finished"] = time.time()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return None if job is None else {**job, "errors": list(job["errors"])}
+
+
+class SQLiteJobStore(JobStore):
+    """Job store in a SQLite file, using the standard library driver.
+
+    Each call opens its own connection in a worker thread; claims run under
+    ``BEGIN IMMEDIATE`` so concurrent workers never take the same batch. A
+    claim records when it was taken or last renewed and a batch claimed more
+    than ``lease`` seconds ago is up for grabs again.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS job (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            rows_total INTEGER NOT NULL,
+            rows_done INTEGER NOT NULL DEFAULT 0,
+            batches_total INTEGER NOT NULL,
+            batches_done INTEGER NOT NULL DEFAULT 0,
+            errors TEXT NOT NULL DEFAULT '[]',
+            created REAL NOT NULL,
+            started REAL,
+            finished REAL,
+            owner TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS job_batch (
+            job_id TEXT NOT NULL REFERENCES job (id),
+            number INTEGER NOT NULL,
+            rows TEXT NOT NULL,
+            claimed INTEGER NOT NULL DEFAULT 0,
+            claimed_at REAL,
+            PRIMARY KEY (job_id, number)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_job_batch_claimed ON job_batch (claimed)",
+    )
+
+    def __init__(self, path: str, lease: float = 60.0) -> None:
+        self.path = path
+        self.lease = lease
+
+        with self._connect() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+            # files created before claims were leases, or jobs could be pinned
+            for table, column, type_ in (
+                ("job_batch", "claimed_at", "REAL"),
+                ("job", "owner", "TEXT"),
+            ):
+                columns = {
+                    row["name"]
+                    for row in connection.execute(f"PRAGMA table_info({table})")
+                }
+                if column not in columns:
+                    connection.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {column} {type_}"
+                    )
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        # autocommit mode: transactions are opened explicitly, and closing the
+        # connection rolls back one left open by an error
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return closing(connection)
+
+    def _create(self, kind: str, batches: List[Rows], owner: Optional[str]) -> str:
+        job = _new_job(str(uuid.uuid4()), kind, batches)
+
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT INTO job (id, kind, rows_total, batches_total, created, "
+                "finished, owner) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job["id"],
+                    kind,
+                    job["rows_total"],
+                    job["batches_total"],
+                    job["created"],
+                    job["finished"],
+                    owner,
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO job_batch (job_id, number, rows) VALUES (?, ?, ?)",
+                [
+                    (job["id"], number, json.dumps(rows))
+                    for number, rows in enumerate(batches)
+                ],
+            )
+            connection.execute("COMMIT")
+
+        return job["id"]
+
+    def _claim(self, owner: str) -> Optional[Batch]:
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT job_batch.job_id, job.kind, job_batch.number, job_batch.rows "
+                "FROM job_batch JOIN job ON job.id = job_batch.job_id "
+                "WHERE (job_batch.claimed = 0 "
+                "OR coalesce(job_batch.claimed_at, 0) < ?) "
+                "AND (job.owner IS NULL OR job.owner = ?) "
+                "ORDER BY job_batch.rowid LIMIT 1",
+                (now - self.lease, owner),
+            ).fetchone()
+
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+
+            connection.execute(
+                "UPDATE job_batch SET claimed = 1, claimed_at = ? "
+                "WHERE job_id = ? AND number = ?",
+                (now, row["job_id"], row["number"]),
+            )
+            connection.execute(
+                "UPDATE job SET started = coalesce(started, ?) WHERE id = ?",
+                (now, row["job_id"]),
+            )
+            connection.execute("COMMIT")
+
+        return row["job_id"], row["kind"], row["number"], json.loads(row["rows"])
+
+    def _renew(self, job_id: str, number: int) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE job_batch SET claimed_at = ? WHERE job_id = ? AND number = ?",
+                (time.time(), job_id, number),
+            )
+
+    def _finish_batch(
+        self, job_id: str, number: int, rows: int, error: Optional[str]
+    ) -> None:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # processed rows are not needed to report on the job
+            deleted = connection.execute(
+                "DELETE FROM job_batch WHERE job_id = ? AND number = ?",
+                (job_id, number),
+            ).rowcount
+
+            # the lease expired and another worker already finished the batch
+            if not deleted:
+                connection.execute("COMMIT")
+                return
+
+            job = connection.execute(
+                "SELECT batches_done, batches_total, errors FROM job WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            errors = json.loads(job["errors"]) + ([error] if error else [])
+            batches_done = job["batches_done"] + 1
+            finished = time.time() if batches_done == job["batches_total"] else None
+
+            connection.execute(
+                "UPDATE job SET rows_done = rows_done + ?, batches_done = ?, "
+                "errors = ?, finished = ? WHERE id = ?",
+                (rows, batches_done, json.dumps(errors), finished, job_id),
+            )
+            connection.execute("COMMIT")
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT * FROM job WHERE id = ?", (job_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        job = {**dict(row), "errors": json.loads(row["errors"])}
+        del job["owner"]
+        return job
+
+    async def create(
+        self, kind: str, batches: List[Rows], owner: Optional[str] = None
+    ) -> str:
+        return await asyncio.to_thread(self._create, kind, batches, owner)
+
+    async def claim(self, owner: str) -> Optional[Batch]:
+        return await asyncio.to_thread(self._claim, owner)
+
+    async def renew(self, job_id: str, number: int) -> None:
+        await asyncio.to_thread(self._renew, job_id, number)
+
+    async def finish_batch(
+        self, job_id: str, number: int, rows: int, error: Optional[str] = None
+    ) -> None:
+        await asyncio.to_thread(self._finish_batch, job_id, number, rows, error)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, job_id)
+
+
+def create_job_store(backend: str, path: str, lease: float = 60.0) -> JobStore:
+    if backend == "sqlite":
+        return SQLiteJobStore(path, lease)
+    return MemoryJobStore()
+
+
+class JobQueue:
+    """Runs the batches of submitted jobs on a fixed number of asyncio workers.
+
+    Workers start with the application, or on the first submission in an
+    event loop that has none (e.g. under a test client without lifespan).
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        session_factory: Callable[[], Any],
+        workers: int,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.store = store
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, Handler] = {}
+        self.pinned: Set[str] = set()
+        # claims pinned jobs submitted through this queue
+        self.owner = uuid.uuid4().hex
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register(self, kind: str, handler: Handler, pinned: bool = False) -> None:
+        self.handlers[kind] = handler
+        if pinned:
+            self.pinned.add(kind)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        if self._loop is loop and self._tasks:
+            return
+
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, rows: Rows, batch_size: int) -> str:
+        if kind not in self.handlers:
+            raise KeyError(f"No handler registered for {kind!r} jobs")
+
+        batches = [
+            rows[start : start + batch_size]
+            for start in range(0, len(rows), batch_size)
+        ]
+        owner = self.owner if kind in self.pinned else None
+        job_id = await self.store.create(kind, batches, owner)
+
+        await self.start()
+        self._wakeup.set()
+
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await self.store.get(job_id)
+
+        if job is None:
+            return None
+
+        if job["finished"] is not None:
+            status = "failed" if job["errors"] else "completed"
+        else:
+            status = "running" if job["started"] is not None else "queued"
+
+        elapsed = (job["finished"] or time.time()) - (job["started"] or time.time())
+
+        return {
+            **job,
+            "status": status,
+            "rows_per_second": job["rows_done"] / elapsed if elapsed > 0 else 0.0,
+        }
+
+    async def _renew(self, job_id: str, number: int) -> None:
+        # well within the lease, so that a slow renewal does not lose it
+        while True:
+            await asyncio.sleep(self.store.lease / 3)
+            await self.store.renew(job_id, number)
+
+    async def _work(self) -> None:
+        while True:
+            batch = await self.store.claim(self.owner)
+
+            if batch is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            job_id, kind, number, rows = batch
+            done, error = 0, None
+            renewal = (
+                asyncio.create_task(self._renew(job_id, number))
+                if self.store.lease is not None
+                else None
+            )
+
+            try:
+                async with self.session_factory() as db:
+                    done = await self.handlers[kind](db, rows)
+            except Exception as exc:  # a failed batch must not stop the worker
+                logger.exception("Batch %s of job %s failed", number, job_id)
+                error = f"batch {number}: {exc}"
+            finally:
+                if renewal is not None:
+                    renewal.cancel()
+
+            await self.store.finish_batch(job_id, number, done, error)
@@ -0,0 +1,330 @@
+"""Counters, gauges and histograms in the Prometheus text exposition format.
+
+Every worker process keeps its own values. With several workers each one
+periodically writes a snapshot of them to ``<directory>/metrics-<pid>.json``
+and a scrape, whichever worker answers it, merges the snapshots of all of
+them: counters and histograms are summed, including those of workers that
+have exited so that totals never go backwards, while gauges only count
+workers that are still alive, either summed or labelled with their pid.
+"""
+
+import asyncio
+import bisect
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+Snapshot = Dict[str, Any]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# gauge aggregation across workers: sum them, or one series per worker pid
+LIVESUM = "livesum"
+LIVEALL = "liveall"
+
+logger = logging.getLogger(__name__)
+
+
+class Metric:
+    type = ""
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), **options: Any
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.options = options
+        self._values: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> Snapshot:
+        with self._lock:
+            values = [[list(labels), value] for labels, value in self._values.items()]
+
+        return {
+            "type": self.type,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            **self.options,
+            "values": values,
+        }
+
+
+class Counter(Metric):
+    type = "counter"
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        mode: str = LIVESUM,
+    ) -> None:
+        super().__init__(name, help, labelnames, mode=mode)
+
+    def dec(self, amount: float = 1, labels: Labels = ()) -> None:
+        self.inc(-amount, labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> None:
+        super().__init__(name, help, labelnames, buckets=sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        buckets = self.options["buckets"]
+
+        with self._lock:
+            # per bucket (non cumulative) counts, the last one for +Inf, then sum
+            counts = self._values.setdefault(labels, [0] * (len(buckets) + 1) + [0.0])
+            counts[bisect.bisect_left(buckets, value)] += 1
+            counts[-1] += value
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        mode: str = LIVESUM,
+    ) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, mode))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, function: Callable[[], None]) -> Callable[[], None]:
+        """Register ``function`` to refresh metrics mirrored from elsewhere.
+
+        Collectors run before every snapshot, e.g. to copy pool statistics
+        into gauges.
+        """
+        self.collectors.append(function)
+        return function
+
+    def snapshot(self) -> Dict[str, Snapshot]:
+        for collect in self.collectors:
+            collect()
+
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # alive, owned by another user
+        return True
+    return True
+
+
+def merge(
+    snapshots: Iterable[Tuple[int, bool, Dict[str, Snapshot]]]
+) -> Dict[str, Snapshot]:
+    """Merge ``(pid, alive, snapshot)`` of several workers into one."""
+    merged: Dict[str, Snapshot] = {}
+
+    for pid, alive, metrics in snapshots:
+        for name, metric in metrics.items():
+            gauge = metric["type"] == "gauge"
+
+            if gauge and not alive:
+                continue
+
+            target = merged.setdefault(name, {**metric, "values": {}})
+            values = target["values"]
+
+            if gauge and metric["mode"] == LIVEALL:
+                target["labelnames"] = [*metric["labelnames"], "pid"]
+
+            for labels, value in metric["values"]:
+                key = tuple(labels)
+                if gauge and metric["mode"] == LIVEALL:
+                    key = (*key, str(pid))
+
+                if isinstance(value, list):
+                    previous = values.get(key, [0] * len(value))
+                    values[key] = [a + b for a, b in zip(previous, value)]
+                else:
+                    values[key] = values.get(key, 0) + value
+
+    for metric in merged.values():
+        values = metric["values"]
+        metric["values"] = [[list(key), value] for key, value in values.items()]
+
+    return merged
+
+
+class MultiProcessStore:
+    """Per worker snapshot files in a directory shared by the workers."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def write(self, metrics: Dict[str, Snapshot]) -> None:
+        path = self._path(os.getpid())
+        temporary = f"{path}.tmp"
+
+        with open(temporary, "w") as file:
+            json.dump(metrics, file)
+        # readers never see a partially written file
+        os.replace(temporary, path)
+
+    def read(self) -> List[Tuple[int, bool, Dict[str, Snapshot]]]:
+        snapshots = []
+
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            pid = int(os.path.basename(path)[len("metrics-") : -len(".json")])
+
+            if pid == os.getpid():
+                continue
+
+            try:
+                with open(path) as file:
+                    snapshots.append((pid, _pid_alive(pid), json.load(file)))
+            except (OSError, ValueError):  # removed or replaced while reading
+                continue
+
+        return snapshots
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render(metrics: Dict[str, Snapshot]) -> str:
+    """Text exposition format (version 0.0.4) of a snapshot."""
+    lines = []
+
+    for name, metric in sorted(metrics.items()):
+        help_text = metric["help"].replace("\\", r"\\").replace("\n", r"\n")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labelnames"]
+
+        for labels, value in sorted(metric["values"]):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+
+            cumulative = 0
+            bounds = [*metric["buckets"], math.inf]
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                le = _labels(names, labels, le=_number(bound))
+                lines.append(f"{name}_bucket{le} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(names, labels)} {_number(cumulative)}")
+
+    return "\n".join(lines) + "\n"
+
+
+class Exporter:
+    """Serves a registry, merged with other workers' when ``directory`` is set."""
+
+    def __init__(self, registry: Registry, directory: Optional[str] = None) -> None:
+        self.registry = registry
+        self.store = MultiProcessStore(directory) if directory else None
+        self.flushed_at: Optional[float] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def flush(self) -> None:
+        if self.store is not None:
+            self.store.write(self.registry.snapshot())
+            self.flushed_at = time.time()
+
+    async def _flush_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Writing the metrics snapshot failed")
+
+    def start(self, interval: float) -> None:
+        """Write a snapshot every ``interval`` seconds, when ``directory`` is set."""
+        if self.store is not None and self._flusher is None:
+            self.flush()
+            self._flusher = asyncio.create_task(self._flush_periodically(interval))
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+            self.flush()
+
+    def expose(self) -> str:
+        own = self.registry.snapshot()
+
+        if self.store is None:
+            return render(own)
+
+        return render(merge([(os.getpid(), True, own), *self.store.read()]))
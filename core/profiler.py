@@ -0,0 +1,123 @@
+"""Statistical profiler for a live worker.
+
+A background thread samples the stack of every other thread of the process
+at a fixed interval, which costs the profiled code nothing but the time the
+sampler holds the GIL. Samples are returned in the speedscope file format
+(https://www.speedscope.app), one sampled profile per thread, so the event
+loop and the bcrypt or ``to_thread`` workers are shown separately.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+Frame = Tuple[str, str, int]
+
+# a process runs a single profiler at a time
+_running = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.started: Optional[float] = None
+        self.stopped: Optional[float] = None
+        # (thread id, stack of frame indexes, root first) -> seconds
+        self._weights: Counter = Counter()
+        self._frames: Dict[Frame, int] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _frame_index(self, frame) -> int:
+        code = frame.f_code
+        key = (code.co_qualname, code.co_filename, code.co_firstlineno)
+        return self._frames.setdefault(key, len(self._frames))
+
+    def _sample(self, weight: float) -> None:
+        own = threading.get_ident()
+
+        for thread_id, top in sys._current_frames().items():
+            if thread_id == own:
+                continue
+
+            stack = []
+            frame = top
+            while frame is not None:
+                stack.append(self._frame_index(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self._weights[(thread_id, tuple(stack))] += weight
+
+    def _run(self) -> None:
+        previous = time.perf_counter()
+
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            # weigh by the time actually elapsed, the GIL can delay a sample
+            self._sample(now - previous)
+            previous = now
+
+    def start(self) -> None:
+        if not _running.acquire(blocking=False):
+            raise ProfilerBusyError("Another profile is already running")
+
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+        self._thread_names = {
+            thread.ident: thread.name for thread in threading.enumerate()
+        }
+        _running.release()
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """The samples as a speedscope file."""
+        frames = [
+            {"name": qualname, "file": filename, "line": line}
+            for (qualname, filename, line), _ in sorted(
+                self._frames.items(), key=lambda item: item[1]
+            )
+        ]
+
+        threads: Dict[int, List[Tuple[Tuple[int, ...], float]]] = {}
+        for (thread_id, stack), weight in self._weights.items():
+            threads.setdefault(thread_id, []).append((stack, weight))
+
+        profiles = []
+        for thread_id, samples in sorted(threads.items()):
+            total = sum(weight for _, weight in samples)
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": self._thread_names.get(thread_id, f"thread {thread_id}"),
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": total,
+                    "samples": [list(stack) for stack, _ in samples],
+                    "weights": [weight for _, weight in samples],
+                }
+            )
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "courses-fast-api",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
@@ -0,0 +1,108 @@
+"""In-process full-text search.
+
+Used where the database has no full-text search of its own (SQLite): an
+inverted index maps every token to the documents containing it, weighted by
+the field it was found in, so a query only touches the postings of its own
+terms instead of scanning every document.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Mapping, Set, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Thread safe inverted index with AND queries ranked by tf-idf.
+
+    ``weights`` maps the indexed field names to how much a match in that
+    field counts towards the rank, e.g. a title above an overview. Unlike
+    PostgreSQL's ``english`` configuration there is no stemming or stop word
+    removal: tokens only match exactly.
+    """
+
+    def __init__(self, weights: Mapping[str, float]) -> None:
+        self.weights = dict(weights)
+        # token -> document id -> weighted term frequency
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        self._documents: Dict[Hashable, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _add(self, doc_id: Hashable, fields: Mapping[str, str]) -> None:
+        frequencies: Counter = Counter()
+
+        for field, weight in self.weights.items():
+            for token in tokenize(fields.get(field) or ""):
+                frequencies[token] += weight
+
+        for token, frequency in frequencies.items():
+            self._postings[token][doc_id] = frequency
+
+        self._documents[doc_id] = set(frequencies)
+
+    def _remove(self, doc_id: Hashable) -> None:
+        for token in self._documents.pop(doc_id, ()):
+            postings = self._postings[token]
+            postings.pop(doc_id, None)
+
+            if not postings:
+                del self._postings[token]
+
+    def add(self, doc_id: Hashable, fields: Mapping[str, str]) -> None:
+        """Index a document, replacing any previous version of it."""
+        with self._lock:
+            self._remove(doc_id)
+            self._add(doc_id, fields)
+
+    def remove(self, doc_id: Hashable) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def rebuild(self, documents: Iterable[Tuple[Hashable, Mapping[str, str]]]) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+
+            for doc_id, fields in documents:
+                self._add(doc_id, fields)
+
+    def search(self, query: str, limit: int) -> List[Tuple[Hashable, float]]:
+        """Return up to ``limit`` ``(document id, rank)`` pairs, best first.
+
+        Only documents containing every query token match.
+        """
+        tokens = set(tokenize(query))
+
+        with self._lock:
+            if not tokens or any(token not in self._postings for token in tokens):
+                return []
+
+            # intersect starting from the rarest token to keep the sets small
+            postings = sorted((self._postings[token] for token in tokens), key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches.intersection_update(posting)
+
+            total = len(self._documents)
+            scores = {
+                doc_id: sum(
+                    posting[doc_id] * math.log(1 + total / len(posting))
+                    for posting in postings
+                )
+                for doc_id in matches
+            }
+
+        return heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-item[1], item[0])
+        )
@@ -11,6 +11,76 @@ class Settings:
     POSTGRES_DB_NAME = os.getenv("POSTGRES_DB_NAME")
     PORT = os.getenv("PORT")
     IP_ADDR = os.getenv("IP_ADDR")
+    # Optional full URLs, e.g. "sqlite:///./courses.db" and
+    # "sqlite+aiosqlite:///./courses.db" to run locally without PostgreSQL
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+    # Connection pool sizing, applied per engine (and so per worker process)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    # How course queries load module/subject: "joined" (one query) or "selectin"
+    COURSE_LOAD_STRATEGY = os.getenv("COURSE_LOAD_STRATEGY", "joined")
+    # Rows per INSERT batch when bulk importing without PostgreSQL COPY
+    BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+    # Rows validated and inserted per transaction by the streaming bulk endpoints
+    INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+    # Background bulk import jobs: "memory" (per process) or "sqlite" (file)
+    JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "memory")
+    JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "jobs.sqlite3")
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+    JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "1000"))
+    # SQLite job store: a batch whose worker stopped renewing its claim for this
+    # long (e.g. the process died) is claimed again
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    # Most IDs accepted by one POST .../batch_get request
+    BATCH_GET_MAX_IDS = int(os.getenv("BATCH_GET_MAX_IDS", "1000"))
+    # Rows fetched per server side cursor round trip by /courses/export
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # Autocomplete indexes are rebuilt in the background once this old, to pick
+    # up writes made by other worker processes
+    AUTOCOMPLETE_REFRESH_SECONDS = float(
+        os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "300")
+    )
+    # Encoder for responses rendered by FastAPI: "orjson", "msgspec", "json" or
+    # "auto" (the first of those installed)
+    JSON_RESPONSE_CLASS = os.getenv("JSON_RESPONSE_CLASS", "auto")
+    # Requests kept per route for the /admin/requests percentiles
+    REQUEST_STATS_SAMPLES = int(os.getenv("REQUEST_STATS_SAMPLES", "1000"))
+    # Send wall, database and serialization times in a Server-Timing header
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+    # Statements at least this slow are logged, 0 disables the slow query log
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    # Fraction of slow PostgreSQL SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0"))
+    # Entries kept for /admin/slow_queries; unset path = no log file
+    SLOW_QUERY_RECENT = int(os.getenv("SLOW_QUERY_RECENT", "100"))
+    SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH")
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", "10485760"))
+    SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+    # Stack sampling period of the profiler and the longest /admin/profile run
+    PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+    # Directory shared by the worker processes to merge their /metrics; unset
+    # when running a single process. Empty it before starting the workers
+    METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+    # bcrypt runs in a bounded pool: "thread" (bcrypt releases the GIL) or "process"
+    HASHING_POOL_MODE = os.getenv("HASHING_POOL_MODE", "thread")
+    HASHING_POOL_WORKERS = int(os.getenv("HASHING_POOL_WORKERS", os.cpu_count() or 1))
+    # hashes waiting for a worker before further requests are refused with a 503
+    HASHING_QUEUE_LIMIT = int(os.getenv("HASHING_QUEUE_LIMIT", "256"))
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
     SECRET_KEY = os.getenv("SECRET_KEY")
     ALGORITHM = os.getenv("ALGORITHM")
+    # Decoded token and super user lookup caches
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+    # Single entity GET responses; unset URL = per process memory, else redis://
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    # Bump to stop trusting role claims in tokens issued before the change
+    TOKEN_VERSION = int(os.getenv("TOKEN_VERSION", "1"))
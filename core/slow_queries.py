@@ -0,0 +1,185 @@
+"""Slow query log.
+
+Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are recorded with the
+types of their bound parameters (never their values), the crud function and
+route that ran them and, for a sample of PostgreSQL ``SELECT`` statements,
+their ``EXPLAIN (ANALYZE, BUFFERS)`` plan. Entries are kept in memory for
+``/admin/slow_queries`` and, when ``SLOW_QUERY_LOG_PATH`` is set, appended
+to a size rotated file as one JSON object per line.
+"""
+
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.instrumentation import current_timings, route_name
+from core.settings import Settings
+
+# modules whose functions are reported as the caller of a statement
+CALLER_PREFIX = "crud."
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """``parameters`` with every value replaced by its type name."""
+    if isinstance(parameters, dict):
+        return {name: parameter_shape(value) for name, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+        # long IN lists would otherwise flood the log with the same type name
+        if len(parameters) > 5 and len({type(value) for value in parameters}) == 1:
+            return (
+                f"{type(parameters).__name__}[{len(parameters)} x "
+                f"{type(parameters[0]).__name__}]"
+            )
+        return [parameter_shape(value) for value in parameters]
+
+    return type(parameters).__name__
+
+
+def calling_function() -> Optional[str]:
+    """Qualified name of the innermost crud function on the stack.
+
+    Under asyncio the statement runs in a greenlet of its own while the crud
+    coroutine that awaited it is suspended in the parent greenlet, so the
+    parent's stack is searched too.
+    """
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent()
+
+    while True:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith(CALLER_PREFIX):
+                return f"{module}.{frame.f_code.co_name}"
+            frame = frame.f_back
+
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+def _explain(conn, statement: str, parameters: Any) -> str:
+    # a raw DBAPI cursor, so that the EXPLAIN does not fire the hooks again, in
+    # a savepoint, so that an error does not abort the request's transaction
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_sample: float = 0.0,
+        recent: int = 100,
+        path: Optional[str] = None,
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain_sample = explain_sample
+        self.count = 0
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=recent)
+        self._lock = threading.Lock()
+        self._file_logger: Optional[logging.Logger] = None
+
+        if path:
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=Settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=Settings.SLOW_QUERY_LOG_BACKUPS,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._file_logger = logging.getLogger(f"{__name__}.file")
+            self._file_logger.addHandler(handler)
+            self._file_logger.setLevel(logging.INFO)
+            self._file_logger.propagate = False
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+
+        if elapsed >= self.threshold:
+            self.record(conn, statement, parameters, executemany, elapsed)
+
+    def install(self, engine: Engine) -> None:
+        if self.threshold > 0:
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def record(
+        self, conn, statement: str, parameters: Any, executemany: bool, elapsed: float
+    ) -> None:
+        timings = current_timings.get()
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": elapsed * 1000,
+            "statement": statement,
+            "parameters": parameter_shape(parameters[0] if executemany else parameters),
+            "executemany": len(parameters) if executemany else None,
+            "function": calling_function(),
+            "route": route_name(timings.scope) if timings and timings.scope else None,
+            "explain": None,
+        }
+
+        if (
+            conn.dialect.name == "postgresql"
+            and not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_sample
+        ):
+            try:
+                entry["explain"] = _explain(conn, statement, parameters)
+            except Exception as error:  # never fail the query being logged
+                entry["explain"] = f"EXPLAIN failed: {error}"
+
+        with self._lock:
+            self.count += 1
+            self._recent.append(entry)
+
+        if self._file_logger is not None:
+            self._file_logger.info(json.dumps(entry, default=str))
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Logged statements, the most recent first."""
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.count = 0
+            self._recent.clear()
+
+
+slow_query_log = SlowQueryLog(
+    Settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_sample=Settings.SLOW_QUERY_EXPLAIN_SAMPLE,
+    recent=Settings.SLOW_QUERY_RECENT,
+    path=Settings.SLOW_QUERY_LOG_PATH,
+)
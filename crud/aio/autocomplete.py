@@ -0,0 +1,111 @@
+"""Type-ahead over course and subject titles.
+
+Each kind of row has its own ``PrefixIndex``, built from its table on first
+use and kept current by the create, update and delete functions of this
+package. Writes made by other processes are picked up by a rebuild in the
+background once the index is older than ``AUTOCOMPLETE_REFRESH_SECONDS``; the
+changes this process makes while the rebuild reads the tables are replayed
+over it.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.autocomplete import PrefixIndex
+from core.settings import Settings
+from models import CourseModel, SubjectModel
+
+logger = logging.getLogger(__name__)
+
+COURSE = "course"
+SUBJECT = "subject"
+
+autocomplete_indexes: Dict[str, PrefixIndex] = {
+    COURSE: PrefixIndex(COURSE),
+    SUBJECT: PrefixIndex(SUBJECT),
+}
+
+_TITLES = {COURSE: CourseModel, SUBJECT: SubjectModel}
+
+
+def index_titles(kind: str, rows: Iterable[Tuple[str, str]]) -> None:
+    index = autocomplete_indexes[kind]
+
+    for id_, title in rows:
+        index.add(id_, title)
+
+
+def unindex(kind: str, ids: Iterable[str]) -> None:
+    index = autocomplete_indexes[kind]
+
+    for id_ in ids:
+        index.remove(id_)
+
+
+async def load_autocomplete_indexes(db: AsyncSession) -> None:
+    for kind, model in _TITLES.items():
+        index = autocomplete_indexes[kind]
+        # before the rows are read, so that no change is missed by both
+        generation = index.start_rebuild()
+        rows = await db.execute(select(model.id, model.title))
+        index.rebuild(rows.all(), generation)
+
+
+async def _reload(session_factory: async_sessionmaker) -> None:
+    async with session_factory() as db:
+        await load_autocomplete_indexes(db)
+
+
+async def _refresh_in_background(session_factory: async_sessionmaker) -> None:
+    try:
+        await _reload(session_factory)
+    except Exception:  # keep serving the current index
+        logger.exception("Autocomplete index refresh failed")
+
+
+class BackgroundRefresh:
+    """Rebuilds the indexes off the request path, one rebuild at a time."""
+
+    def __init__(self) -> None:
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(_refresh_in_background(session_factory))
+
+
+background_refresh = BackgroundRefresh()
+
+
+async def autocomplete(
+    session_factory: async_sessionmaker,
+    prefix: str,
+    limit: int,
+    kinds: Iterable[str] = (COURSE, SUBJECT),
+) -> List[Tuple[str, str, str]]:
+    """Up to ``limit`` ``(kind, id, title)`` whose title starts with ``prefix``.
+
+    Only the very first call waits for the database; afterwards lookups are
+    served from memory.
+    """
+    built_at = [autocomplete_indexes[kind].built_at for kind in _TITLES]
+
+    if None in built_at:
+        await _reload(session_factory)
+    elif time.time() - min(built_at) > Settings.AUTOCOMPLETE_REFRESH_SECONDS:
+        background_refresh.start(session_factory)
+
+    ranked = []
+    for kind in kinds:
+        matches = autocomplete_indexes[kind].complete(prefix, limit)
+        ranked.append([(key, kind, id_, title) for key, id_, title in matches])
+
+    merged = islice(heapq.merge(*ranked), limit)
+    return [(kind, id_, title) for _, kind, id_, title in merged]
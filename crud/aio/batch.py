@@ -0,0 +1,34 @@
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy import ARRAY, Select, String, any_, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+async def get_by_ids(
+    db: AsyncSession,
+    statement: Select,
+    column: InstrumentedAttribute,
+    ids: Sequence[str],
+) -> Tuple[List[Any], List[str]]:
+    """Rows of ``statement`` whose ``column`` is one of ``ids``, in one query.
+
+    Returns the rows in the order of ``ids`` (each row once) and the IDs that
+    matched no row.
+    """
+    ids = list(dict.fromkeys(ids))
+
+    if db.get_bind().dialect.name == "postgresql":
+        # a single array parameter: the statement text, and so asyncpg's
+        # prepared statement, is the same whatever the number of IDs
+        condition = column == any_(bindparam("ids", ids, type_=ARRAY(String)))
+    else:
+        condition = column.in_(ids)
+
+    rows = await db.scalars(statement.where(condition))
+    by_id = {getattr(row, column.key): row for row in rows}
+
+    return (
+        [by_id[id_] for id_ in ids if id_ in by_id],
+        [id_ for id_ in ids if id_ not in by_id],
+    )
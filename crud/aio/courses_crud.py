@@ -0,0 +1,235 @@
+from enum import Enum
+from typing import (
+    AbstractSet,
+    AsyncIterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, selectinload
+
+from core.settings import Settings
+from crud.aio.autocomplete import COURSE, SUBJECT, index_titles, unindex
+from crud.aio.batch import get_by_ids
+from models import CourseModel, ModuleModel, SubjectModel
+from schemas import CourseBase, UpdateCourseBase
+from utils.fields import load_columns
+from utils.pagination import paginate
+
+# keyset used to order and page through courses
+COURSE_PAGE_KEY = (CourseModel.created, CourseModel.id)
+
+
+class LoadStrategy(str, Enum):
+    """How a course's module and subject are loaded alongside it."""
+
+    # module and subject are many-to-one, so joining them in the same
+    # statement doesn't multiply course rows: one round trip per page
+    joined = "joined"
+    # one extra "WHERE id IN (...)" query per relationship: three round trips,
+    # but module and subject rows shared by many courses are only sent once
+    selectin = "selectin"
+
+
+def _select_courses(
+    strategy: Optional[LoadStrategy] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Select:
+    # relationships must be loaded up front: lazy loads are not allowed under
+    # asyncio, and would otherwise cost two queries per serialized course
+    strategy = LoadStrategy(strategy or Settings.COURSE_LOAD_STRATEGY)
+    relationships = [
+        relationship
+        for relationship in (CourseModel.module, CourseModel.subject)
+        if fields is None or relationship.key in fields
+    ]
+    statement = select(CourseModel)
+
+    if fields is not None:
+        # the page key and Last-Modified are read from every row, and the
+        # foreign keys let selectin loads skip joining the course table again
+        foreign_keys = (f"{relationship.key}_id" for relationship in relationships)
+        statement = statement.options(
+            load_columns(CourseModel, fields, "id", "created", "updated", *foreign_keys)
+        )
+
+    if strategy is LoadStrategy.joined:
+        # both joins stay, unrequested relationships included, so that
+        # narrowing the fields never changes which courses are listed
+        return (
+            statement.join(CourseModel.module)
+            .join(CourseModel.subject)
+            .options(*(contains_eager(relationship) for relationship in relationships))
+        )
+
+    return statement.options(
+        *(selectinload(relationship) for relationship in relationships)
+    )
+
+
+async def get_all_courses(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    strategy: Optional[LoadStrategy] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Sequence[CourseModel]:
+    courses = await db.scalars(
+        paginate(_select_courses(strategy, fields), COURSE_PAGE_KEY, limit, cursor)
+    )
+
+    return courses.all()
+
+
+async def get_course_by_id(
+    db: AsyncSession, course_id: str, strategy: Optional[LoadStrategy] = None
+) -> Union[None, CourseModel]:
+    course: Union[CourseModel, None] = await db.scalar(
+        _select_courses(strategy).where(CourseModel.id == course_id)
+    )
+
+    return course
+
+
+async def get_courses_by_ids(
+    db: AsyncSession, course_ids: Sequence[str]
+) -> Tuple[List[CourseModel], List[str]]:
+    return await get_by_ids(db, _select_courses(), CourseModel.id, course_ids)
+
+
+async def stream_courses(
+    db: AsyncSession, batch_size: int = Settings.EXPORT_BATCH_SIZE
+) -> AsyncIterator[Sequence[CourseModel]]:
+    """Yield every course, with module and subject, in batches of ``batch_size``.
+
+    Rows come from a server side cursor, and ``yield_per`` keeps the identity
+    map from holding on to batches already yielded, so memory stays flat
+    however large the catalog is.
+    """
+    result = await db.stream(
+        _select_courses(LoadStrategy.joined)
+        .order_by(*COURSE_PAGE_KEY)
+        .execution_options(yield_per=batch_size)
+    )
+
+    async for batch in result.scalars().partitions():
+        yield batch
+
+
+async def get_course_ids(
+    db: AsyncSession,
+    *,
+    module_id: Optional[str] = None,
+    subject_id: Optional[str] = None,
+) -> Sequence[str]:
+    statement = select(CourseModel.id)
+
+    if module_id is not None:
+        statement = statement.where(CourseModel.module_id == module_id)
+    if subject_id is not None:
+        statement = statement.where(CourseModel.subject_id == subject_id)
+
+    ids = await db.scalars(statement)
+    return ids.all()
+
+
+async def db_create_course(db: AsyncSession, course: CourseBase) -> CourseModel:
+    # noinspection PyArgumentList
+    course_item = CourseModel(
+        module=ModuleModel(
+            title=course.module.title, description=course.module.description
+        ),
+        subject=SubjectModel(title=course.subject.title, slug=course.subject.slug),
+        owner=course.owner,
+        title=course.title,
+        slug=course.slug,
+        overview=course.overview,
+        created=course.created,
+    )
+
+    # module and subject cascade from the course: a single flush inserts all
+    # three rows in one transaction. Primary keys are generated client side,
+    # so there is nothing to refresh afterwards.
+    db.add(course_item)
+    await db.commit()
+
+    index_titles(COURSE, [(course_item.id, course_item.title)])
+    index_titles(SUBJECT, [(course_item.subject.id, course_item.subject.title)])
+
+    return course_item
+
+
+async def db_insert_many(
+    db: AsyncSession, courses: List[CourseBase]
+) -> List[CourseModel]:
+    # noinspection PyArgumentList
+    courses_ = [
+        CourseModel(
+            module=ModuleModel(**course.module.model_dump()),
+            subject=SubjectModel(**course.subject.model_dump()),
+            owner=course.owner,
+            title=course.title,
+            slug=course.slug,
+            overview=course.overview,
+            created=course.created,
+        )
+        for course in courses
+    ]
+
+    db.add_all(courses_)
+    await db.commit()
+
+    index_titles(COURSE, [(course.id, course.title) for course in courses_])
+    index_titles(
+        SUBJECT, [(course.subject.id, course.subject.title) for course in courses_]
+    )
+
+    return courses_
+
+
+async def update_course_by_id(
+    db: AsyncSession,
+    course_id: str,
+    body: UpdateCourseBase,
+) -> Union[CourseModel, None]:
+    course: Union[CourseModel, None] = await get_course_by_id(db, course_id)
+
+    if course is None:
+        return None
+
+    update_data = body.model_dump(exclude_unset=True)
+
+    # the default "auto" session synchronization keeps ``course`` up to date,
+    # so no refresh round trip is needed afterwards
+    await db.execute(
+        update(CourseModel).where(CourseModel.id == course_id).values(update_data)
+    )
+    await db.commit()
+
+    if "title" in update_data:
+        index_titles(COURSE, [(course_id, update_data["title"])])
+
+    return course
+
+
+async def delete_course_by_id(
+    db: AsyncSession, course_id: str
+) -> Union[None, CourseModel]:
+    course: Union[CourseModel, None] = await db.scalar(
+        select(CourseModel).where(CourseModel.id == course_id)
+    )
+
+    if course is None:
+        return None
+
+    await db.delete(course)
+    await db.commit()
+
+    unindex(COURSE, [course_id])
+
+    return course
@@ -0,0 +1,148 @@
+"""Bulk course import.
+
+Courses are flattened into module, subject and course rows with client side
+generated keys and written table by table, skipping the ORM unit of work. On
+asyncpg the rows are streamed with ``COPY ... FROM STDIN`` (binary format);
+other dialects fall back to batched ``executemany`` INSERTs.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from core.settings import Settings
+from crud.aio.autocomplete import COURSE, SUBJECT, index_titles
+from models import CourseModel, ModuleModel, SubjectModel
+from models.course_models import utc_now
+from schemas import CourseBase, CourseImportReport
+from utils import generate_id
+
+MODULE_COLUMNS = ("id", "title", "description")
+SUBJECT_COLUMNS = ("id", "title", "slug")
+COURSE_COLUMNS = (
+    "id",
+    "module_id",
+    "subject_id",
+    "owner",
+    "title",
+    "slug",
+    "overview",
+    "created",
+    "updated",
+)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # course.created is a timestamp without time zone
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _flatten(
+    courses: Iterable[CourseBase],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    modules, subjects, courses_ = [], [], []
+    updated = utc_now()
+
+    for course in courses:
+        module = {"id": generate_id(), **course.module.model_dump()}
+        subject = {"id": generate_id(), **course.subject.model_dump()}
+        modules.append(module)
+        subjects.append(subject)
+        courses_.append(
+            {
+                "id": generate_id(),
+                "module_id": module["id"],
+                "subject_id": subject["id"],
+                "owner": course.owner,
+                "title": course.title,
+                "slug": course.slug,
+                "overview": course.overview,
+                "created": _naive_utc(course.created),
+                "updated": updated,
+            }
+        )
+
+    return modules, subjects, courses_
+
+
+async def _copy_rows(
+    driver_connection: Any,
+    table: Table,
+    columns: Sequence[str],
+    rows: List[Dict[str, Any]],
+) -> None:
+    await driver_connection.copy_records_to_table(
+        table.name,
+        records=[tuple(row[column] for column in columns) for row in rows],
+        columns=list(columns),
+    )
+
+
+async def _insert_rows(
+    connection: AsyncConnection,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    batch_size: int,
+) -> None:
+    for start in range(0, len(rows), batch_size):
+        await connection.execute(insert(table), rows[start : start + batch_size])
+
+
+async def db_import_courses(
+    db: AsyncSession,
+    courses: Iterable[CourseBase],
+    batch_size: int = Settings.BULK_INSERT_BATCH_SIZE,
+) -> Tuple[List[Dict[str, Any]], CourseImportReport]:
+    """Insert ``courses`` in one transaction.
+
+    Returns the created courses, with their module and subject nested, as
+    plain dicts together with throughput statistics.
+    """
+    start = time.perf_counter()
+    modules, subjects, courses_ = _flatten(courses)
+    tables = (
+        (ModuleModel.__table__, MODULE_COLUMNS, modules),
+        (SubjectModel.__table__, SUBJECT_COLUMNS, subjects),
+        (CourseModel.__table__, COURSE_COLUMNS, courses_),
+    )
+
+    connection = await db.connection()
+
+    if connection.dialect.driver == "asyncpg":
+        method = "copy"
+        raw = await connection.get_raw_connection()
+        driver_connection = raw.driver_connection
+        # a savepoint if the session already started a transaction on this
+        # connection, otherwise a transaction of its own
+        async with driver_connection.transaction():
+            for table, columns, rows in tables:
+                await _copy_rows(driver_connection, table, columns, rows)
+    else:
+        method = "executemany"
+        for table, _, rows in tables:
+            await _insert_rows(connection, table, rows, batch_size)
+
+    await db.commit()
+
+    index_titles(COURSE, [(course["id"], course["title"]) for course in courses_])
+    index_titles(SUBJECT, [(subject["id"], subject["title"]) for subject in subjects])
+
+    seconds = time.perf_counter() - start
+    report = CourseImportReport(
+        rows=len(courses_),
+        seconds=seconds,
+        rows_per_second=len(courses_) / seconds if seconds else 0.0,
+        method=method,
+    )
+
+    created = [
+        {**course, "module": module, "subject": subject}
+        for course, module, subject in zip(courses_, modules, subjects)
+    ]
+
+    return created, report
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import websearch_to_tsquery
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.search import InvertedIndex
+from crud.aio.courses_crud import LoadStrategy, _select_courses
+from models import CourseModel
+from models.course_models import SEARCH_CONFIG
+
+# same relative weights as the 'A' (title) and 'B' (overview) labels of
+# course.search_vector under ts_rank_cd's defaults
+SEARCH_WEIGHTS = {"title": 1.0, "overview": 0.4}
+
+
+class _FallbackIndex:
+    """Course search index for databases without ``tsvector``.
+
+    The index is rebuilt whenever the catalog's row count or latest
+    ``updated`` timestamp differ from the ones it was built from, which
+    every insert, update and delete changes.
+    """
+
+    def __init__(self) -> None:
+        self.index = InvertedIndex(SEARCH_WEIGHTS)
+        self.signature: Optional[Tuple[Any, ...]] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> InvertedIndex:
+        signature = tuple(
+            (
+                await db.execute(
+                    select(func.count(), func.max(CourseModel.updated)).select_from(
+                        CourseModel
+                    )
+                )
+            ).one()
+        )
+
+        async with self._lock:
+            if signature != self.signature:
+                rows = await db.execute(
+                    select(CourseModel.id, CourseModel.title, CourseModel.overview)
+                )
+                self.index.rebuild(
+                    (id_, {"title": title, "overview": overview})
+                    for id_, title, overview in rows
+                )
+                self.signature = signature
+
+        return self.index
+
+
+fallback_index = _FallbackIndex()
+
+
+async def _search_postgresql(
+    db: AsyncSession, q: str, limit: int
+) -> Sequence[CourseModel]:
+    # unmapped generated column, see models.course_models
+    vector = literal_column("course.search_vector")
+    query = websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    courses = await db.scalars(
+        _select_courses(LoadStrategy.joined)
+        .where(vector.op("@@")(query))
+        .order_by(func.ts_rank_cd(vector, query).desc(), CourseModel.id)
+        .limit(limit)
+    )
+
+    return courses.all()
+
+
+async def _search_fallback(db: AsyncSession, q: str, limit: int) -> List[CourseModel]:
+    index = await fallback_index.get(db)
+    ranked = [course_id for course_id, _ in index.search(q, limit)]
+
+    if not ranked:
+        return []
+
+    courses = await db.scalars(
+        _select_courses(LoadStrategy.joined).where(CourseModel.id.in_(ranked))
+    )
+    by_id = {course.id: course for course in courses}
+
+    # a course deleted since the index was built is simply left out
+    return [by_id[course_id] for course_id in ranked if course_id in by_id]
+
+
+async def search_courses(db: AsyncSession, q: str, limit: int) -> Sequence[CourseModel]:
+    """Courses matching every term of ``q`` in their title or overview.
+
+    Results are ranked best first, title matches above overview ones. On
+    PostgreSQL ``q`` uses ``websearch_to_tsquery`` syntax (quoted phrases,
+    ``or``, ``-term``) and is matched through the GIN index on
+    ``course.search_vector``; elsewhere an in-process inverted index is used.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return await _search_postgresql(db, q, limit)
+
+    return await _search_fallback(db, q, limit)
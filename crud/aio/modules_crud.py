@@ -0,0 +1,96 @@
+from typing import AbstractSet, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.aio.autocomplete import COURSE, unindex
+from crud.aio.batch import get_by_ids
+from models import CourseModel, ModuleModel
+from models.course_models import utc_now
+from schemas import UpdateModuleBase
+from schemas.module_schemas import ModuleBase
+from utils.fields import load_columns
+from utils.pagination import paginate
+
+# modules carry no timestamp, the primary key alone gives a stable order
+MODULE_PAGE_KEY = (ModuleModel.id,)
+
+
+async def db_create_module(db: AsyncSession, mod: ModuleBase) -> ModuleModel:
+    module_item = ModuleModel(**mod.model_dump())
+    db.add(module_item)
+    await db.commit()
+
+    return module_item
+
+
+async def db_read_all_modules(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Sequence[ModuleModel]:
+    statement = select(ModuleModel)
+
+    if fields is not None:
+        statement = statement.options(load_columns(ModuleModel, fields, "id"))
+
+    modules = await db.scalars(paginate(statement, MODULE_PAGE_KEY, limit, cursor))
+
+    return modules.all()
+
+
+async def db_read_module_by_id(
+    db: AsyncSession, module_id: str
+) -> Union[ModuleModel, None]:
+    module = await db.scalar(select(ModuleModel).where(ModuleModel.id == module_id))
+
+    return module
+
+
+async def db_read_modules_by_ids(
+    db: AsyncSession, module_ids: Sequence[str]
+) -> Tuple[List[ModuleModel], List[str]]:
+    return await get_by_ids(db, select(ModuleModel), ModuleModel.id, module_ids)
+
+
+async def db_update_module(
+    db: AsyncSession, module_id: str, content: UpdateModuleBase
+) -> Union[ModuleModel, None]:
+    module = await db_read_module_by_id(db, module_id)
+
+    if module is None:
+        return
+
+    for key, val in vars(content).items():
+        setattr(module, key, val) if val else None
+    # course responses embed the module: move their Last-Modified forward
+    await db.execute(
+        update(CourseModel)
+        .where(CourseModel.module_id == module_id)
+        .values(updated=utc_now())
+    )
+    await db.commit()
+
+    return module
+
+
+# DELETE QUERIES
+
+
+async def delete_module_by_id(
+    db: AsyncSession, module_id: str, course_ids: Sequence[str]
+) -> Union[None, ModuleModel]:
+    # the caller already read the module (found here in the identity map) and the
+    # ids of its courses, which are deleted with it
+    module = await db.get(ModuleModel, module_id)
+
+    if module is None:
+        return None
+
+    await db.delete(module)
+    await db.commit()
+
+    unindex(COURSE, course_ids)
+
+    return module
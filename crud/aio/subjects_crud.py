@@ -0,0 +1,101 @@
+from typing import AbstractSet, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.aio.autocomplete import COURSE, SUBJECT, index_titles, unindex
+from crud.aio.batch import get_by_ids
+from models import CourseModel, SubjectModel
+from models.course_models import utc_now
+from schemas import UpdateSubjectBase
+from schemas.subject_schemas import SubjectBase
+from utils.fields import load_columns
+from utils.pagination import paginate
+
+# subjects carry no timestamp, the primary key alone gives a stable order
+SUBJECT_PAGE_KEY = (SubjectModel.id,)
+
+
+async def db_create_subject(db: AsyncSession, sub: SubjectBase) -> SubjectModel:
+    subject_item = SubjectModel(**sub.model_dump())
+    db.add(subject_item)
+    await db.commit()
+
+    index_titles(SUBJECT, [(subject_item.id, subject_item.title)])
+
+    return subject_item
+
+
+async def db_read_all_subjects(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Sequence[SubjectModel]:
+    statement = select(SubjectModel)
+
+    if fields is not None:
+        statement = statement.options(load_columns(SubjectModel, fields, "id"))
+
+    subjects = await db.scalars(paginate(statement, SUBJECT_PAGE_KEY, limit, cursor))
+
+    return subjects.all()
+
+
+async def db_read_subject_by_id(
+    db: AsyncSession, subject_id: str
+) -> Union[SubjectModel, None]:
+    subject = await db.scalar(select(SubjectModel).where(SubjectModel.id == subject_id))
+
+    return subject
+
+
+async def db_read_subjects_by_ids(
+    db: AsyncSession, subject_ids: Sequence[str]
+) -> Tuple[List[SubjectModel], List[str]]:
+    return await get_by_ids(db, select(SubjectModel), SubjectModel.id, subject_ids)
+
+
+async def db_update_subject(
+    db: AsyncSession, subject_id: str, content: UpdateSubjectBase
+) -> Union[SubjectModel, None]:
+    subject = await db_read_subject_by_id(db, subject_id)
+
+    if subject is None:
+        return
+
+    for key, val in vars(content).items():
+        setattr(subject, key, val) if val else None
+    # course responses embed the subject: move their Last-Modified forward
+    await db.execute(
+        update(CourseModel)
+        .where(CourseModel.subject_id == subject_id)
+        .values(updated=utc_now())
+    )
+    await db.commit()
+
+    index_titles(SUBJECT, [(subject.id, subject.title)])
+
+    return subject
+
+
+# DELETE QUERIES
+
+
+async def delete_subject_by_id(
+    db: AsyncSession, subject_id: str, course_ids: Sequence[str]
+) -> Union[None, SubjectModel]:
+    # the caller already read the subject (found here in the identity map) and the
+    # ids of its courses, which are deleted with it
+    subject = await db.get(SubjectModel, subject_id)
+
+    if subject is None:
+        return None
+
+    await db.delete(subject)
+    await db.commit()
+
+    unindex(SUBJECT, [subject_id])
+    unindex(COURSE, course_ids)
+
+    return subject
@@ -0,0 +1,82 @@
+import asyncio
+from typing import AbstractSet, List, Optional, Sequence, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.users_crud import _create_user_helper
+from models.user_models import UserModel
+from schemas.user_schemas import UserCreate
+from utils.fields import load_columns
+from utils.pagination import paginate
+
+# keyset used to order and page through users
+USER_PAGE_KEY = (UserModel.created_at, UserModel.id)
+
+# CREATE QUERIES #
+
+
+async def db_create_user(db: AsyncSession, user: UserCreate) -> UserModel:
+    user_ = await _create_user_helper(user)
+    db.add(user_)
+    await db.commit()
+
+    return user_
+
+
+async def db_insert_many(db: AsyncSession, users: List[UserCreate]) -> List[UserModel]:
+    users_coro = [_create_user_helper(user) for user in users]
+
+    users_ = await asyncio.gather(*users_coro, return_exceptions=True)
+
+    db.add_all(users_)
+    await db.commit()
+    return list(users_)
+
+
+async def user_registration(request: UserCreate, database: AsyncSession) -> UserModel:
+    new_user = await _create_user_helper(user=request)
+
+    database.add(new_user)
+    await database.commit()
+
+    return new_user
+
+
+# READ QUERIES #
+
+
+async def get_all_users(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Sequence[UserModel]:
+    statement = select(UserModel)
+
+    if fields is not None:
+        statement = statement.options(
+            load_columns(UserModel, fields, "id", "created_at")
+        )
+
+    users = await db.scalars(paginate(statement, USER_PAGE_KEY, limit, cursor))
+
+    return users.all()
+
+
+async def get_user_by_id(db: AsyncSession, user_id: str) -> Union[None, UserModel]:
+    user: Union[UserModel, None] = await db.scalar(
+        select(UserModel).where(UserModel.id == user_id)
+    )
+
+    return user
+
+
+async def get_user_by_email(
+    db: AsyncSession, email_address: str
+) -> Union[UserModel, None]:
+    user: Union[UserModel, None] = await db.scalar(
+        select(UserModel).where(UserModel.email == email_address)
+    )
+
+    return user
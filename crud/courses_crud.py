@@ -1,6 +1,6 @@
 from typing import List, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 
 from models import CourseModel, ModuleModel, SubjectModel
 from schemas import CourseBase, UpdateCourseBase
@@ -12,6 +12,9 @@ def get_all_courses(db: Session, limit: int) -> List[CourseModel]:
         db.query(CourseModel)
         .join(SubjectModel, CourseModel.subject_id == SubjectModel.id)
         .join(ModuleModel, CourseModel.module_id == ModuleModel.id)
+        .options(
+            contains_eager(CourseModel.subject), contains_eager(CourseModel.module)
+        )
         .limit(limit=limit)
         .all()
     )
@@ -22,6 +25,9 @@ def get_course_by_id(db: Session, course_id: str) -> Union[None, CourseModel]:
         db.query(CourseModel)
         .join(CourseModel.module)
         .join(CourseModel.subject)
+        .options(
+            contains_eager(CourseModel.module), contains_eager(CourseModel.subject)
+        )
         .filter(CourseModel.id == course_id)
         .first()
     )
@@ -33,22 +39,12 @@ def get_course_by_id(db: Session, course_id: str) -> Union[None, CourseModel]:
 
 
 async def db_create_course(db: Session, course: CourseBase) -> CourseModel:
-    module = ModuleModel(
-        title=course.module.title, description=course.module.description
-    )
-    db.add(module)
-    db.commit()
-    db.refresh(module)
-
-    subject = SubjectModel(title=course.subject.title, slug=course.subject.slug)
-    db.add(subject)
-    db.commit()
-    db.refresh(subject)
-
     # noinspection PyArgumentList
     course_item = CourseModel(
-        module=module,
-        subject=subject,
+        module=ModuleModel(
+            title=course.module.title, description=course.module.description
+        ),
+        subject=SubjectModel(title=course.subject.title, slug=course.subject.slug),
         owner=course.owner,
         title=course.title,
         slug=course.slug,
@@ -56,9 +52,10 @@ async def db_create_course(db: Session, course: CourseBase) -> CourseModel:
         created=course.created,
     )
 
+    # module and subject cascade from the course and are inserted in the same
+    # transaction
     db.add(course_item)
     db.commit()
-    db.refresh(course_item)
 
     return course_item
 
@@ -1,13 +1,28 @@
-import asyncio
 from typing import List, Sequence, Union
 
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.orm import Session
 
-from auth.hashing import get_password_hash
+from auth.cache import invalidate_user
+from auth.hashing import get_password_hash_async, get_password_hashes_async
 from models.user_models import UserModel
 from schemas.user_schemas import UserCreate
 
+# CACHE INVALIDATION #
+
+
+@event.listens_for(UserModel, "after_insert")
+@event.listens_for(UserModel, "after_update")
+@event.listens_for(UserModel, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: UserModel) -> None:
+    # an update may change the email, which leaves the entry of the old one
+    previous = inspect(target).attrs.email.history.deleted
+
+    for email in {target.email, *previous}:
+        if email is not None:
+            invalidate_user(email)
+
+
 # CREATE QUERIES #
 
 
@@ -16,7 +31,7 @@ async def _create_user_helper(user: UserCreate) -> UserModel:
         first_name=user.first_name,
         last_name=user.last_name,
         email=user.email,
-        password=get_password_hash(user.password),
+        password=await get_password_hash_async(user.password),
         job_title=user.job_title,
         is_super_user=user.is_super_user,
     )
@@ -31,13 +46,16 @@ async def db_create_user(db: Session, user: UserCreate) -> UserModel:
 
 
 async def db_insert_many(db: Session, users: List[UserCreate]) -> List[UserModel]:
-    users_coro = [_create_user_helper(user) for user in users]
+    hashes = await get_password_hashes_async([user.password for user in users])
 
-    users_ = await asyncio.gather(*users_coro, return_exceptions=True)
+    users_ = [
+        UserModel(**{**user.model_dump(), "password": password_hash})
+        for user, password_hash in zip(users, hashes)
+    ]
 
     db.add_all(users_)
     db.commit()
-    return list(users_)
+    return users_
 
 
 async def user_registration(request: UserCreate, database) -> UserModel:
@@ -1,8 +1,29 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from models.session import Base, engine
-from routers import courses_router, module_router, subject_router, user_router
+from auth.hashing import HashingPoolFullError, hashing_pool
+from core.settings import Settings
+from crud.aio.autocomplete import load_autocomplete_indexes
+from models.session import AsyncSessionLocal, Base, engine
+from routers import (
+    admin_router,
+    autocomplete_router,
+    courses_router,
+    jobs_router,
+    metrics_router,
+    module_router,
+    subject_router,
+    user_router,
+)
+from utils.instrumentation import InstrumentationMiddleware
+from utils.jobs import job_queue
+from utils.metrics import start_metrics, stop_metrics
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.profiling import ProfileMiddleware, authorize_profile
+from utils.responses import get_response_class
 
 origins = [
     "http://localhost",
@@ -10,12 +31,44 @@ origins = [
     "http://localhost:5050",
 ]
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    async with AsyncSessionLocal() as db:
+        await load_autocomplete_indexes(db)
+    await job_queue.start()
+    start_metrics()
+    yield
+    await stop_metrics()
+    await job_queue.stop()
+    hashing_pool.shutdown()
+
+
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=get_response_class(Settings.JSON_RESPONSE_CLASS),
+    dependencies=[Depends(authorize_profile)],
+)
 
 app.include_router(courses_router)
 app.include_router(subject_router)
 app.include_router(module_router)
 app.include_router(user_router)
+app.include_router(admin_router)
+app.include_router(jobs_router)
+app.include_router(autocomplete_router)
+app.include_router(metrics_router)
+
+
+@app.exception_handler(HashingPoolFullError)
+async def hashing_pool_full(_: Request, error: HashingPoolFullError) -> JSONResponse:
+    # logins and sign ups are retried once the queued hashes are done
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(error)},
+        headers={"Retry-After": "1"},
+    )
+
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,7 +76,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
 )
+app.add_middleware(InstrumentationMiddleware)
+app.add_middleware(ProfileMiddleware)
 
 # Create the database tables
 Base.metadata.create_all(bind=engine)
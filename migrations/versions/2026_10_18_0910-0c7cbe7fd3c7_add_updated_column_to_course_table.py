@@ -0,0 +1,33 @@
+"""Add Updated Column to Course Table
+
+Revision ID: 0c7cbe7fd3c7
+Revises: efc225014398
+Create Date: 2026-10-18 09:10:12.408113
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0c7cbe7fd3c7"
+down_revision = "efc225014398"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "course",
+        sa.Column(
+            "updated",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("course", "updated")
@@ -0,0 +1,53 @@
+"""Add Indexes for Lookup Columns
+
+Revision ID: 912fc2db5e81
+Revises: 0c7cbe7fd3c7
+Create Date: 2026-10-18 10:04:37.215904
+
+The unique index on user.email fails to build while duplicate emails exist;
+remove them before upgrading.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "912fc2db5e81"
+down_revision = "0c7cbe7fd3c7"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, unique)
+INDEXES = (
+    ("ix_user_email", "user", ["email"], True),
+    ("ix_user_created_at_id", "user", ["created_at", "id"], False),
+    ("ix_course_module_id", "course", ["module_id"], False),
+    ("ix_course_subject_id", "course", ["subject_id"], False),
+    ("ix_course_owner", "course", ["owner"], False),
+    ("ix_course_slug", "course", ["slug"], False),
+    ("ix_course_created_id", "course", ["created", "id"], False),
+    ("ix_subject_slug", "subject", ["slug"], False),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build, but
+    # cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
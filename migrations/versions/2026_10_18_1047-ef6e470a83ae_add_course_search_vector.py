@@ -0,0 +1,45 @@
+"""Add Course Search Vector
+
+Revision ID: ef6e470a83ae
+Revises: 912fc2db5e81
+Create Date: 2026-10-18 10:47:52.630118
+
+Adding a stored generated column rewrites the course table under an
+exclusive lock; run it in a maintenance window on large catalogs.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "ef6e470a83ae"
+down_revision = "912fc2db5e81"
+branch_labels = None
+depends_on = None
+
+# frozen copy of models.course_models.SEARCH_VECTOR at this revision
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(overview, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE course ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_course_search_vector",
+            "course",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_course_search_vector", table_name="course")
+    op.drop_column("course", "search_vector")
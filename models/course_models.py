@@ -1,21 +1,48 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from datetime import datetime, timezone
+
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, String, event, func
 from sqlalchemy.orm import relationship
 
 from models.session import Base
 from utils import generate_id
 
+# PostgreSQL full-text search document: title matches rank above overview ones
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(overview, '')), 'B')"
+)
+
+
+def utc_now() -> datetime:
+    # timestamps without time zone hold UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 class CourseModel(Base):
     __tablename__ = "course"
 
     id = Column(String, primary_key=True, default=generate_id)
-    module_id = Column(String, ForeignKey("module.id", ondelete="CASCADE"))
-    subject_id = Column(String, ForeignKey("subject.id", ondelete="CASCADE"))
-    owner = Column(String, nullable=False)
+    module_id = Column(String, ForeignKey("module.id", ondelete="CASCADE"), index=True)
+    subject_id = Column(
+        String, ForeignKey("subject.id", ondelete="CASCADE"), index=True
+    )
+    owner = Column(String, nullable=False, index=True)
     title = Column(String(200), nullable=False)
-    slug = Column(String, nullable=False)
+    slug = Column(String, nullable=False, index=True)
     overview = Column(String, nullable=False)
     created = Column(DateTime, nullable=False)
+    # last change to the course, its module or its subject (Last-Modified)
+    updated = Column(
+        DateTime,
+        nullable=False,
+        default=utc_now,
+        onupdate=utc_now,
+        server_default=func.timezone("utc", func.now()),
+    )
+
+    # keyset pagination order (COURSE_PAGE_KEY)
+    __table_args__ = (Index("ix_course_created_id", "created", "id"),)
 
     module = relationship("ModuleModel", back_populates="course")
     subject = relationship("SubjectModel", back_populates="course")
@@ -26,3 +53,23 @@ class CourseModel(Base):
             f"overview={self.overview}, module_id={self.module_id}, subject_id={self.subject_id}, "
             f"created={self.created}>"
         )
+
+
+# course.search_vector is a generated column that only exists on PostgreSQL, so
+# it is left unmapped and added after the table; crud.aio.courses_search reads
+# it as a literal column
+event.listen(
+    CourseModel.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE course ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    CourseModel.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_course_search_vector ON course USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
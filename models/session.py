@@ -1,7 +1,13 @@
-from sqlalchemy import create_engine
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from core.instrumentation import install_query_hooks
 from core.settings import Settings
+from core.slow_queries import slow_query_log
 
 POSTGRES_USER = Settings.POSTGRES_USER
 POSTGRES_PWD = Settings.POSTGRES_PWD
@@ -10,11 +16,137 @@ PORT = Settings.PORT
 IP_ADDR = Settings.IP_ADDR
 
 __CONNECTION_URI = (
-    f"postgresql://{POSTGRES_USER}:{POSTGRES_PWD}@{IP_ADDR}:{PORT}/{POSTGRES_DB_NAME}"
+    Settings.DATABASE_URL
+    or f"postgresql://{POSTGRES_USER}:{POSTGRES_PWD}@{IP_ADDR}:{PORT}/{POSTGRES_DB_NAME}"
+)
+
+__ASYNC_CONNECTION_URI = (
+    Settings.ASYNC_DATABASE_URL
+    or f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PWD}@{IP_ADDR}:{PORT}/{POSTGRES_DB_NAME}"
+)
+
+
+def _pool_options(uri: str) -> Dict[str, Any]:
+    options = {
+        "pool_recycle": Settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": Settings.DB_POOL_PRE_PING,
+    }
+
+    # SQLite engines don't use a QueuePool, so sizing arguments are rejected
+    if not uri.startswith("sqlite"):
+        options.update(
+            pool_size=Settings.DB_POOL_SIZE,
+            max_overflow=Settings.DB_MAX_OVERFLOW,
+            pool_timeout=Settings.DB_POOL_TIMEOUT,
+        )
+
+    return options
+
+
+class PoolMetrics:
+    """Connection checkouts, connects and hold times of a single engine's pool.
+
+    Recorded from pool events, so sessions stay lazy: a connection is checked
+    out when a session runs its first statement, and requests that never reach
+    the database (cache hits, 304s) never check one out.
+    """
+
+    def __init__(self, bind) -> None:
+        self.checkouts = 0
+        self.connects = 0
+        self.total_connect = 0.0
+        self.max_connect = 0.0
+        self.checkins = 0
+        self.total_hold = 0.0
+        self.max_hold = 0.0
+        self.install(bind)
+
+    def install(self, bind) -> None:
+        # listening on the engine also covers the pools dispose() recreates
+        self.bind = bind
+        event.listen(bind, "do_connect", self._connecting)
+        event.listen(bind, "connect", self._connected)
+        event.listen(bind, "checkout", self._checked_out)
+        event.listen(bind, "checkin", self._checked_in)
+
+    def _connecting(self, dialect, connection_record, cargs, cparams) -> None:
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    def _connected(self, dbapi_connection, connection_record) -> None:
+        started = connection_record.info.pop("connect_started", None)
+        if started is None:
+            return
+
+        elapsed = time.perf_counter() - started
+        self.connects += 1
+        self.total_connect += elapsed
+        self.max_connect = max(self.max_connect, elapsed)
+
+    def _checked_out(self, dbapi_connection, connection_record, proxy) -> None:
+        self.checkouts += 1
+        connection_record.info["checked_out"] = time.perf_counter()
+
+    def _checked_in(self, dbapi_connection, connection_record) -> None:
+        started = connection_record.info.pop("checked_out", None)
+        if started is None:
+            return
+
+        elapsed = time.perf_counter() - started
+        self.checkins += 1
+        self.total_hold += elapsed
+        self.max_hold = max(self.max_hold, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.bind.pool
+        # NullPool / StaticPool (SQLite) have no size or overflow to report
+        size = pool.size() if hasattr(pool, "size") else None
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else None
+        idle = pool.checkedin() if hasattr(pool, "checkedin") else None
+        overflow = max(pool.overflow(), 0) if hasattr(pool, "overflow") else None
+
+        return {
+            "pool": type(pool).__name__,
+            "size": size,
+            "checked_out": checked_out,
+            "idle": idle,
+            "overflow": overflow,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "avg_connect_ms": (
+                self.total_connect / self.connects * 1000 if self.connects else 0.0
+            ),
+            "max_connect_ms": self.max_connect * 1000,
+            "avg_hold_ms": (
+                self.total_hold / self.checkins * 1000 if self.checkins else 0.0
+            ),
+            "max_hold_ms": self.max_hold * 1000,
+        }
+
+
+engine = create_engine(__CONNECTION_URI, **_pool_options(__CONNECTION_URI))
+
+# like AsyncSessionLocal below: crud functions return the rows they commit
+# without a refresh, and server defaults are fetched by RETURNING on insert
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+)
+
+async_engine = create_async_engine(
+    __ASYNC_CONNECTION_URI, **_pool_options(__ASYNC_CONNECTION_URI)
+)
+
+# expire_on_commit is disabled so that committed objects can still be serialized
+# without triggering implicit (and, under asyncio, illegal) lazy loads
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
 )
 
-engine = create_engine(__CONNECTION_URI)
+install_query_hooks(engine)
+install_query_hooks(async_engine.sync_engine)
+slow_query_log.install(engine)
+slow_query_log.install(async_engine.sync_engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_metrics = PoolMetrics(engine)
+async_pool_metrics = PoolMetrics(async_engine.sync_engine)
 
 Base = declarative_base()
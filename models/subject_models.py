@@ -10,7 +10,7 @@ class SubjectModel(Base):
 
     id = Column(String, primary_key=True, default=generate_id)
     title = Column(String(200), nullable=False)
-    slug = Column(String(200), nullable=False)
+    slug = Column(String(200), nullable=False, index=True)
 
     course = relationship(
         "CourseModel",
@@ -1,6 +1,7 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, String, func
+from sqlalchemy import Boolean, Column, DateTime, Index, String, func
+from sqlalchemy.orm import column_property
 
 from models.session import Base
 
@@ -13,12 +14,20 @@ class UserModel(Base):
     )
     first_name = Column(String(255), nullable=False)
     last_name = Column(String(255), nullable=False)
-    email = Column(String, nullable=False)
+    # loads the previous email on change, so its cache entry can be dropped
+    email = column_property(
+        Column(String, nullable=False, unique=True, index=True), active_history=True
+    )
     password = Column(String)
     job_title = Column(String(150), nullable=False)
     is_super_user = Column(Boolean, nullable=False)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
+    # keyset pagination order (USER_PAGE_KEY)
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
+    # fetch server generated columns (created_at) with RETURNING on INSERT
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return (
             f"<UserModel id={self.id}, first_name={self.first_name}, last_name={self.last_name}, "
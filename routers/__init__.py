@@ -1,6 +1,19 @@
+from .admin_routes import admin_router
+from .autocomplete_routes import autocomplete_router
 from .courses_routes import courses_router
+from .jobs_routes import jobs_router
+from .metrics_routes import metrics_router
 from .modules_routes import module_router
 from .subject_routes import subject_router
 from .users_routes import user_router
 
-__all__ = [courses_router, subject_router, module_router, user_router]
+__all__ = [
+    courses_router,
+    subject_router,
+    module_router,
+    user_router,
+    admin_router,
+    jobs_router,
+    autocomplete_router,
+    metrics_router,
+]
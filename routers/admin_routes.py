@@ -0,0 +1,114 @@
+import asyncio
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+
+from auth.cache import principal_cache, token_cache
+from auth.hashing import hashing_pool
+from core.instrumentation import route_stats
+from core.profiler import ProfilerBusyError, SamplingProfiler
+from core.settings import Settings
+from core.slow_queries import slow_query_log
+from models.session import async_pool_metrics, pool_metrics
+from schemas.admin_schemas import (
+    CacheStats,
+    HashingStats,
+    PoolStats,
+    ResponseCacheStats,
+    RouteTimingStats,
+    SlowQuery,
+)
+from utils import Tags, verify_super_user
+from utils.response_cache import response_cache
+
+admin_router = APIRouter(
+    prefix="/admin", tags=[Tags.admin], dependencies=[Depends(verify_super_user)]
+)
+
+
+@admin_router.get(
+    "/pool",
+    status_code=status.HTTP_200_OK,
+    response_model=List[PoolStats],
+    summary="Database connection pool statistics",
+)
+async def get_pool_stats():
+    return [
+        PoolStats(engine="sync", **pool_metrics.stats()),
+        PoolStats(engine="async", **async_pool_metrics.stats()),
+    ]
+
+
+@admin_router.get(
+    "/hashing",
+    status_code=status.HTTP_200_OK,
+    response_model=HashingStats,
+    summary="Password hashing pool statistics",
+)
+async def get_hashing_stats():
+    return HashingStats(**hashing_pool.stats())
+
+
+@admin_router.get(
+    "/cache",
+    status_code=status.HTTP_200_OK,
+    response_model=List[CacheStats],
+    summary="In-process cache statistics",
+)
+async def get_cache_stats():
+    return [CacheStats(**cache.stats()) for cache in (token_cache, principal_cache)]
+
+
+@admin_router.get(
+    "/response_cache",
+    status_code=status.HTTP_200_OK,
+    response_model=ResponseCacheStats,
+    summary="Response cache statistics",
+)
+async def get_response_cache_stats():
+    return ResponseCacheStats(**response_cache.stats())
+
+
+@admin_router.get(
+    "/requests",
+    status_code=status.HTTP_200_OK,
+    response_model=List[RouteTimingStats],
+    summary="Per-route request timing percentiles",
+)
+async def get_request_stats():
+    return [RouteTimingStats(**stats) for stats in route_stats.stats()]
+
+
+@admin_router.get(
+    "/slow_queries",
+    status_code=status.HTTP_200_OK,
+    response_model=List[SlowQuery],
+    summary="Most recent slow SQL statements",
+)
+async def get_slow_queries():
+    return [SlowQuery(**entry) for entry in slow_query_log.recent()]
+
+
+@admin_router.get(
+    "/profile",
+    status_code=status.HTTP_200_OK,
+    summary="Sample the worker's stacks for a while, as a speedscope profile",
+)
+async def get_profile(
+    seconds: Annotated[float, Query(gt=0, le=Settings.PROFILER_MAX_SECONDS)] = 10,
+):
+    profiler = SamplingProfiler(Settings.PROFILER_INTERVAL_MS / 1000)
+
+    try:
+        profiler.start()
+    except ProfilerBusyError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+
+    try:
+        # the worker keeps serving requests, which is what gets sampled
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+
+    return JSONResponse(profiler.speedscope(f"{seconds:g} seconds"))
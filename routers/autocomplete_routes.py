@@ -0,0 +1,33 @@
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from crud.aio.autocomplete import autocomplete
+from schemas.autocomplete_schemas import Suggestion, SuggestionKind
+from utils import Tags, get_async_sessionmaker
+
+autocomplete_router = APIRouter(prefix="/autocomplete", tags=[Tags.autocomplete])
+
+
+@autocomplete_router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    response_model=List[Suggestion],
+    summary="Course and subject titles starting with a prefix",
+)
+async def get_suggestions(
+    # lookups are served from memory: no session is opened per request
+    session_factory: Annotated[async_sessionmaker, Depends(get_async_sessionmaker)],
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Title prefix")],
+    limit: Annotated[
+        int, Query(gt=0, le=50, description="Number of suggestions to fetch")
+    ] = 10,
+    kind: Annotated[
+        Optional[SuggestionKind], Query(description="Only suggest this kind")
+    ] = None,
+):
+    kinds = [kind.value] if kind else [kind.value for kind in SuggestionKind]
+    matches = await autocomplete(session_factory, q, limit, kinds)
+
+    return [Suggestion(kind=kind, id=id_, title=title) for kind, id_, title in matches]
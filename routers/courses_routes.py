@@ -1,39 +1,149 @@
-from typing import Annotated, List, Union
+from typing import Annotated, AsyncIterator, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from crud.courses_crud import (
+from core.exceptions import InvalidCursorError
+from core.settings import Settings
+from crud.aio.courses_crud import (
+    COURSE_PAGE_KEY,
     db_create_course,
-    db_insert_many,
     delete_course_by_id,
     get_all_courses,
     get_course_by_id,
+    get_courses_by_ids,
+    stream_courses,
     update_course_by_id,
 )
+from crud.aio.courses_import import db_import_courses
+from crud.aio.courses_search import search_courses
 from models.course_models import CourseModel
 from schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
     CourseBase,
     CourseResponse,
+    IngestReport,
     UpdateCourseBase,
 )
-from utils import Tags, get_db, verify_super_user
+from schemas.job_schemas import JobStatus
+from utils import Tags, get_async_db, get_async_sessionmaker, verify_super_user
+from utils.conditional import conditional_response, dump_json, rows_etag
+from utils.export import MEDIA_TYPES, ExportFormat, render_csv, render_ndjson
+from utils.fields import FIELDS_DESCRIPTION, list_adapter, parse_fields
+from utils.ingest import STREAMING_BODY, ingest
+from utils.jobs import COURSES_JOB, accept_job
+from utils.pagination import set_next_cursor
+from utils.response_cache import response_cache
+from utils.responses import model_response
 
 courses_router = APIRouter(prefix="/courses", tags=[Tags.courses])
 
+course_adapter = TypeAdapter(CourseResponse)
+course_list_adapter = TypeAdapter(List[CourseResponse])
+course_batch_adapter = TypeAdapter(BatchGetResponse[CourseResponse])
+course_create_adapter = TypeAdapter(List[CourseBase])
+
 
 @courses_router.get(
     "",
     status_code=status.HTTP_200_OK,
     response_model=List[CourseResponse],
 )
-def get_courses(
-    db: Annotated[Session, Depends(get_db)],
-    limit: Annotated[int, Query(10, gt=0, le=100, description="Number of records to fetch")],
+async def get_courses(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    limit: Annotated[
+        int, Query(gt=0, le=100, description="Number of records to fetch")
+    ] = 10,
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Cursor from the X-Next-Cursor header of the previous page"),
+    ] = None,
+    fields: Annotated[Optional[str], Query(description=FIELDS_DESCRIPTION)] = None,
+):
+    selected = parse_fields(fields, CourseResponse)
+
+    try:
+        courses = await get_all_courses(db, limit, cursor=cursor, fields=selected)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+    response = conditional_response(
+        request,
+        lambda: dump_json(list_adapter(CourseResponse, selected), courses),
+        # course.updated also moves with the course's module and subject
+        etag=rows_etag(
+            courses, "id", "updated", variant=",".join(sorted(selected or ()))
+        ),
+        last_modified=max((course.updated for course in courses), default=None),
+    )
+    set_next_cursor(response, courses, limit, COURSE_PAGE_KEY)
+
+    return response
+
+
+async def _export_chunks(
+    session_factory: async_sessionmaker, export_format: ExportFormat
+) -> AsyncIterator[bytes]:
+    async with session_factory() as db:
+        if export_format is ExportFormat.csv:
+            yield render_csv([], header=True)
+
+        async for batch in stream_courses(db):
+            if export_format is ExportFormat.csv:
+                yield render_csv(batch)
+            else:
+                yield render_ndjson(batch)
+
+
+@courses_router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Export the whole course catalog",
+)
+async def export_courses(
+    session_factory: Annotated[async_sessionmaker, Depends(get_async_sessionmaker)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.ndjson,
 ):
-    courses = get_all_courses(db, limit)
+    return StreamingResponse(
+        _export_chunks(session_factory, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="courses.{export_format.value}"'
+            )
+        },
+    )
+
 
-    return courses
+@courses_router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=List[CourseResponse],
+    summary="Search courses by title and overview",
+)
+async def search(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Search terms")],
+    limit: Annotated[
+        int, Query(gt=0, le=100, description="Number of records to fetch")
+    ] = 10,
+):
+    return model_response(course_list_adapter, await search_courses(db, q, limit))
 
 
 @courses_router.get(
@@ -41,16 +151,41 @@ def get_courses(
     status_code=status.HTTP_200_OK,
     response_model=CourseResponse,
 )
-def get_course(course_id: str, db: Annotated[Session, Depends(get_db)]):
-    course: Union[None, CourseModel] = get_course_by_id(db=db, course_id=course_id)
+async def get_course(
+    request: Request,
+    course_id: str,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    cached = await response_cache.read_through(
+        request,
+        "courses",
+        course_id,
+        CourseResponse,
+        lambda: get_course_by_id(db=db, course_id=course_id),
+        last_modified=lambda course: course.updated,
+    )
 
-    if course is None:
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Could not find course with ID: {course_id}",
         )
 
-    return course
+    return cached
+
+
+@courses_router.post(
+    "/batch_get",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchGetResponse[CourseResponse],
+    summary="Get courses by a list of IDs",
+)
+async def batch_get_courses(
+    body: BatchGetRequest, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    found, missing = await get_courses_by_ids(db, body.ids)
+
+    return model_response(course_batch_adapter, {"items": found, "missing": missing})
 
 
 @courses_router.post(
@@ -59,20 +194,61 @@ def get_course(course_id: str, db: Annotated[Session, Depends(get_db)]):
     response_model=CourseResponse,
     dependencies=[Depends(verify_super_user)],
 )
-async def create_course(course: CourseBase, db: Annotated[Session, Depends(get_db)]):
-    return await db_create_course(db, course)
+async def create_course(
+    course: CourseBase, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    created = await db_create_course(db, course)
+
+    return model_response(course_adapter, created, status.HTTP_201_CREATED)
 
 
 @courses_router.post(
     "/course_many",
     status_code=status.HTTP_201_CREATED,
     response_model=List[CourseResponse],
+    responses={status.HTTP_202_ACCEPTED: {"model": JobStatus}},
     dependencies=[Depends(verify_super_user)],
 )
 async def create_courses(
-    courses: List[CourseBase], db: Annotated[Session, Depends(get_db)]
+    courses: List[CourseBase],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    run_async: Annotated[
+        bool, Query(alias="async", description="Import in a background job")
+    ] = False,
+):
+    if run_async:
+        return await accept_job(COURSES_JOB, courses)
+
+    created, report = await db_import_courses(db, courses)
+
+    return model_response(
+        course_list_adapter,
+        created,
+        status.HTTP_201_CREATED,
+        headers={
+            "X-Import-Rows": str(report.rows),
+            "X-Import-Rows-Per-Second": f"{report.rows_per_second:.0f}",
+        },
+    )
+
+
+@courses_router.post(
+    "/course_many/stream",
+    status_code=status.HTTP_201_CREATED,
+    response_model=IngestReport,
+    dependencies=[Depends(verify_super_user)],
+    summary="Create courses from a streamed JSON array or NDJSON body",
+    openapi_extra=STREAMING_BODY,
+)
+async def create_courses_stream(
+    request: Request, db: Annotated[AsyncSession, Depends(get_async_db)]
 ):
-    return await db_insert_many(db, courses)
+    return await ingest(
+        request,
+        course_create_adapter,
+        lambda chunk: db_import_courses(db, chunk),
+        Settings.INGEST_CHUNK_SIZE,
+    )
 
 
 @courses_router.put(
@@ -81,10 +257,12 @@ async def create_courses(
     status_code=status.HTTP_202_ACCEPTED,
     dependencies=[Depends(verify_super_user)],
 )
-def update_course(
-    course_id: str, course: UpdateCourseBase, db: Annotated[Session, Depends(get_db)]
+async def update_course(
+    course_id: str,
+    course: UpdateCourseBase,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ):
-    updated: Union[None, CourseModel] = update_course_by_id(
+    updated: Union[None, CourseModel] = await update_course_by_id(
         db=db, course_id=course_id, body=course
     )
 
@@ -94,7 +272,9 @@ def update_course(
             detail=f"Could not find course with ID: {course_id}",
         )
 
-    return updated
+    await response_cache.invalidate("courses", course_id)
+
+    return model_response(course_adapter, updated, status.HTTP_202_ACCEPTED)
 
 
 @courses_router.delete(
@@ -102,11 +282,15 @@ def update_course(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(verify_super_user)],
 )
-def delete_course(course_id: str, db: Annotated[Session, Depends(get_db)]):
-    deleted_course = delete_course_by_id(db, course_id)
+async def delete_course(
+    course_id: str, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    deleted_course = await delete_course_by_id(db, course_id)
 
     if deleted_course is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Could not find course with ID: {course_id}",
         )
+
+    await response_cache.invalidate("courses", course_id)
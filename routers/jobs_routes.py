@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from schemas.job_schemas import JobStatus
+from utils import Tags, verify_super_user
+from utils.jobs import job_queue
+
+jobs_router = APIRouter(
+    prefix="/jobs", tags=[Tags.jobs], dependencies=[Depends(verify_super_user)]
+)
+
+
+@jobs_router.get(
+    "/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=JobStatus,
+    summary="Progress of a background bulk import",
+)
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find job with ID: {job_id}",
+        )
+
+    return job
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response, status
+
+from core.metrics import CONTENT_TYPE
+from utils import Tags
+from utils.metrics import exporter
+
+metrics_router = APIRouter(tags=[Tags.metrics])
+
+
+@metrics_router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    summary="Metrics in the Prometheus text exposition format",
+)
+async def get_metrics():
+    return Response(content=exporter.expose(), media_type=CONTENT_TYPE)
@@ -1,22 +1,46 @@
-from typing import Annotated, List, Union
+from typing import Annotated, List, Optional, Sequence, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.modules_crud import (
+from core.exceptions import InvalidCursorError
+from crud.aio.courses_crud import get_course_ids
+from crud.aio.modules_crud import (
+    MODULE_PAGE_KEY,
     db_create_module,
     db_read_all_modules,
     db_read_module_by_id,
+    db_read_modules_by_ids,
     db_update_module,
     delete_module_by_id,
 )
 from models.module_models import ModuleModel
-from schemas import ModuleResponse, UpdateModuleBase
+from schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    ModuleResponse,
+    UpdateModuleBase,
+)
 from schemas.module_schemas import ModuleBase
-from utils import Tags, get_db, verify_super_user
+from utils import Tags, get_async_db, verify_super_user
+from utils.conditional import conditional_response, dump_json
+from utils.fields import FIELDS_DESCRIPTION, list_adapter, parse_fields
+from utils.pagination import set_next_cursor
+from utils.response_cache import response_cache
+from utils.responses import model_response
 
 module_router = APIRouter(prefix="/modules", tags=[Tags.modules])
 
+module_adapter = TypeAdapter(ModuleResponse)
+module_batch_adapter = TypeAdapter(BatchGetResponse[ModuleResponse])
+
+
+async def invalidate_module(module_id: str, course_ids: Sequence[str]) -> None:
+    # course responses embed their module, so those entries go stale too
+    await response_cache.invalidate("modules", module_id)
+    await response_cache.invalidate("courses", *course_ids)
+
 
 @module_router.get(
     "",
@@ -25,10 +49,32 @@ module_router = APIRouter(prefix="/modules", tags=[Tags.modules])
     tags=[Tags.modules],
     summary="Query Course modules",
 )
-def get_modules(
-    db: Annotated[Session, Depends(get_db)], limit: Annotated[int, Query(10, gt=0, le=100)]
+async def get_modules(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Cursor from the X-Next-Cursor header of the previous page"),
+    ] = None,
+    fields: Annotated[Optional[str], Query(description=FIELDS_DESCRIPTION)] = None,
 ):
-    return db_read_all_modules(db, limit)
+    selected = parse_fields(fields, ModuleResponse)
+
+    try:
+        modules = await db_read_all_modules(db, limit, cursor=cursor, fields=selected)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+    response = conditional_response(
+        request, dump_json(list_adapter(ModuleResponse, selected), modules)
+    )
+    set_next_cursor(response, modules, limit, MODULE_PAGE_KEY)
+
+    return response
 
 
 @module_router.get(
@@ -38,16 +84,40 @@ def get_modules(
     tags=[Tags.modules],
     summary="Query Course module by ID",
 )
-def get_module_by_id(module_id: str, db: Annotated[Session, Depends(get_db)]):
-    module: Union[ModuleModel, None] = db_read_module_by_id(db=db, module_id=module_id)
-
-    if module is None:
+async def get_module_by_id(
+    request: Request,
+    module_id: str,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    cached = await response_cache.read_through(
+        request,
+        "modules",
+        module_id,
+        ModuleResponse,
+        lambda: db_read_module_by_id(db=db, module_id=module_id),
+    )
+
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Module with id: {module_id} does not exist",
         )
 
-    return module
+    return cached
+
+
+@module_router.post(
+    "/batch_get",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchGetResponse[ModuleResponse],
+    summary="Get modules by a list of IDs",
+)
+async def batch_get_modules(
+    body: BatchGetRequest, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    found, missing = await db_read_modules_by_ids(db, body.ids)
+
+    return model_response(module_batch_adapter, {"items": found, "missing": missing})
 
 
 @module_router.post(
@@ -56,9 +126,12 @@ def get_module_by_id(module_id: str, db: Annotated[Session, Depends(get_db)]):
     response_model=ModuleResponse,
     dependencies=[Depends(verify_super_user)],
 )
-async def create_module(module: ModuleBase, db: Annotated[Session, Depends(get_db)]):
+async def create_module(
+    module: ModuleBase, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
     created = await db_create_module(db, module)
-    return created
+
+    return model_response(module_adapter, created, status.HTTP_201_CREATED)
 
 
 @module_router.put(
@@ -71,7 +144,7 @@ async def create_module(module: ModuleBase, db: Annotated[Session, Depends(get_d
 )
 async def update_module(
     *,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     module_id: str,
     content: UpdateModuleBase,
 ):
@@ -83,7 +156,9 @@ async def update_module(
             detail=f"Could not find module with ID: {module_id}",
         )
 
-    return module
+    await invalidate_module(module_id, await get_course_ids(db, module_id=module_id))
+
+    return model_response(module_adapter, module, status.HTTP_202_ACCEPTED)
 
 
 @module_router.delete(
@@ -91,8 +166,10 @@ async def update_module(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(verify_super_user)],
 )
-async def delete_module(module_id: str, db: Annotated[Session, Depends(get_db)]):
-    module = get_module_by_id(module_id, db)
+async def delete_module(
+    module_id: str, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    module = await db_read_module_by_id(db=db, module_id=module_id)
 
     if module is None:
         raise HTTPException(
@@ -100,4 +177,8 @@ async def delete_module(module_id: str, db: Annotated[Session, Depends(get_db)])
             detail=f"Could not find module with ID: {module_id}",
         )
 
-    await delete_module_by_id(db, module_id)
+    # read before the delete: the courses embedding the module cascade with it
+    course_ids = await get_course_ids(db, module_id=module_id)
+    await delete_module_by_id(db, module_id, course_ids)
+    # once committed, so that concurrent reads cannot cache the deleted rows again
+    await invalidate_module(module_id, course_ids)
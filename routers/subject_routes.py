@@ -1,22 +1,46 @@
-from typing import Annotated, List, Union
+from typing import Annotated, List, Optional, Sequence, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.subjects_crud import (
+from core.exceptions import InvalidCursorError
+from crud.aio.courses_crud import get_course_ids
+from crud.aio.subjects_crud import (
+    SUBJECT_PAGE_KEY,
     db_create_subject,
     db_read_all_subjects,
     db_read_subject_by_id,
+    db_read_subjects_by_ids,
     db_update_subject,
     delete_subject_by_id,
 )
 from models.subject_models import SubjectModel
-from schemas import SubjectResponse, UpdateSubjectBase
+from schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    SubjectResponse,
+    UpdateSubjectBase,
+)
 from schemas.subject_schemas import SubjectBase
-from utils import Tags, get_db, verify_super_user
+from utils import Tags, get_async_db, verify_super_user
+from utils.conditional import conditional_response, dump_json
+from utils.fields import FIELDS_DESCRIPTION, list_adapter, parse_fields
+from utils.pagination import set_next_cursor
+from utils.response_cache import response_cache
+from utils.responses import model_response
 
 subject_router = APIRouter(prefix="/subjects", tags=[Tags.subjects])
 
+subject_adapter = TypeAdapter(SubjectResponse)
+subject_batch_adapter = TypeAdapter(BatchGetResponse[SubjectResponse])
+
+
+async def invalidate_subject(subject_id: str, course_ids: Sequence[str]) -> None:
+    # course responses embed their subject, so those entries go stale too
+    await response_cache.invalidate("subjects", subject_id)
+    await response_cache.invalidate("courses", *course_ids)
+
 
 @subject_router.get(
     "",
@@ -24,10 +48,32 @@ subject_router = APIRouter(prefix="/subjects", tags=[Tags.subjects])
     response_model=List[SubjectResponse],
     tags=[Tags.subjects],
 )
-def get_subjects(
-    db: Annotated[Session, Depends(get_db)], limit: Annotated[int, Query(10, gt=0, le=100)]
+async def get_subjects(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Cursor from the X-Next-Cursor header of the previous page"),
+    ] = None,
+    fields: Annotated[Optional[str], Query(description=FIELDS_DESCRIPTION)] = None,
 ):
-    return db_read_all_subjects(db, limit)
+    selected = parse_fields(fields, SubjectResponse)
+
+    try:
+        subjects = await db_read_all_subjects(db, limit, cursor=cursor, fields=selected)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+    response = conditional_response(
+        request, dump_json(list_adapter(SubjectResponse, selected), subjects)
+    )
+    set_next_cursor(response, subjects, limit, SUBJECT_PAGE_KEY)
+
+    return response
 
 
 @subject_router.get(
@@ -36,15 +82,39 @@ def get_subjects(
     response_model=SubjectResponse,
     tags=[Tags.subjects],
 )
-def get_subject(subject_id: str, db: Annotated[Session, Depends(get_db)]):
-    subject: Union[SubjectModel, None] = db_read_subject_by_id(db, subject_id)
+async def get_subject(
+    request: Request,
+    subject_id: str,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    cached = await response_cache.read_through(
+        request,
+        "subjects",
+        subject_id,
+        SubjectResponse,
+        lambda: db_read_subject_by_id(db, subject_id),
+    )
 
-    if subject is None:
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Could not find subject with ID: {subject_id}",
         )
-    return subject
+    return cached
+
+
+@subject_router.post(
+    "/batch_get",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchGetResponse[SubjectResponse],
+    summary="Get subjects by a list of IDs",
+)
+async def batch_get_subjects(
+    body: BatchGetRequest, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    found, missing = await db_read_subjects_by_ids(db, body.ids)
+
+    return model_response(subject_batch_adapter, {"items": found, "missing": missing})
 
 
 @subject_router.post(
@@ -53,8 +123,12 @@ def get_subject(subject_id: str, db: Annotated[Session, Depends(get_db)]):
     response_model=SubjectResponse,
     dependencies=[Depends(verify_super_user)],
 )
-async def create_subject(subject: SubjectBase, db: Annotated[Session, Depends(get_db)]):
-    return await db_create_subject(db, subject)
+async def create_subject(
+    subject: SubjectBase, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    created = await db_create_subject(db, subject)
+
+    return model_response(subject_adapter, created, status.HTTP_201_CREATED)
 
 
 @subject_router.put(
@@ -66,7 +140,7 @@ async def create_subject(subject: SubjectBase, db: Annotated[Session, Depends(ge
 )
 async def update_subject(
     *,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     subject_id: str,
     content: UpdateSubjectBase,
 ):
@@ -80,7 +154,11 @@ async def update_subject(
             detail=f"Could not find subject with ID: {subject_id}",
         )
 
-    return subject
+    await invalidate_subject(
+        subject_id, await get_course_ids(db, subject_id=subject_id)
+    )
+
+    return model_response(subject_adapter, subject, status.HTTP_202_ACCEPTED)
 
 
 @subject_router.delete(
@@ -88,8 +166,10 @@ async def update_subject(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(verify_super_user)],
 )
-async def delete_module(subject_id: str, db: Annotated[Session, Depends(get_db)]):
-    subject = db_read_subject_by_id(db, subject_id)
+async def delete_module(
+    subject_id: str, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    subject = await db_read_subject_by_id(db, subject_id)
 
     if subject is None:
         raise HTTPException(
@@ -97,4 +177,8 @@ async def delete_module(subject_id: str, db: Annotated[Session, Depends(get_db)]
             detail=f"Could not find subject with ID: {subject_id}",
         )
 
-    await delete_subject_by_id(db, subject_id)
+    # read before the delete: the courses embedding the subject cascade with it
+    course_ids = await get_course_ids(db, subject_id=subject_id)
+    await delete_subject_by_id(db, subject_id, course_ids)
+    # once committed, so that concurrent reads cannot cache the deleted rows again
+    await invalidate_subject(subject_id, course_ids)
@@ -1,26 +1,50 @@
-from typing import Annotated, List, Union
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import Annotated, List, Optional, Union
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from auth.authenticate import create_access_token, logout
 from auth.hashing import verify_password
-from crud.users_crud import (
+from core.exceptions import InvalidCursorError
+from core.settings import Settings
+from crud.aio.users_crud import (
+    USER_PAGE_KEY,
     db_create_user,
     db_insert_many,
     get_all_users,
-    get_user_by_email,
     get_user_by_id,
     user_registration,
 )
+from crud.aio.users_crud import get_user_by_email as db_get_user_by_email
+from crud.users_crud import get_user_by_email
 from models.user_models import UserModel
+from schemas import IngestReport
 from schemas.auth_schemas import Token
+from schemas.job_schemas import JobStatus
 from schemas.user_schemas import UserCreate, UserResponse
-from utils import Tags, get_db, verify_super_user
+from utils import Tags, get_async_db, get_db, verify_super_user
+from utils.fields import FIELDS_DESCRIPTION, list_adapter, parse_fields
+from utils.ingest import STREAMING_BODY, ingest
+from utils.jobs import USERS_JOB, accept_job
+from utils.pagination import set_next_cursor
+from utils.responses import model_response
 
 user_router = APIRouter(prefix="/user", tags=[Tags.users])
 
+user_adapter = TypeAdapter(UserResponse)
+user_list_adapter = TypeAdapter(List[UserResponse])
+user_create_adapter = TypeAdapter(List[UserCreate])
+
 
 @user_router.post(
     "",
@@ -29,15 +53,19 @@ user_router = APIRouter(prefix="/user", tags=[Tags.users])
     summary="Create a user",
     dependencies=[Depends(verify_super_user)],
 )
-async def create_user(user: UserCreate, db: Annotated[Session, Depends(get_db)]):
-    user_exists = get_user_by_email(db, user.email)
+async def create_user(
+    user: UserCreate, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    user_exists = await db_get_user_by_email(db, user.email)
 
     if user_exists is not None:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
-    return await db_create_user(db, user)
+    created = await db_create_user(db, user)
+
+    return model_response(user_adapter, created, status.HTTP_201_CREATED)
 
 
 @user_router.post(
@@ -45,13 +73,41 @@ async def create_user(user: UserCreate, db: Annotated[Session, Depends(get_db)])
     status_code=status.HTTP_201_CREATED,
     response_model=List[UserResponse],
     summary="Create users by passing a json Array of user objects",
+    responses={status.HTTP_202_ACCEPTED: {"model": JobStatus}},
     dependencies=[Depends(verify_super_user)],
 )
 async def create_users(
-    users: List[UserCreate], db: Annotated[Session, Depends(get_db)]
+    users: List[UserCreate],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    run_async: Annotated[
+        bool, Query(alias="async", description="Create in a background job")
+    ] = False,
 ):
+    if run_async:
+        return await accept_job(USERS_JOB, users)
+
     res: List[UserModel] = await db_insert_many(db, users)
-    return res
+
+    return model_response(user_list_adapter, res, status.HTTP_201_CREATED)
+
+
+@user_router.post(
+    "/create_many/stream",
+    status_code=status.HTTP_201_CREATED,
+    response_model=IngestReport,
+    summary="Create users from a streamed JSON array or NDJSON body",
+    dependencies=[Depends(verify_super_user)],
+    openapi_extra=STREAMING_BODY,
+)
+async def create_users_stream(
+    request: Request, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    return await ingest(
+        request,
+        user_create_adapter,
+        lambda chunk: db_insert_many(db, chunk),
+        Settings.INGEST_CHUNK_SIZE,
+    )
 
 
 @user_router.get(
@@ -59,13 +115,31 @@ async def create_users(
     status_code=status.HTTP_200_OK,
     response_model=List[UserResponse],
 )
-def get_users(
-    db: Annotated[Session, Depends(get_db)],
-    limit: Annotated[int, Query(10, gt=0, le=100, description="Number of records to fetch")],
+async def get_users(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    limit: Annotated[
+        int, Query(gt=0, le=100, description="Number of records to fetch")
+    ] = 10,
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Cursor from the X-Next-Cursor header of the previous page"),
+    ] = None,
+    fields: Annotated[Optional[str], Query(description=FIELDS_DESCRIPTION)] = None,
 ):
-    users = get_all_users(db, limit)
+    selected = parse_fields(fields, UserResponse)
 
-    return users
+    try:
+        users = await get_all_users(db, limit, cursor=cursor, fields=selected)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+    response = model_response(list_adapter(UserResponse, selected), users)
+    set_next_cursor(response, users, limit, USER_PAGE_KEY)
+
+    return response
 
 
 @user_router.get(
@@ -73,8 +147,8 @@ def get_users(
     status_code=status.HTTP_200_OK,
     response_model=UserResponse,
 )
-def get_user(user_id: str, db: Annotated[Session, Depends(get_db)]):
-    user: Union[None, UserResponse] = get_user_by_id(db=db, user_id=user_id)
+async def get_user(user_id: str, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    user: Union[None, UserResponse] = await get_user_by_id(db=db, user_id=user_id)
 
     if user is None:
         raise HTTPException(
@@ -82,9 +156,11 @@ def get_user(user_id: str, db: Annotated[Session, Depends(get_db)]):
             detail="Could not find user matching the credentials given",
         )
 
-    return user
+    return model_response(user_adapter, user)
 
 
+# login stays synchronous: it runs in the request threadpool and waits there for
+# the bounded hashing pool to check the password
 @user_router.post("/login", status_code=status.HTTP_200_OK)
 def login(
     database: Annotated[Session, Depends(get_db)],
@@ -104,14 +180,18 @@ def login(
             status_code=status.HTTP_404_NOT_FOUND, detail="Invalid Credentials"
         )
 
-    access_token = create_access_token(data={"user": user.email})
+    access_token = create_access_token(
+        data={"user": user.email}, is_super_user=user.is_super_user
+    )
 
     return Token(access_token=access_token)
 
 
 @user_router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register_user(req: UserCreate, database: Annotated[Session, Depends(get_db)]):
-    user = get_user_by_email(database, req.email)
+async def register_user(
+    req: UserCreate, database: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    user = await db_get_user_by_email(database, req.email)
     if user:
         raise HTTPException(
             status_code=400,
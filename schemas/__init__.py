@@ -1,13 +1,25 @@
 """This module initializes the schemas package."""
 
-from .course_schemas import CourseBase, CourseResponse, UpdateCourseBase
+from .batch_schemas import BatchGetRequest, BatchGetResponse
+from .course_schemas import (
+    CourseBase,
+    CourseImportReport,
+    CourseResponse,
+    UpdateCourseBase,
+)
+from .ingest_schemas import ChunkReport, IngestReport
 from .module_schemas import ModuleResponse, UpdateModuleBase
 from .subject_schemas import SubjectResponse, UpdateSubjectBase
 
 __all__ = [
+    "BatchGetRequest",
+    "BatchGetResponse",
     "CourseBase",
     "UpdateCourseBase",
     "CourseResponse",
+    "CourseImportReport",
+    "ChunkReport",
+    "IngestReport",
     "ModuleResponse",
     "UpdateModuleBase",
     "SubjectResponse",
@@ -0,0 +1,93 @@
+"""Admin schemas module."""
+
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    """Connection pool statistics schema."""
+
+    engine: str
+    pool: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    idle: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int
+    connects: int
+    avg_connect_ms: float
+    max_connect_ms: float
+    avg_hold_ms: float
+    max_hold_ms: float
+
+
+class HashingStats(BaseModel):
+    """Password hashing pool statistics schema."""
+
+    mode: str
+    workers: int
+    in_flight: int
+    queue_depth: int
+    queue_limit: int
+    max_in_flight: int
+    rejected: int
+    completed: int
+    avg_latency_ms: float
+
+
+class CacheStats(BaseModel):
+    """Cache statistics schema."""
+
+    name: str
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
+class ResponseCacheStats(BaseModel):
+    """Response cache statistics schema."""
+
+    backend: str
+    ttl: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class Percentiles(BaseModel):
+    """Percentiles of one request metric schema."""
+
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class RouteTimingStats(BaseModel):
+    """Per-route request timing statistics schema."""
+
+    route: str
+    count: int
+    samples: int
+    wall_ms: Percentiles
+    db_ms: Percentiles
+    queries: Percentiles
+    rows: Percentiles
+    serialization_ms: Percentiles
+
+
+class SlowQuery(BaseModel):
+    """Slow query log entry schema."""
+
+    timestamp: str
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    executemany: Optional[int] = None
+    function: Optional[str] = None
+    route: Optional[str] = None
+    explain: Optional[str] = None
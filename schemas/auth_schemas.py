@@ -16,3 +16,5 @@ class TokenData(BaseModel):
     """Token data schema."""
 
     email: Optional[str] = None
+    role: Optional[str] = None
+    version: Optional[int] = None
@@ -0,0 +1,20 @@
+"""Autocomplete schemas."""
+
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class SuggestionKind(str, Enum):
+    """Kinds of rows whose titles are suggested."""
+
+    course = "course"
+    subject = "subject"
+
+
+class Suggestion(BaseModel):
+    """Autocomplete suggestion schema."""
+
+    kind: SuggestionKind
+    id: str
+    title: str
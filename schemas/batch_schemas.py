@@ -0,0 +1,22 @@
+"""Batch get schemas."""
+
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel, Field
+
+from core.settings import Settings
+
+T = TypeVar("T")
+
+
+class BatchGetRequest(BaseModel):
+    """IDs to fetch in one request."""
+
+    ids: List[str] = Field(..., min_length=1, max_length=Settings.BATCH_GET_MAX_IDS)
+
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    """Rows found, in the order their IDs were requested, and IDs not found."""
+
+    items: List[T]
+    missing: List[str]
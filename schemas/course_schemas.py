@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .module_schemas import ModuleBase, ModuleResponse, UpdateModuleBase
 from .subject_schemas import SubjectBase, SubjectResponse, UpdateSubjectBase
@@ -29,10 +29,7 @@ class CourseResponse(CourseBase):
     module: ModuleResponse
     subject: SubjectResponse
 
-    class Config:
-        """Config schema class."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UpdateCourseBase(CourseBase):
@@ -46,7 +43,13 @@ class UpdateCourseBase(CourseBase):
     overview: Optional[str] = None
     created: Optional[datetime] = None
 
-    class Config:
-        """Config schema class."""
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CourseImportReport(BaseModel):
+    """CourseImportReport schema class."""
 
-        orm_mode = True
+    rows: int
+    seconds: float
+    rows_per_second: float
+    method: str
@@ -0,0 +1,22 @@
+"""Streaming ingest schemas."""
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ChunkReport(BaseModel):
+    """Throughput of one validated and inserted chunk."""
+
+    rows: int
+    seconds: float
+    rows_per_second: float
+
+
+class IngestReport(BaseModel):
+    """IngestReport schema class."""
+
+    rows: int
+    seconds: float
+    rows_per_second: float
+    chunks: List[ChunkReport]
@@ -0,0 +1,23 @@
+"""Background job schemas."""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class JobStatus(BaseModel):
+    """JobStatus schema class."""
+
+    id: str
+    kind: str
+    status: Literal["queued", "running", "completed", "failed"]
+    rows_total: int
+    rows_done: int
+    batches_total: int
+    batches_done: int
+    rows_per_second: float
+    errors: List[str]
+    created: datetime
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
@@ -3,7 +3,7 @@
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ModuleBase(BaseModel):
@@ -18,10 +18,7 @@ class ModuleResponse(ModuleBase):
 
     id: UUID
 
-    class Config:
-        """Pydantic config."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UpdateModuleBase(ModuleBase):
@@ -30,7 +27,4 @@ class UpdateModuleBase(ModuleBase):
     title: Optional[str] = Field(None, max_length=200)
     description: Optional[str] = None
 
-    class Config:
-        """Pydantic config."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
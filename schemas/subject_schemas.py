@@ -3,7 +3,7 @@
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SubjectBase(BaseModel):
@@ -18,10 +18,7 @@ class SubjectResponse(SubjectBase):
 
     id: UUID
 
-    class Config:
-        """Pydantic configuration."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UpdateSubjectBase(SubjectBase):
@@ -30,7 +27,4 @@ class UpdateSubjectBase(SubjectBase):
     title: Optional[str] = Field(None, max_length=200)
     slug: Optional[str] = Field(None, max_length=200)
 
-    class Config:
-        """Pydantic configuration."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
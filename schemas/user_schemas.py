@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Union
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class BaseUser(BaseModel):
@@ -11,25 +11,20 @@ class BaseUser(BaseModel):
     job_title: str = Field(..., description="Job title")
     is_super_user: bool = Field(default=False, description="Is Super User")
 
-    class Config:
-        validate_assignment = True
-        anystr_strip_whitespace = True
+    model_config = ConfigDict(validate_assignment=True, str_strip_whitespace=True)
 
 
 class UserCreate(BaseUser):
     password: str = Field(..., min_length=6, max_length=30)
 
-    class Config:
-        validate_assignment = True
-        anystr_strip_whitespace = True
+    model_config = ConfigDict(validate_assignment=True, str_strip_whitespace=True)
 
 
 class UserResponse(BaseUser):
     id: str
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserLogin(BaseModel):
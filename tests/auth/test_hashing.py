@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from auth.hashing import (
+    HashingPool,
+    HashingPoolFullError,
+    _hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_hash_and_verify_async():
+    hashed = await get_password_hash_async("kPrzJ20IllmN")
+
+    assert await verify_password_async("kPrzJ20IllmN", hashed)
+    assert not await verify_password_async("wrong-password", hashed)
+    assert verify_password("kPrzJ20IllmN", hashed)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_hashing_pool_is_bounded():
+    pool = HashingPool(mode="thread", workers=2, queue_limit=4)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def hash_(password):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        try:
+            return _hash(password)
+        finally:
+            with lock:
+                running -= 1
+
+    hashes = await asyncio.gather(*[pool.run_async(hash_, "secret") for _ in range(6)])
+    stats = pool.stats()
+    pool.shutdown()
+
+    assert len(set(hashes)) == 6
+    assert peak <= 2
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["max_in_flight"] == 6
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_hashing_pool_refuses_work_once_queue_is_full():
+    pool = HashingPool(mode="thread", workers=1, queue_limit=1)
+    release = threading.Event()
+
+    running = asyncio.wrap_future(pool.submit(release.wait))
+    queued = asyncio.wrap_future(pool.submit(time.sleep, 0))
+    with pytest.raises(HashingPoolFullError):
+        pool.submit(time.sleep, 0)
+    release.set()
+    await asyncio.gather(running, queued)
+
+    # room again once the queued hashes are done
+    await pool.run_async(time.sleep, 0)
+    stats = pool.stats()
+    pool.shutdown()
+
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 3
+
+
+def test_hashing_pool_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        HashingPool(mode="fibers", workers=1, queue_limit=1)
@@ -0,0 +1,54 @@
+from benchmarks.report import read_baseline, regressions, write_baseline
+
+
+def stats(rps=100.0, p95_ms=10.0, errors=0, requests=1000):
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": rps,
+        "p50_ms": p95_ms / 2,
+        "p95_ms": p95_ms,
+        "p99_ms": p95_ms * 2,
+    }
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+
+    write_baseline(path, {"mix": "read"}, {"GET /courses": stats()})
+
+    assert read_baseline(path) == {
+        "meta": {"mix": "read"},
+        "endpoints": {"GET /courses": stats()},
+    }
+
+
+def test_changes_within_threshold_are_not_regressions():
+    baseline = {"endpoints": {"GET /courses": stats()}}
+
+    found = regressions(baseline, {"GET /courses": stats(85.0, 11.5)}, 0.2)
+
+    assert found == []
+
+
+def test_regressions():
+    baseline = {"endpoints": {"GET /courses": stats(), "GET /modules": stats()}}
+    endpoints = {
+        "GET /courses": stats(rps=70.0, p95_ms=15.0),
+        "GET /modules": stats(errors=5),
+        "GET /subjects": stats(rps=1.0),
+    }
+
+    found = regressions(baseline, endpoints, 0.2)
+
+    assert found == [
+        "GET /courses: 70.0 RPS, baseline 100.0",
+        "GET /courses: p95 15.00 ms, baseline 10.00 ms",
+        "GET /modules: 0.5% errors, baseline 0.0%",
+    ]
+
+
+def test_small_latency_changes_are_noise():
+    baseline = {"endpoints": {"GET /courses": stats(p95_ms=0.5)}}
+
+    assert regressions(baseline, {"GET /courses": stats(p95_ms=1.2)}, 0.2) == []
@@ -1,9 +1,14 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
+from core.instrumentation import install_query_hooks
 from core.settings import Settings
 from main import Base, app
-from utils import get_db
+from models.session import async_pool_metrics, pool_metrics
+from utils import get_async_db, get_async_sessionmaker, get_db
+from utils.jobs import job_queue
 
 DB_NAME = "tests"
 
@@ -13,6 +18,21 @@ SQLALCHEMY_DATABASE_URL = f"postgresql://{Settings.POSTGRES_USER}:{Settings.POST
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{Settings.POSTGRES_USER}:{Settings.POSTGRES_PWD}@{Settings.IP_ADDR}/{DB_NAME}"
+
+# asyncpg connections are bound to the event loop that opened them and the test
+# clients start a new loop per test, so connections must not be pooled
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# /admin/pool, /admin/requests and /metrics report the engines the tests use
+install_query_hooks(engine)
+install_query_hooks(async_engine.sync_engine)
+pool_metrics.install(engine)
+async_pool_metrics.install(async_engine.sync_engine)
+
 
 # with engine.connect() as conn:
 #     conn.execute("commit")
@@ -32,4 +52,12 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_async_sessionmaker] = lambda: TestingAsyncSessionLocal
+job_queue.session_factory = TestingAsyncSessionLocal
@@ -14,7 +14,7 @@ from models.user_models import UserModel
 from schemas.course_schemas import CourseBase
 from schemas.module_schemas import ModuleBase
 from schemas.subject_schemas import SubjectBase
-from tests.conf_test_db import app, override_get_db
+from tests.conf_test_db import app, override_get_async_db, override_get_db
 
 
 @pytest.fixture(scope="class")
@@ -24,10 +24,11 @@ def anyio_backend():
 
 @pytest.fixture(scope="module")
 def test_client():
-    from utils import get_db
+    from utils import get_async_db, get_db
 
     # noinspection PyUnresolvedReferences
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     client = TestClient(app)
     yield client
 
@@ -37,6 +38,35 @@ def faker_seed():
     return randint(101, 500)
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    from auth.cache import principal_cache, token_cache
+
+    yield
+    token_cache.clear()
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    from core.cache_backend import MemoryCacheBackend
+    from core.settings import Settings
+    from utils.response_cache import response_cache
+
+    yield
+    response_cache.backend = MemoryCacheBackend(Settings.RESPONSE_CACHE_SIZE)
+
+
+@pytest.fixture(autouse=True)
+def clear_autocomplete_indexes():
+    from crud.aio.autocomplete import autocomplete_indexes
+
+    yield
+    # fixtures insert rows directly: rebuild from the table on next use
+    for index in autocomplete_indexes.values():
+        index.clear()
+
+
 # noinspection PyUnresolvedReferences
 @pytest.fixture
 def authenticated_user(create_super_user_instance):
@@ -45,8 +75,8 @@ def authenticated_user(create_super_user_instance):
 
     user_ = create_super_user_instance
 
-    from tests.conf_test_db import override_get_db
-    from utils import get_db
+    from tests.conf_test_db import override_get_async_db, override_get_db
+    from utils import get_async_db, get_db
 
     token_ = create_access_token(data={"user": user_.email})
     token_data = get_current_user(token_)
@@ -56,11 +86,13 @@ def authenticated_user(create_super_user_instance):
 
     app.dependency_overrides[verify_super_user] = override_verify_super_user
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_current_user] = lambda: token_data
 
     yield
     del app.dependency_overrides[verify_super_user]
     del app.dependency_overrides[get_db]
+    del app.dependency_overrides[get_async_db]
     del app.dependency_overrides[get_current_user]
 
 
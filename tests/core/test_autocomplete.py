@@ -0,0 +1,90 @@
+from core.autocomplete import PrefixIndex, normalize
+
+
+def make_index():
+    index = PrefixIndex("test")
+    index.rebuild(
+        [
+            ("1", "Intro to  Python"),
+            ("2", "Introduction to SQL"),
+            ("3", "Advanced SQL"),
+        ]
+    )
+    return index
+
+
+def test_normalize():
+    assert normalize("  Intro  TO\tPython ") == "intro to python"
+
+
+def test_complete_in_alphabetical_order():
+    index = make_index()
+
+    assert index.complete("INTRO", 10) == [
+        ("intro to python", "1", "Intro to  Python"),
+        ("introduction to sql", "2", "Introduction to SQL"),
+    ]
+    assert index.complete("intro t", 10) == [
+        ("intro to python", "1", "Intro to  Python")
+    ]
+    assert index.complete("sql", 10) == []
+    assert index.complete(" ", 10) == []
+
+
+def test_complete_limit():
+    index = make_index()
+
+    assert [id_ for _, id_, _ in index.complete("i", 1)] == ["1"]
+
+
+def test_add_replaces_title_and_remove_drops_it():
+    index = make_index()
+
+    index.add("1", "Python for everyone")
+    index.add("4", "Intro to Go")
+    index.remove("2")
+
+    assert [id_ for _, id_, _ in index.complete("intro", 10)] == ["4"]
+    assert [id_ for _, id_, _ in index.complete("python", 10)] == ["1"]
+    assert len(index) == 3
+
+    index.remove("missing")
+    assert len(index) == 3
+
+
+def test_clear():
+    index = make_index()
+
+    index.clear()
+
+    assert len(index) == 0
+    assert index.built_at is None
+
+
+def test_rebuild_replays_changes_made_while_reading_rows():
+    index = make_index()
+
+    generation = index.start_rebuild()
+    # rows read before these changes were committed
+    rows = [("1", "Intro to  Python"), ("2", "Introduction to SQL")]
+    index.add("4", "Intro to Go")
+    index.remove("1")
+    index.rebuild(rows, generation)
+
+    assert [id_ for _, id_, _ in index.complete("intro", 10)] == ["4", "2"]
+
+    # nothing is recorded once the rebuild is done
+    index.add("5", "Intro to Rust")
+    index.rebuild([("2", "Introduction to SQL")], index.start_rebuild())
+    assert len(index) == 1
+
+
+def test_overtaken_rebuild_is_dropped():
+    index = make_index()
+
+    first = index.start_rebuild()
+    second = index.start_rebuild()
+    index.rebuild([("5", "Intro to Rust")], second)
+    index.rebuild([("6", "Intro to Haskell")], first)
+
+    assert [id_ for _, id_, _ in index.complete("intro", 10)] == ["5"]
@@ -0,0 +1,54 @@
+import time
+
+from core.cache import MISSING, TTLCache
+
+
+def test_get_missing_key():
+    cache = TTLCache("test", maxsize=2, ttl=60)
+
+    assert cache.get("missing") is None
+    assert cache.get("missing", MISSING) is MISSING
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl():
+    cache = TTLCache("test", maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_expires_at_explicit_timestamp():
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1, expires_at=time.time() - 1)
+    cache.set("b", 2, expires_at=time.time() + 60)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_delete_and_hit_ratio():
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.delete("a")
+
+    assert cache.get("a") is None
+    assert cache.stats()["hit_ratio"] == 0.5
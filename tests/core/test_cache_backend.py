@@ -0,0 +1,136 @@
+import pytest
+from starlette.requests import Request
+
+from core.cache_backend import MemoryCacheBackend, RedisCacheBackend
+from schemas.module_schemas import ModuleResponse
+from utils.response_cache import ResponseCache
+
+MODULE_ID = "0b0a4a53-6a44-4d6c-8a04-b1a8a8e0c2a1"
+
+
+def make_request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+class FakeRedis:
+    """The subset of the ``redis.asyncio`` client used by RedisCacheBackend."""
+
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.expiry[key] = ex
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryCacheBackend(maxsize=10)
+    return RedisCacheBackend(FakeRedis())
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_backend_set_get_delete(backend):
+    await backend.set("modules:1", b"{}", ttl=60)
+
+    assert await backend.get("modules:1") == b"{}"
+
+    await backend.delete("modules:1", "modules:2")
+
+    assert await backend.get("modules:1") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_redis_backend_prefixes_keys_and_sets_ttl():
+    client = FakeRedis()
+    backend = RedisCacheBackend(client, prefix="test:")
+
+    await backend.set("modules:1", b"{}", ttl=30)
+
+    assert client.store == {"test:modules:1": b"{}"}
+    assert client.expiry == {"test:modules:1": 30}
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_read_through_loads_once(backend):
+    cache = ResponseCache(backend, ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(MODULE_ID)
+        return {"id": MODULE_ID, "title": "Intro", "description": None}
+
+    request = make_request()
+    first = await cache.read_through(
+        request, "modules", MODULE_ID, ModuleResponse, load
+    )
+    second = await cache.read_through(
+        request, "modules", MODULE_ID, ModuleResponse, load
+    )
+
+    assert first.body == second.body
+    assert first.headers["etag"] == second.headers["etag"]
+    assert ModuleResponse.model_validate_json(second.body).title == "Intro"
+    assert len(loads) == 1
+    assert cache.stats()["hits"] == 1
+
+    await cache.invalidate("modules", MODULE_ID)
+    await cache.read_through(request, "modules", MODULE_ID, ModuleResponse, load)
+
+    assert len(loads) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_read_through_does_not_cache_missing(backend):
+    cache = ResponseCache(backend, ttl=60)
+
+    async def load():
+        return None
+
+    response = await cache.read_through(
+        make_request(), "modules", MODULE_ID, ModuleResponse, load
+    )
+
+    assert response is None
+    assert await backend.get(f"modules:{MODULE_ID}") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_read_through_hit_honors_if_none_match(backend):
+    cache = ResponseCache(backend, ttl=60)
+
+    async def load():
+        return {"id": MODULE_ID, "title": "Intro", "description": None}
+
+    first = await cache.read_through(
+        make_request(), "modules", MODULE_ID, ModuleResponse, load
+    )
+    second = await cache.read_through(
+        make_request(**{"if-none-match": first.headers["etag"]}),
+        "modules",
+        MODULE_ID,
+        ModuleResponse,
+        load,
+    )
+
+    assert second.status_code == 304
+    assert second.body == b""
@@ -0,0 +1,86 @@
+from sqlalchemy import create_engine, text
+
+from core.instrumentation import (
+    RequestTimings,
+    RouteStats,
+    current_timings,
+    install_query_hooks,
+    record_serialization,
+)
+
+
+def test_query_hooks_count_statements_of_current_request():
+    engine = create_engine("sqlite://")
+    install_query_hooks(engine)
+    install_query_hooks(engine)
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        current_timings.reset(token)
+
+    assert timings.queries == 2
+    assert timings.db > 0
+
+
+def test_query_hooks_ignore_statements_outside_requests():
+    engine = create_engine("sqlite://")
+    install_query_hooks(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert current_timings.get() is None
+
+
+def test_record_serialization():
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+
+    record_serialization(0.25)
+    record_serialization(0.5)
+    current_timings.reset(token)
+    record_serialization(1.0)
+
+    assert timings.serialization == 0.75
+
+
+def test_server_timing_header():
+    timings = RequestTimings()
+    timings.db, timings.queries, timings.serialization = 0.002, 3, 0.0005
+
+    assert timings.server_timing(0.01) == (
+        'app;dur=10.00, db;dur=2.00;desc="3 queries", ser;dur=0.50'
+    )
+
+
+def test_route_stats_percentiles():
+    stats = RouteStats(samples=100)
+    timings = RequestTimings()
+
+    for wall in range(1, 101):
+        timings.queries = wall % 3
+        stats.record("GET /courses", wall / 1000, timings)
+
+    (entry,) = stats.stats()
+    assert entry["route"] == "GET /courses"
+    assert entry["count"] == entry["samples"] == 100
+    assert entry["wall_ms"] == {"p50": 50.0, "p95": 95.0, "p99": 99.0, "max": 100.0}
+    assert entry["queries"]["max"] == 2
+
+
+def test_route_stats_keeps_last_samples():
+    stats = RouteStats(samples=10)
+    timings = RequestTimings()
+
+    for wall in range(1, 101):
+        stats.record("GET /courses", wall / 1000, timings)
+
+    (entry,) = stats.stats()
+    assert entry["count"] == 100
+    assert entry["samples"] == 10
+    assert entry["wall_ms"]["p50"] == 95.0
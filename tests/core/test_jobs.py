@@ -0,0 +1,123 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from core.jobs import JobQueue, MemoryJobStore, SQLiteJobStore
+
+
+@asynccontextmanager
+async def no_session():
+    yield None
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+async def wait_for_job(queue, job_id):
+    for _ in range(100):
+        job = await queue.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_job_runs_every_batch(store):
+    seen = []
+
+    async def handler(db, rows):
+        seen.append([row["n"] for row in rows])
+        return len(rows)
+
+    queue = JobQueue(store, no_session, workers=2, poll_interval=0.01)
+    queue.register("numbers", handler)
+
+    job_id = await queue.submit("numbers", [{"n": n} for n in range(5)], batch_size=2)
+    job = await wait_for_job(queue, job_id)
+    await queue.stop()
+
+    assert job["status"] == "completed"
+    assert job["rows_done"] == 5
+    assert job["batches_done"] == job["batches_total"] == 3
+    assert sorted(seen) == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_failed_batch_is_reported(store):
+    async def handler(db, rows):
+        if rows[0]["n"] == 2:
+            raise ValueError("bad row")
+        return len(rows)
+
+    queue = JobQueue(store, no_session, workers=1, poll_interval=0.01)
+    queue.register("numbers", handler)
+
+    job_id = await queue.submit("numbers", [{"n": n} for n in range(4)], batch_size=2)
+    job = await wait_for_job(queue, job_id)
+    await queue.stop()
+
+    assert job["status"] == "failed"
+    assert job["rows_done"] == 2
+    assert job["errors"] == ["batch 1: bad row"]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_unknown_job_kind(store):
+    queue = JobQueue(store, no_session, workers=1)
+
+    with pytest.raises(KeyError):
+        await queue.submit("numbers", [], batch_size=2)
+
+    assert await queue.get("missing") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_batch_of_dead_worker_is_claimed_again(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    started = asyncio.Event()
+
+    async def stuck(db, rows):
+        started.set()
+        await asyncio.Event().wait()
+
+    async def handler(db, rows):
+        return len(rows)
+
+    queue = JobQueue(SQLiteJobStore(path, lease=0.05), no_session, workers=1)
+    queue.register("numbers", stuck)
+    job_id = await queue.submit("numbers", [{"n": n} for n in range(3)], batch_size=3)
+    await started.wait()
+    # the worker dies mid-batch, without finishing or renewing its claim
+    await queue.stop()
+
+    restarted = JobQueue(
+        SQLiteJobStore(path, lease=0.05), no_session, workers=1, poll_interval=0.01
+    )
+    restarted.register("numbers", handler)
+    await restarted.start()
+    job = await wait_for_job(restarted, job_id)
+    await restarted.stop()
+
+    assert job["status"] == "completed"
+    assert job["rows_done"] == 3
+    assert job["batches_done"] == job["batches_total"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_pinned_job_is_claimed_by_its_owner_only(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = await store.create("numbers", [[{"n": 0}]], owner="accepting")
+
+    assert await store.claim("other") is None
+    assert await store.claim("accepting") == (job_id, "numbers", 0, [{"n": 0}])
@@ -0,0 +1,73 @@
+import os
+
+from core.metrics import LIVEALL, Exporter, MultiProcessStore, Registry, merge, render
+
+
+def test_render_counter_and_gauge():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight")
+    requests.inc(labels=('GET /a"b',))
+    requests.inc(2, labels=('GET /a"b',))
+    in_flight.inc()
+    in_flight.dec()
+
+    text = render(registry.snapshot())
+
+    assert "# TYPE requests_total counter\n" in text
+    assert 'requests_total{route="GET /a\\"b"} 3.0\n' in text
+    assert "in_flight 0.0\n" in text
+
+
+def test_render_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    text = render(registry.snapshot())
+
+    assert 'latency_seconds_bucket{le="0.1"} 2.0\n' in text
+    assert 'latency_seconds_bucket{le="1.0"} 3.0\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4.0\n' in text
+    assert "latency_seconds_sum 3.65\n" in text
+    assert "latency_seconds_count 4.0\n" in text
+
+
+def test_collectors_run_before_snapshot():
+    registry = Registry()
+    size = registry.gauge("size", "Size")
+    registry.collector(lambda: size.set(42))
+
+    assert registry.snapshot()["size"]["values"] == [[[], 42]]
+
+
+def test_merge_sums_counters_of_exited_workers_and_only_live_gauges():
+    registry = Registry()
+    registry.counter("requests_total", "Requests").inc(2)
+    registry.gauge("in_flight", "In flight").inc(1)
+    registry.gauge("ratio", "Ratio", mode=LIVEALL).set(0.5)
+    snapshot = registry.snapshot()
+
+    merged = merge([(1, True, snapshot), (2, True, snapshot), (3, False, snapshot)])
+
+    assert merged["requests_total"]["values"] == [[[], 6]]
+    assert merged["in_flight"]["values"] == [[[], 2]]
+    assert merged["ratio"]["labelnames"] == ["pid"]
+    assert merged["ratio"]["values"] == [[["1"], 0.5], [["2"], 0.5]]
+
+
+def test_exporter_merges_other_workers_snapshots(tmp_path):
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests")
+    requests.inc(5)
+    # a snapshot left by another worker, that has since exited
+    other = MultiProcessStore(str(tmp_path))
+    other.write(registry.snapshot())
+    os.rename(tmp_path / f"metrics-{os.getpid()}.json", tmp_path / "metrics-0.json")
+
+    exporter = Exporter(registry, str(tmp_path))
+    requests.inc()
+    exporter.flush()
+
+    assert "requests_total 11.0\n" in exporter.expose()
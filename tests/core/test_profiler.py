@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+from core.profiler import SPEEDSCOPE_SCHEMA, ProfilerBusyError, SamplingProfiler
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_samples_other_threads_as_speedscope():
+    stop = threading.Event()
+    worker = threading.Thread(target=spin, args=(stop,), name="spinner")
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001)
+
+    profiler.start()
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    profile = profiler.speedscope("test")
+    frames = profile["shared"]["frames"]
+    (spinner,) = [p for p in profile["profiles"] if p["name"] == "spinner"]
+    assert profile["$schema"] == SPEEDSCOPE_SCHEMA
+    assert len(spinner["samples"]) == len(spinner["weights"])
+    assert spinner["endValue"] == pytest.approx(sum(spinner["weights"]))
+    assert any(frames[stack[-1]]["name"] == "spin" for stack in spinner["samples"])
+
+
+def test_one_profile_at_a_time():
+    first = SamplingProfiler(interval=0.001)
+    first.start()
+
+    try:
+        with pytest.raises(ProfilerBusyError):
+            SamplingProfiler(interval=0.001).start()
+    finally:
+        first.stop()
+
+    second = SamplingProfiler(interval=0.001)
+    second.start()
+    second.stop()
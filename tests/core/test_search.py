@@ -0,0 +1,50 @@
+from core.search import InvertedIndex, tokenize
+
+
+def make_index():
+    index = InvertedIndex({"title": 1.0, "overview": 0.4})
+    index.rebuild(
+        [
+            ("a", {"title": "Intro to Python", "overview": "Learn programming"}),
+            ("b", {"title": "Advanced SQL", "overview": "Python and SQL tuning"}),
+            ("c", {"title": "Cooking", "overview": "Pasta"}),
+        ]
+    )
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Intro to Python-3!") == ["intro", "to", "python", "3"]
+
+
+def test_title_match_ranks_above_overview_match():
+    index = make_index()
+
+    assert [doc_id for doc_id, _ in index.search("python", 10)] == ["a", "b"]
+
+
+def test_every_term_must_match():
+    index = make_index()
+
+    assert [doc_id for doc_id, _ in index.search("python sql", 10)] == ["b"]
+    assert index.search("python pasta", 10) == []
+    assert index.search("unknown", 10) == []
+    assert index.search("", 10) == []
+
+
+def test_limit():
+    index = make_index()
+
+    assert len(index.search("python", 1)) == 1
+
+
+def test_add_replaces_and_remove_drops_document():
+    index = make_index()
+
+    index.add("c", {"title": "Python for cooks", "overview": ""})
+    assert [doc_id for doc_id, _ in index.search("cooking", 10)] == []
+    assert "c" in [doc_id for doc_id, _ in index.search("python", 10)]
+
+    index.remove("a")
+    assert [doc_id for doc_id, _ in index.search("python", 10)] == ["c", "b"]
+    assert len(index) == 2
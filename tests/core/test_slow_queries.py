@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.instrumentation import RequestTimings, current_timings
+from core.slow_queries import SlowQueryLog, parameter_shape
+
+
+def test_parameter_shape():
+    assert parameter_shape({"id": "a", "limit": 10, "ids": ["a"] * 100}) == {
+        "id": "str",
+        "limit": "int",
+        "ids": "list[100 x str]",
+    }
+    assert parameter_shape(("a", None, 1.5)) == ["str", "NoneType", "float"]
+
+
+def test_statements_under_threshold_are_not_logged():
+    log = SlowQueryLog(threshold_ms=60_000)
+    engine = create_engine("sqlite://")
+    log.install(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT :value"), {"value": 1})
+
+    assert log.recent() == []
+
+
+def test_slow_statements_are_logged_to_file(tmp_path):
+    path = tmp_path / "slow.log"
+    log = SlowQueryLog(threshold_ms=0.000001, path=str(path))
+    engine = create_engine("sqlite://")
+    log.install(engine)
+    scope = {"method": "GET", "route": type("Route", (), {"path": "/courses"})}
+    token = current_timings.set(RequestTimings(scope))
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :value"), {"value": 1})
+            connection.execute(text("SELECT 2"))
+    finally:
+        current_timings.reset(token)
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [entry["statement"] for entry in log.recent()] == ["SELECT 2", "SELECT ?"]
+    assert entries[0]["parameters"] == ["int"]
+    assert entries[0]["route"] == "GET /courses"
+    assert entries[0]["explain"] is None
+
+
+def test_calling_function_is_found_across_greenlets(mocker):
+    mocker.patch("core.slow_queries.CALLER_PREFIX", __name__)
+    log = SlowQueryLog(threshold_ms=0.000001)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    log.install(engine.sync_engine)
+
+    async def read_value():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(read_value())
+
+    assert log.recent()[0]["function"] == f"{__name__}.read_value"
@@ -0,0 +1,55 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from crud.aio.courses_crud import db_create_course, stream_courses
+from crud.aio.courses_import import db_import_courses
+from models import CourseModel
+from tests.conf_test_db import TestingAsyncSessionLocal
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_db_create_course_commits_once(
+    mocker: MockerFixture, course_schema_fixture
+):
+    async with TestingAsyncSessionLocal() as db:
+        spy_commit = mocker.spy(db, "commit")
+
+        course = await db_create_course(db, course_schema_fixture)
+
+    spy_commit.assert_called_once()
+    assert isinstance(course, CourseModel)
+    assert course.module_id == course.module.id
+    assert course.subject_id == course.subject.id
+    assert course.title == course_schema_fixture.title
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_db_import_courses(course_schema_fixture):
+    courses = [course_schema_fixture for _ in range(50)]
+
+    async with TestingAsyncSessionLocal() as db:
+        created, report = await db_import_courses(db, courses)
+
+        stored = await db.get(CourseModel, created[0]["id"])
+
+    assert report.rows == 50
+    assert report.method == "copy"
+    assert report.rows_per_second > 0
+    assert len({course["id"] for course in created}) == 50
+    assert stored is not None
+    assert stored.module_id == created[0]["module"]["id"]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_stream_courses_in_batches(course_schema_fixture):
+    async with TestingAsyncSessionLocal() as db:
+        await db_import_courses(db, [course_schema_fixture for _ in range(25)])
+
+        batches = [batch async for batch in stream_courses(db, batch_size=10)]
+
+    assert all(len(batch) <= 10 for batch in batches)
+    assert sum(len(batch) for batch in batches) >= 25
+    assert batches[0][0].module is not None
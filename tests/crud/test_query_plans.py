@@ -0,0 +1,195 @@
+"""Fail when a crud read query is planned with a sequential scan.
+
+The tables are seeded to a realistic size and analyzed first: on a handful of
+rows PostgreSQL rightly prefers sequential scans, which would hide a missing
+index. They live in a schema of their own, dropped once the module is done, so
+that the other tests never see the seeded rows.
+"""
+
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from crud.aio import courses_crud, modules_crud, subjects_crud, users_crud
+from crud.aio.autocomplete import COURSE, SUBJECT, unindex
+from crud.aio.courses_import import db_import_courses
+from crud.aio.courses_search import search_courses
+from models import CourseModel, SubjectModel
+from models.session import Base
+from models.user_models import UserModel
+from schemas import CourseBase
+from tests.conf_test_db import ASYNC_SQLALCHEMY_DATABASE_URL, SQLALCHEMY_DATABASE_URL
+from utils.pagination import next_cursor
+
+ROWS = 20_000
+SCHEMA = "query_plans"
+
+
+@pytest.fixture(scope="module")
+def plans_engine():
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+
+    yield async_engine
+
+    # the import also indexed the seeded titles for autocomplete
+    with engine.begin() as conn:
+        unindex(COURSE, conn.scalars(select(CourseModel.id)))
+        unindex(SUBJECT, conn.scalars(select(SubjectModel.id)))
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+async def _seed(db):
+    courses = await db.scalar(select(func.count()).select_from(CourseModel))
+    if courses < ROWS:
+        start = datetime(2020, 1, 1)
+        await db_import_courses(
+            db,
+            [
+                CourseBase(
+                    module={"title": f"module {n}", "description": "description"},
+                    subject={"title": f"subject {n}", "slug": f"subject-{n}"},
+                    owner=f"owner-{n % 500}",
+                    title=f"course {n}",
+                    slug=f"course-{n}",
+                    overview="overview",
+                    created=start + timedelta(minutes=n),
+                )
+                for n in range(ROWS - courses)
+            ],
+        )
+
+    users = await db.scalar(select(func.count()).select_from(UserModel))
+    if users < ROWS:
+        await db.execute(
+            insert(UserModel),
+            [
+                {
+                    "id": str(uuid4()),
+                    "first_name": "first",
+                    "last_name": "last",
+                    "email": f"{uuid4().hex}@example.com",
+                    "password": "not-a-hash",
+                    "job_title": "job",
+                    "is_super_user": False,
+                }
+                for _ in range(ROWS - users)
+            ],
+        )
+        await db.commit()
+
+    for table in ("course", "module", "subject", '"user"'):
+        await db.execute(text(f"ANALYZE {table}"))
+
+
+def _seq_scans(plan):
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+# every read query in crud.aio, called with ids sampled from the seeded rows
+QUERIES = {
+    "get_all_courses": lambda db, s: courses_crud.get_all_courses(db, 10),
+    "get_all_courses_next_page": lambda db, s: courses_crud.get_all_courses(
+        db, 10, cursor=s["cursor"]
+    ),
+    "get_course_by_id": lambda db, s: courses_crud.get_course_by_id(db, s["course_id"]),
+    "search_courses": lambda db, s: search_courses(db, s["title"], 10),
+    "get_courses_by_ids": lambda db, s: courses_crud.get_courses_by_ids(
+        db, [s["course_id"], "missing"]
+    ),
+    "get_course_ids_by_module": lambda db, s: courses_crud.get_course_ids(
+        db, module_id=s["module_id"]
+    ),
+    "get_course_ids_by_subject": lambda db, s: courses_crud.get_course_ids(
+        db, subject_id=s["subject_id"]
+    ),
+    "db_read_all_modules": lambda db, s: modules_crud.db_read_all_modules(db, 10),
+    "db_read_module_by_id": lambda db, s: modules_crud.db_read_module_by_id(
+        db, s["module_id"]
+    ),
+    "db_read_modules_by_ids": lambda db, s: modules_crud.db_read_modules_by_ids(
+        db, [s["module_id"]]
+    ),
+    "db_read_all_subjects": lambda db, s: subjects_crud.db_read_all_subjects(db, 10),
+    "db_read_subject_by_id": lambda db, s: subjects_crud.db_read_subject_by_id(
+        db, s["subject_id"]
+    ),
+    "db_read_subjects_by_ids": lambda db, s: subjects_crud.db_read_subjects_by_ids(
+        db, [s["subject_id"]]
+    ),
+    "get_all_users": lambda db, s: users_crud.get_all_users(db, 10),
+    "get_user_by_id": lambda db, s: users_crud.get_user_by_id(db, s["user_id"]),
+    "get_user_by_email": lambda db, s: users_crud.get_user_by_email(db, s["email"]),
+}
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+@pytest.mark.parametrize("query", QUERIES)
+async def test_crud_query_uses_indexes(query, plans_engine):
+    sessionmaker = async_sessionmaker(
+        bind=plans_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async with sessionmaker() as db:
+        await _seed(db)
+
+        course = (await db.scalars(select(CourseModel).limit(1))).one()
+        user = (await db.scalars(select(UserModel).limit(1))).one()
+        first_page = await courses_crud.get_all_courses(db, 10)
+        sample = {
+            "course_id": course.id,
+            "title": course.title,
+            "module_id": course.module_id,
+            "subject_id": course.subject_id,
+            "cursor": next_cursor(first_page, 10, courses_crud.COURSE_PAGE_KEY),
+            "user_id": user.id,
+            "email": user.email,
+        }
+
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, *args):
+            statements.append((statement, parameters))
+
+        event.listen(
+            plans_engine.sync_engine, "before_cursor_execute", record_statement
+        )
+        try:
+            await QUERIES[query](db, sample)
+        finally:
+            event.remove(
+                plans_engine.sync_engine, "before_cursor_execute", record_statement
+            )
+
+        assert statements
+
+        for statement, parameters in statements:
+            connection = await db.connection()
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+
+            assert list(_seq_scans(plan[0]["Plan"])) == [], statement
@@ -0,0 +1,132 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from auth.authenticate import create_access_token
+from core.settings import Settings
+
+
+class TestSyncAdminRoutes:
+    @pytest.mark.usefixtures("authenticated_user")
+    def test_get_pool_stats(self, test_client):
+        test_client.get("/courses")
+
+        res = test_client.get("/admin/pool")
+
+        assert res.status_code == 200
+        assert [stats["engine"] for stats in res.json()] == ["sync", "async"]
+        # the async test engine does not pool, so every checkout connects
+        assert res.json()[1]["checkouts"] >= 1
+        assert res.json()[1]["connects"] >= 1
+        assert res.json()[1]["max_hold_ms"] > 0
+
+    @pytest.mark.usefixtures("authenticated_user")
+    def test_get_hashing_stats(self, test_client):
+        res = test_client.get("/admin/hashing")
+
+        assert res.status_code == 200
+        assert res.json()["workers"] >= 1
+        assert res.json()["completed"] >= 1
+        assert res.json()["queue_depth"] >= 0
+
+    @pytest.mark.usefixtures("authenticated_user")
+    def test_get_request_stats(self, test_client):
+        courses = test_client.get("/courses")
+
+        res = test_client.get("/admin/requests")
+
+        stats = {entry["route"]: entry for entry in res.json()}
+        assert res.status_code == 200
+        assert courses.headers["Server-Timing"].startswith("app;dur=")
+        assert stats["GET /courses"]["count"] >= 1
+        assert stats["GET /courses"]["queries"]["max"] >= 1
+
+    @pytest.mark.usefixtures("authenticated_user")
+    def test_get_profile(self, test_client):
+        res = test_client.get("/admin/profile", params={"seconds": 0.05})
+
+        assert res.status_code == 200
+        assert res.json()["shared"]["frames"]
+        assert {"MainThread"} <= {profile["name"] for profile in res.json()["profiles"]}
+
+    def test_get_cache_stats(
+        self, test_client, create_super_user_instance, mocker: MockerFixture
+    ):
+        user_ = create_super_user_instance
+        mock_get_user_by_email = mocker.patch(
+            "utils.dependencies.get_user_by_email", return_value=user_
+        )
+
+        token_ = create_access_token(data={"user": user_.email})
+        headers = {"Authorization": f"Bearer {token_}"}
+
+        test_client.get("/admin/cache", headers=headers)
+        res = test_client.get("/admin/cache", headers=headers)
+
+        stats = {cache["name"]: cache for cache in res.json()}
+        assert res.status_code == 200
+        assert stats["tokens"]["hits"] >= 1
+        assert stats["principals"]["hits"] >= 1
+        mock_get_user_by_email.assert_called_once()
+
+    def test_get_pool_stats_not_super_user(
+        self, test_client, create_user_instance, mocker: MockerFixture
+    ):
+        user_ = create_user_instance
+        mocker.patch("utils.dependencies.get_user_by_email", return_value=user_)
+
+        token_ = create_access_token(data={"user": user_.email})
+
+        res = test_client.get(
+            "/admin/pool", headers={"Authorization": f"Bearer {token_}"}
+        )
+
+        assert res.status_code == 403
+
+    def test_role_claim_skips_user_lookup(
+        self, test_client, create_super_user_instance, mocker: MockerFixture
+    ):
+        user_ = create_super_user_instance
+        mock_get_user_by_email = mocker.patch("utils.dependencies.get_user_by_email")
+
+        token_ = create_access_token(data={"user": user_.email}, is_super_user=True)
+
+        res = test_client.get(
+            "/admin/pool", headers={"Authorization": f"Bearer {token_}"}
+        )
+
+        assert res.status_code == 200
+        mock_get_user_by_email.assert_not_called()
+
+    def test_role_claim_not_super_user(
+        self, test_client, create_user_instance, mocker: MockerFixture
+    ):
+        user_ = create_user_instance
+        mock_get_user_by_email = mocker.patch("utils.dependencies.get_user_by_email")
+
+        token_ = create_access_token(data={"user": user_.email}, is_super_user=False)
+
+        res = test_client.get(
+            "/admin/pool", headers={"Authorization": f"Bearer {token_}"}
+        )
+
+        assert res.status_code == 403
+        mock_get_user_by_email.assert_not_called()
+
+    def test_stale_role_claim_checks_user(
+        self, test_client, create_user_instance, mocker: MockerFixture
+    ):
+        user_ = create_user_instance
+        mock_get_user_by_email = mocker.patch(
+            "utils.dependencies.get_user_by_email", return_value=user_
+        )
+
+        # a super user claim issued before the role of this user was revoked
+        token_ = create_access_token(data={"user": user_.email}, is_super_user=True)
+        mocker.patch.object(Settings, "TOKEN_VERSION", Settings.TOKEN_VERSION + 1)
+
+        res = test_client.get(
+            "/admin/pool", headers={"Authorization": f"Bearer {token_}"}
+        )
+
+        assert res.status_code == 403
+        mock_get_user_by_email.assert_called_once()
@@ -0,0 +1,56 @@
+import pytest
+from httpx import AsyncClient
+
+from crud.aio.courses_crud import delete_course_by_id
+from tests.conf_test_db import TestingAsyncSessionLocal, app
+
+
+@pytest.mark.usefixtures("anyio_backend")
+class TestAsyncAutocompleteRoutes:
+    pytestmark = pytest.mark.anyio
+
+    async def test_get_suggestions(self, create_course_fixture):
+        course_fixture = create_course_fixture
+
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            res = await ac.get(
+                "/autocomplete", params={"q": course_fixture.title, "limit": 50}
+            )
+
+        assert res.status_code == 200
+        assert {"kind": "course", "id": course_fixture.id} in [
+            {"kind": s["kind"], "id": s["id"]} for s in res.json()
+        ]
+
+    async def test_get_suggestions_by_kind(self, create_course_fixture):
+        subject = create_course_fixture.subject
+
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            res = await ac.get(
+                "/autocomplete",
+                params={"q": subject.title, "kind": "subject", "limit": 50},
+            )
+
+        assert res.status_code == 200
+        assert {s["kind"] for s in res.json()} == {"subject"}
+        assert subject.id in [s["id"] for s in res.json()]
+
+    async def test_deleted_course_is_not_suggested(self, create_course_fixture):
+        course_fixture = create_course_fixture
+
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            # builds the index from the table
+            await ac.get("/autocomplete", params={"q": course_fixture.title})
+
+            async with TestingAsyncSessionLocal() as db:
+                await delete_course_by_id(db, course_fixture.id)
+
+            res = await ac.get("/autocomplete", params={"q": course_fixture.title})
+
+        assert course_fixture.id not in [s["id"] for s in res.json()]
+
+    async def test_get_suggestions_requires_prefix(self):
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            res = await ac.get("/autocomplete", params={"q": ""})
+
+        assert res.status_code == 422
@@ -1,9 +1,17 @@
+import asyncio
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
+from sqlalchemy import event
 
 from auth.authenticate import create_access_token
-from tests.conf_test_db import app
+from core.settings import Settings
+from routers import courses_routes
+from tests.conf_test_db import app, async_engine
 
 
 @pytest.mark.usefixtures("anyio_backend")
@@ -19,6 +27,80 @@ class TestAsyncCourseRoutes:
         assert response.json()[0]["id"] is not None
         assert response.json()[0]["owner"] == course_.owner
 
+    @pytest.mark.parametrize("strategy, queries", [("joined", 1), ("selectin", 3)])
+    async def test_get_courses_query_count(
+        self, mocker: MockerFixture, create_course_fixture, strategy, queries
+    ):
+        mocker.patch.object(Settings, "COURSE_LOAD_STRATEGY", strategy)
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            # first request absorbs any one-off dialect initialization queries
+            await ac.get("/courses")
+
+            event.listen(
+                async_engine.sync_engine, "before_cursor_execute", record_statement
+            )
+            try:
+                response = await ac.get("/courses", params={"limit": 100})
+            finally:
+                event.remove(
+                    async_engine.sync_engine, "before_cursor_execute", record_statement
+                )
+
+        assert response.status_code == 200
+        # the page holds courses with their module and subject, whatever the strategy
+        page = response.json()
+        assert create_course_fixture.id in [course["id"] for course in page]
+        assert all(course["module"] and course["subject"] for course in page)
+        assert len(statements) == queries
+
+    async def test_get_courses_next_page(self, create_course_fixture):
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            first = await ac.get("/courses", params={"limit": 1})
+            second = await ac.get(
+                "/courses",
+                params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]},
+            )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert len(first.json()) == 1
+        assert first.json()[0]["id"] not in [c["id"] for c in second.json()]
+
+    async def test_get_courses_fields(self, create_course_fixture):
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            event.listen(
+                async_engine.sync_engine, "before_cursor_execute", record_statement
+            )
+            try:
+                res = await ac.get("/courses", params={"fields": "id,title,subject"})
+            finally:
+                event.remove(
+                    async_engine.sync_engine, "before_cursor_execute", record_statement
+                )
+            invalid = await ac.get("/courses", params={"fields": "id,unknown"})
+
+        assert res.status_code == 200
+        assert set(res.json()[0]) == {"id", "title", "subject"}
+        assert "X-Next-Cursor" in res.headers
+        assert "course.overview" not in " ".join(statements)
+        assert invalid.status_code == 400
+
+    async def test_get_courses_invalid_cursor(self):
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            response = await ac.get("/courses", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
     async def test_get_course(self, create_course_fixture):
         course_fixture = create_course_fixture
 
@@ -27,6 +109,142 @@ class TestAsyncCourseRoutes:
         assert res.status_code == 200
         assert res.json()["id"] == course_fixture.id
 
+    async def test_get_course_is_cached_until_updated(
+        self, mocker: MockerFixture, create_course_fixture, authenticated_user
+    ):
+        course_fixture = create_course_fixture
+        spy_get_course = mocker.spy(courses_routes, "get_course_by_id")
+
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            first = await ac.get(f"/{course_fixture.id}")
+            second = await ac.get(f"/{course_fixture.id}")
+            await ac.put(f"/{course_fixture.id}", json={"title": "updated title"})
+            third = await ac.get(f"/{course_fixture.id}")
+
+        assert first.content == second.content
+        assert third.json()["title"] == "updated title"
+        assert spy_get_course.call_count == 2
+
+    async def test_batch_get_courses(self, create_course_fixture):
+        course_fixture = create_course_fixture
+        ids = ["missing-id", course_fixture.id, "missing-id"]
+
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            res = await ac.post("/batch_get", json={"ids": ids})
+            empty = await ac.post("/batch_get", json={"ids": []})
+
+        assert res.status_code == 200
+        assert [course["id"] for course in res.json()["items"]] == [course_fixture.id]
+        assert res.json()["items"][0]["module"]["id"] == course_fixture.module_id
+        assert res.json()["missing"] == ["missing-id"]
+        assert empty.status_code == 422
+
+    async def test_get_course_not_modified(self, create_course_fixture):
+        course_fixture = create_course_fixture
+
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            first = await ac.get(f"/{course_fixture.id}")
+            by_etag = await ac.get(
+                f"/{course_fixture.id}",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+            by_date = await ac.get(
+                f"/{course_fixture.id}",
+                headers={"If-Modified-Since": first.headers["Last-Modified"]},
+            )
+
+        assert first.status_code == 200
+        assert by_etag.status_code == 304
+        assert by_etag.content == b""
+        assert by_date.status_code == 304
+
+    async def test_get_courses_not_modified(self, create_course_fixture):
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            first = await ac.get("/courses")
+            second = await ac.get(
+                "/courses", headers={"If-None-Match": first.headers["ETag"]}
+            )
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    async def test_search_courses(self, create_course_fixture):
+        course_fixture = create_course_fixture
+
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            found = await ac.get("/search", params={"q": course_fixture.title})
+            missing = await ac.get("/search", params={"q": "zzyzx-not-a-word"})
+            empty = await ac.get("/search", params={"q": ""})
+
+        assert found.status_code == 200
+        assert course_fixture.id in [course["id"] for course in found.json()]
+        assert found.json()[0]["module"]["id"] is not None
+        assert missing.json() == []
+        assert empty.status_code == 422
+
+    async def test_export_courses_ndjson(self, create_course_fixture):
+        course_fixture = create_course_fixture
+
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            res = await ac.get("/export")
+
+        exported = [json.loads(line) for line in res.text.splitlines()]
+
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/x-ndjson"
+        assert course_fixture.id in [course["id"] for course in exported]
+        assert exported[0]["module"]["id"] is not None
+
+    async def test_export_courses_csv(self, create_course_fixture):
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            res = await ac.get("/export", params={"format": "csv"})
+
+        rows = list(csv.DictReader(io.StringIO(res.text)))
+
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/csv")
+        assert create_course_fixture.id in [row["id"] for row in rows]
+        assert rows[0]["subject_slug"]
+
+    async def test_create_courses_stream(
+        self, mocker: MockerFixture, authenticated_user, course_schema_fixture
+    ):
+        mocker.patch.object(Settings, "INGEST_CHUNK_SIZE", 2)
+        body = "\n".join(course_schema_fixture.model_dump_json() for _ in range(5))
+
+        async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
+            res = await ac.post(
+                "/course_many/stream",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert res.status_code == 201
+        assert res.json()["rows"] == 5
+        assert [chunk["rows"] for chunk in res.json()["chunks"]] == [2, 2, 1]
+
+    async def test_create_courses_async_job(
+        self, authenticated_user, course_schema_fixture
+    ):
+        payload = [course_schema_fixture.model_dump(mode="json") for _ in range(3)]
+
+        async with AsyncClient(app=app, base_url="http://localhost") as ac:
+            res = await ac.post(
+                "/courses/course_many", params={"async": "true"}, json=payload
+            )
+
+            for _ in range(50):
+                job = (await ac.get(res.headers["Location"])).json()
+                if job["status"] in ("completed", "failed"):
+                    break
+                await asyncio.sleep(0.1)
+
+        assert res.status_code == 202
+        assert job["status"] == "completed"
+        assert job["rows_done"] == 3
+        assert job["errors"] == []
+
     async def test_create_course_with_no_token(self, course_schema_fixture):
         async with AsyncClient(app=app, base_url="http://localhost/courses") as ac:
             res = await ac.post("/course", json=course_schema_fixture.json())
@@ -0,0 +1,14 @@
+class TestSyncMetricsRoutes:
+    def test_get_metrics(self, test_client):
+        series = 'http_requests_total{method="GET",route="GET /courses",status="200"}'
+        test_client.get("/courses")
+
+        res = test_client.get("/metrics")
+
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert series in res.text
+        assert "# TYPE http_request_duration_seconds histogram" in res.text
+        assert 'db_pool_checkouts_total{engine="async"}' in res.text
+        assert "hashing_queue_depth" in res.text
+        assert 'cache_hit_ratio{cache="responses"}' in res.text
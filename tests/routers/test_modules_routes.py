@@ -4,7 +4,7 @@ from uuid import uuid4
 import pytest
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.authenticate import create_access_token
 from schemas import ModuleBase, UpdateModuleBase
@@ -24,7 +24,9 @@ class TestSyncModulesRoutes:
 
         assert res.status_code == 200
         assert len(res.json()) == 4
-        mock_db_read_all_modules.assert_called_once_with(mocker.ANY, 10)
+        mock_db_read_all_modules.assert_called_once_with(
+            mocker.ANY, 10, cursor=None, fields=None
+        )
 
     def test_get_module_by_id(
         self, mocker: MockerFixture, test_client, create_module_fixture
@@ -41,6 +43,27 @@ class TestSyncModulesRoutes:
             db=mocker.ANY, module_id=module_.id
         )
 
+    def test_batch_get_modules(
+        self, mocker: MockerFixture, test_client, create_module_fixture
+    ):
+        module_ = create_module_fixture
+        missing = str(uuid4())
+        mock_db_read_modules_by_ids = mocker.patch(
+            "routers.modules_routes.db_read_modules_by_ids",
+            return_value=([module_], [missing]),
+        )
+
+        res = test_client.post(
+            "/modules/batch_get", json={"ids": [module_.id, missing]}
+        )
+
+        assert res.status_code == 200
+        assert [module["id"] for module in res.json()["items"]] == [module_.id]
+        assert res.json()["missing"] == [missing]
+        mock_db_read_modules_by_ids.assert_called_once_with(
+            mocker.ANY, [module_.id, missing]
+        )
+
 
 @pytest.mark.usefixtures("anyio_backend")
 class TestAsyncModulesRoutes:
@@ -82,7 +105,7 @@ class TestAsyncModulesRoutes:
         db_call_args: tuple = mock_db_create_module.call_args.args
 
         assert res.status_code == 201
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], ModuleBase)
         mock_db_create_module.assert_called_once()
         mock_get_user_by_email.assert_called_once()
@@ -113,7 +136,7 @@ class TestAsyncModulesRoutes:
         db_call_args: tuple = mock_update_module.call_args.args
 
         assert res.status_code == 202
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], str)
         assert isinstance(db_call_args[2], UpdateModuleBase)
 
@@ -128,8 +151,8 @@ class TestAsyncModulesRoutes:
         user_ = create_super_user_instance
         token_ = create_access_token(data={"user": user_.email})
 
-        mock_get_module_by_id = mocker.patch(
-            "routers.modules_routes.get_module_by_id", return_value=module_
+        mock_read_module_by_id = mocker.patch(
+            "routers.modules_routes.db_read_module_by_id", return_value=module_
         )
         mock_delete_module = mocker.patch(
             "routers.modules_routes.delete_module_by_id", return_value=None
@@ -144,7 +167,7 @@ class TestAsyncModulesRoutes:
         db_call_args: tuple = mock_delete_module.call_args.args
 
         assert res.status_code == 204
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], str)
-        mock_get_module_by_id.assert_called_once()
+        mock_read_module_by_id.assert_called_once()
         mock_delete_module.assert_called_once()
@@ -4,7 +4,7 @@ from uuid import uuid4
 import pytest
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.authenticate import create_access_token
 from schemas import SubjectBase, UpdateSubjectBase
@@ -25,7 +25,7 @@ class TestSyncSubjectRoutes:
         db_call_args = mock_db_read_all_subjects.call_args.args
 
         assert response.status_code == 200
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], int)
         mock_db_read_all_subjects.assert_called_once()
 
@@ -42,7 +42,7 @@ class TestSyncSubjectRoutes:
         db_call_args = mock_db_read_subject_by_id.call_args.args
 
         assert response.status_code == 200
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], str)
         mock_db_read_subject_by_id.assert_called_once()
 
@@ -88,7 +88,7 @@ class TestAsyncSubjectRoutes:
 
         print(response.json())
         assert response.status_code == 201
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], SubjectBase)
         mock_get_user_by_email.assert_called_once()
         mock_db_create_subject.assert_called_once()
@@ -119,7 +119,7 @@ class TestAsyncSubjectRoutes:
         db_call_args: tuple = mock_update_subject.call_args.args
 
         assert res.status_code == 202
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], str)
         assert isinstance(db_call_args[2], UpdateSubjectBase)
 
@@ -150,7 +150,7 @@ class TestAsyncSubjectRoutes:
         db_call_args: tuple = mock_delete_subject.call_args.args
 
         assert res.status_code == 204
-        assert isinstance(db_call_args[0], Session)
+        assert isinstance(db_call_args[0], AsyncSession)
         assert isinstance(db_call_args[1], str)
         mock_get_subject_by_id.assert_called_once()
         mock_delete_subject.assert_called_once()
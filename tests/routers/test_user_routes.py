@@ -161,6 +161,33 @@ class TestSyncUserRoutes:
         assert "access_token" in res.json()
         assert "token_type" in res.json()
 
+    def test_login_hashing_pool_full(
+        self, test_client, create_user_instance, mocker: MockerFixture
+    ):
+        from auth.hashing import HashingPoolFullError
+
+        user_ = create_user_instance
+
+        payload = {"username": user_.email, "password": "kPrzJ20IllmN"}
+
+        mocker.patch("routers.users_routes.get_user_by_email", return_value=user_)
+        mocker.patch(
+            "routers.users_routes.verify_password",
+            side_effect=HashingPoolFullError("256 password hashes are already queued"),
+        )
+
+        res = test_client.post(
+            "/user/login",
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "accept": "application/json",
+            },
+            data=payload,
+        )
+
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == "1"
+
     def test_get_users(self, test_client, create_user_instance, mocker: MockerFixture):
         users_ = [create_user_instance for _ in range(3)]
 
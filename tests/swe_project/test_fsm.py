@@ -110,7 +110,7 @@ class TestFSMTesting:
 
             spy_email.assert_called_once_with(db, email)
             spy_pwd.assert_called_once()
-            spy_token.assert_called_once_with({"user": email})
+            spy_token.assert_called_once_with({"user": email}, is_super_user=False)
             spy_encode.assert_called_once()
 
     def test_user_token_validity(self, test_client, seed_user):
@@ -208,7 +208,9 @@ class TestFSMTesting:
 
         spy_email.assert_called_once_with(db, data["username"])
         spy_pwd.assert_called_once_with(mock_req.password, user.password)
-        spy_token.assert_called_once_with({"user": data["username"]})
+        spy_token.assert_called_once_with(
+            {"user": data["username"]}, is_super_user=False
+        )
 
     def test_create_encode_payload_state_visited(self, mocker, seed_user):
         data = {"username": "bstoop2@mashable.com", "password": "rdpK37533T"}
@@ -233,5 +235,7 @@ class TestFSMTesting:
 
         spy_email.assert_called_once_with(db, data["username"])
         spy_pwd.assert_called_once_with(mock_req.password, user.password)
-        spy_token.assert_called_once_with({"user": data["username"]})
+        spy_token.assert_called_once_with(
+            {"user": data["username"]}, is_super_user=False
+        )
         spy_encode.assert_called_once()
@@ -0,0 +1,86 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from utils.conditional import conditional_response, http_date, make_etag, rows_etag
+
+BODY = b'[{"id": "1"}]'
+MODIFIED = datetime(2024, 1, 1, 12, 30, 15, 250000)
+
+
+def make_request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def test_response_carries_validators():
+    response = conditional_response(make_request(), BODY, last_modified=MODIFIED)
+
+    assert response.status_code == 200
+    assert response.body == BODY
+    assert response.headers["etag"] == make_etag(BODY)
+    assert response.headers["last-modified"] == "Mon, 01 Jan 2024 12:30:15 GMT"
+
+
+def status_of(request, last_modified=None):
+    return conditional_response(request, BODY, last_modified=last_modified).status_code
+
+
+def test_if_none_match():
+    etag = make_etag(BODY)
+
+    assert status_of(make_request(**{"if-none-match": f'"other", W/{etag}'})) == 304
+    assert status_of(make_request(**{"if-none-match": '"other"'})) == 200
+
+
+def test_if_modified_since():
+    not_modified = make_request(**{"if-modified-since": http_date(MODIFIED)})
+    modified = make_request(**{"if-modified-since": "Sun, 31 Dec 2023 00:00:00 GMT"})
+    invalid = make_request(**{"if-modified-since": "yesterday"})
+
+    assert status_of(not_modified, MODIFIED) == 304
+    assert status_of(modified, MODIFIED) == 200
+    assert status_of(invalid, MODIFIED) == 200
+
+
+def test_if_none_match_takes_precedence():
+    request = make_request(
+        **{"if-none-match": '"other"', "if-modified-since": http_date(MODIFIED)}
+    )
+
+    assert status_of(request, MODIFIED) == 200
+
+
+def test_body_is_only_produced_when_sent():
+    calls = []
+
+    def body():
+        calls.append(1)
+        return BODY
+
+    request = make_request(**{"if-none-match": '"page"'})
+    response = conditional_response(request, body, etag='"page"')
+
+    assert response.status_code == 304
+    assert calls == []
+
+    response = conditional_response(make_request(), body, etag='"page"')
+
+    assert response.body == BODY
+    assert calls == [1]
+
+
+def test_rows_etag():
+    rows = [SimpleNamespace(id="1", updated=MODIFIED)]
+    moved = [SimpleNamespace(id="1", updated=datetime(2024, 1, 2))]
+
+    assert rows_etag(rows, "id", "updated") == rows_etag(rows, "id", "updated")
+    assert rows_etag(rows, "id", "updated") != rows_etag(moved, "id", "updated")
+    assert rows_etag(rows, "id", "updated") != rows_etag(
+        rows, "id", "updated", variant="id"
+    )
@@ -0,0 +1,53 @@
+import pytest
+from fastapi import HTTPException
+from pytest_mock import MockerFixture
+
+from auth.cache import invalidate_user, principal_cache
+from models.user_models import UserModel
+from schemas.auth_schemas import TokenData
+from utils.dependencies import verify_super_user
+
+EMAIL = "admin@example.com"
+
+
+def lookups():
+    stats = principal_cache.stats()
+    return stats["hits"], stats["misses"]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_super_user_lookup_is_cached(mocker: MockerFixture):
+    mock_get_user_by_email = mocker.patch(
+        "utils.dependencies.get_user_by_email",
+        return_value=UserModel(email=EMAIL, is_super_user=True),
+    )
+    hits, misses = lookups()
+
+    for _ in range(3):
+        await verify_super_user(None, TokenData(email=EMAIL))
+
+    assert mock_get_user_by_email.call_count == 1
+    assert lookups() == (hits + 2, misses + 1)
+
+    invalidate_user(EMAIL)
+    await verify_super_user(None, TokenData(email=EMAIL))
+
+    assert mock_get_user_by_email.call_count == 2
+    assert lookups() == (hits + 2, misses + 2)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_regular_user_is_refused_from_cache(mocker: MockerFixture):
+    mock_get_user_by_email = mocker.patch(
+        "utils.dependencies.get_user_by_email",
+        return_value=UserModel(email=EMAIL, is_super_user=False),
+    )
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            await verify_super_user(None, TokenData(email=EMAIL))
+        assert error.value.status_code == 403
+
+    assert mock_get_user_by_email.call_count == 1
@@ -0,0 +1,41 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from models import CourseModel
+from schemas import SubjectResponse
+from utils.fields import list_adapter, load_columns, parse_fields
+
+
+def test_parse_fields():
+    assert parse_fields(None, SubjectResponse) is None
+    assert parse_fields(" id, title ,", SubjectResponse) == {"id", "title"}
+
+
+@pytest.mark.parametrize("value", ["", ",", "id,unknown"])
+def test_parse_fields_rejects_unknown_or_empty(value):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_fields(value, SubjectResponse)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_list_adapter_narrows_schema():
+    adapter = list_adapter(SubjectResponse, frozenset({"title"}))
+
+    rows = adapter.validate_python([{"title": "t", "slug": "s"}])
+
+    assert adapter.dump_python(rows) == [{"title": "t"}]
+    assert list_adapter(SubjectResponse, frozenset({"title"})) is adapter
+
+
+def test_load_columns_skips_relationships():
+    statement = select(CourseModel).options(
+        load_columns(CourseModel, {"title", "module"}, "id")
+    )
+
+    assert str(statement).split("FROM")[0].split() == [
+        "SELECT",
+        "course.id,",
+        "course.title",
+    ]
@@ -0,0 +1,108 @@
+import json
+from typing import Dict, List
+
+import pytest
+from fastapi import HTTPException, Request
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
+
+from core.exceptions import InvalidPayloadError
+from utils.ingest import (
+    JSONArrayParser,
+    ingest,
+    iter_chunks,
+    iter_json_array,
+    iter_ndjson,
+)
+
+ROWS = [
+    {"title": f"course {i}", "price": i * 1.5, "tags": ["a", "]"]} for i in range(5)
+]
+
+
+async def split(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+async def collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_iter_json_array_across_chunk_boundaries():
+    body = json.dumps(ROWS, indent=2).encode()
+
+    assert await collect(iter_json_array(split(body))) == ROWS
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_iter_json_array_splits_multibyte_characters():
+    rows = [{"title": "Ünïcødé ✓"}] * 3
+
+    assert await collect(iter_json_array(split(json.dumps(rows).encode(), 3))) == rows
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_iter_ndjson():
+    body = "\n".join(json.dumps(row) for row in ROWS).encode() + b"\n\n"
+
+    assert await collect(iter_ndjson(split(body))) == ROWS
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_iter_chunks():
+    async def numbers():
+        for number in range(5):
+            yield number
+
+    assert await collect(iter_chunks(numbers(), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_number_at_end_of_input_waits_for_more():
+    parser = JSONArrayParser()
+
+    assert parser.feed("[1, 2") == [1]
+    assert parser.feed("3]", final=True) == [23]
+
+
+@pytest.mark.parametrize(
+    "body", ['{"title": "x"}', "[1, 2", '[{"title": }]', "[1 2]", "[1] 2", "[1,]"]
+)
+def test_invalid_json_array(body):
+    parser = JSONArrayParser()
+
+    with pytest.raises(InvalidPayloadError):
+        parser.feed(body, final=True)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("anyio_backend")
+async def test_ingest_reports_conflicting_chunk():
+    inserted = []
+
+    async def insert(chunk):
+        if inserted:
+            raise IntegrityError("INSERT", {}, Exception("duplicate key value"))
+        inserted.extend(chunk)
+
+    async def receive():
+        body = json.dumps([{"title": f"course {i}"} for i in range(5)]).encode()
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = Request(
+        {"type": "http", "headers": [(b"content-type", b"application/json")]},
+        receive,
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await ingest(request, TypeAdapter(List[Dict[str, str]]), insert, 2)
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail["rows"] == 2
+    assert exc_info.value.detail["first_row"] == 2
+    assert exc_info.value.detail["last_row"] == 3
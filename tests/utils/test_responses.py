@@ -0,0 +1,44 @@
+import json
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from schemas import ModuleResponse
+from utils.responses import get_response_class, model_response
+
+
+class Row:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def test_model_response_serializes_attributes():
+    rows = [Row(id="8d7e4a3e-6a9f-4c3b-9a51-0c2e1f6b7d10", title="t", description=None)]
+
+    response = model_response(TypeAdapter(List[ModuleResponse]), rows, 201)
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == [
+        {"id": rows[0].id, "title": "t", "description": None}
+    ]
+
+
+def test_get_response_class(mocker):
+    mocker.patch("utils.responses._installed", return_value=True)
+
+    assert get_response_class("json") is JSONResponse
+    assert get_response_class("orjson") is ORJSONResponse
+    assert get_response_class("auto") is ORJSONResponse
+
+
+def test_get_response_class_rejects_unknown_or_missing(mocker):
+    mocker.patch("utils.responses._installed", side_effect=lambda name: name == "json")
+
+    assert get_response_class("auto") is JSONResponse
+    with pytest.raises(RuntimeError):
+        get_response_class("orjson")
+    with pytest.raises(ValueError):
+        get_response_class("ujson")
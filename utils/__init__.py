@@ -1,6 +1,19 @@
 from .decorators import check_super_user
-from .dependencies import get_db, verify_super_user
+from .dependencies import (
+    get_async_db,
+    get_async_sessionmaker,
+    get_db,
+    verify_super_user,
+)
 from .generate_uuid import generate_id
 from .tags import Tags
 
-__all__ = ["get_db", "verify_super_user", "generate_id", "Tags", "check_super_user"]
+__all__ = [
+    "get_db",
+    "get_async_db",
+    "get_async_sessionmaker",
+    "verify_super_user",
+    "generate_id",
+    "Tags",
+    "check_super_user",
+]
@@ -3,6 +3,8 @@ from typing import Callable
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from auth.cache import principal_cache
+from core.cache import MISSING
 from crud.users_crud import get_user_by_email
 from models.user_models import UserModel
 from schemas.auth_schemas import TokenData
@@ -11,9 +13,16 @@ from schemas.auth_schemas import TokenData
 def check_super_user(db: Session, current_user: TokenData):
     def get_user(function: Callable):
         def path_operation_function(*args, **kwargs):
-            user: UserModel = get_user_by_email(db, email_address=current_user.email)
+            is_super_user = principal_cache.get(current_user.email, MISSING)
 
-            if not user.is_super_user:
+            if is_super_user is MISSING:
+                user: UserModel = get_user_by_email(
+                    db, email_address=current_user.email
+                )
+                is_super_user = user.is_super_user
+                principal_cache.set(current_user.email, is_super_user)
+
+            if not is_super_user:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You do not have the right permissions",
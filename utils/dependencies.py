@@ -1,9 +1,12 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from auth.authenticate import get_current_user
-from crud.users_crud import get_user_by_email
-from models.session import SessionLocal
+from auth.authenticate import SUPER_USER_ROLE, get_current_user
+from auth.cache import principal_cache
+from core.cache import MISSING
+from core.settings import Settings
+from crud.aio.users_crud import get_user_by_email
+from models.session import AsyncSessionLocal, SessionLocal
 from models.user_models import UserModel
 from schemas.auth_schemas import TokenData
 
@@ -17,19 +20,49 @@ def get_db():
         db.close()
 
 
-def verify_super_user(
-    db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    # sessions from get_async_db are closed before a StreamingResponse body is
+    # sent, so streamed responses open their own from this factory
+    return AsyncSessionLocal
+
+
+async def verify_super_user(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_user),
 ):
-    user: UserModel = get_user_by_email(db, email_address=current_user.email)
+    # tokens issued at the current version carry a trusted role claim; older or
+    # claim-less tokens fall back to looking the user up
+    if current_user.role is not None and current_user.version == Settings.TOKEN_VERSION:
+        if current_user.role == SUPER_USER_ROLE:
+            return
 
-    if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have the right permissions",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not user.is_super_user:
+    is_super_user = principal_cache.get(current_user.email, MISSING)
+
+    if is_super_user is MISSING:
+        user: UserModel = await get_user_by_email(db, email_address=current_user.email)
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have the right permissions",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        is_super_user = user.is_super_user
+        principal_cache.set(current_user.email, is_super_user)
+
+    if not is_super_user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have the right permissions",
@@ -0,0 +1,74 @@
+"""Course catalog export formats."""
+
+import csv
+import io
+from enum import Enum
+from typing import Iterable
+
+from models import CourseModel
+from schemas import CourseResponse
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+# one flat row per course, module and subject prefixed by their name
+CSV_COLUMNS = (
+    "id",
+    "owner",
+    "title",
+    "slug",
+    "overview",
+    "created",
+    "module_id",
+    "module_title",
+    "module_description",
+    "subject_id",
+    "subject_title",
+    "subject_slug",
+)
+
+
+def render_ndjson(courses: Iterable[CourseModel]) -> bytes:
+    return b"".join(
+        CourseResponse.model_validate(course, from_attributes=True)
+        .model_dump_json()
+        .encode()
+        + b"\n"
+        for course in courses
+    )
+
+
+def render_csv(courses: Iterable[CourseModel], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if header:
+        writer.writerow(CSV_COLUMNS)
+
+    writer.writerows(
+        (
+            course.id,
+            course.owner,
+            course.title,
+            course.slug,
+            course.overview,
+            course.created.isoformat(),
+            course.module.id,
+            course.module.title,
+            course.module.description,
+            course.subject.id,
+            course.subject.title,
+            course.subject.slug,
+        )
+        for course in courses
+    )
+
+    return buffer.getvalue().encode()
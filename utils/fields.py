@@ -0,0 +1,70 @@
+"""Sparse fieldsets for list endpoints.
+
+``?fields=id,title`` narrows both what is read and what is sent: crud list
+functions restrict their ``SELECT`` to the requested columns with
+``load_only`` and the response is serialized through a schema holding only
+the requested fields. Nested objects such as a course's ``module`` are
+selected or left out whole.
+"""
+
+from functools import lru_cache
+from typing import AbstractSet, FrozenSet, List, Optional, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy.orm import Load, load_only
+
+FIELDS_DESCRIPTION = "Comma separated fields to return, e.g. id,title"
+
+
+def parse_fields(
+    value: Optional[str], schema: Type[BaseModel]
+) -> Optional[FrozenSet[str]]:
+    """The fields of ``schema`` named in ``value``; None means all of them."""
+    if value is None:
+        return None
+
+    fields = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = fields - schema.model_fields.keys()
+
+    if not fields or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Invalid fields {value!r}: expected a comma separated list of "
+                f"{', '.join(schema.model_fields)}"
+            ),
+        )
+
+    return fields
+
+
+@lru_cache(maxsize=256)
+def list_adapter(
+    schema: Type[BaseModel], fields: Optional[FrozenSet[str]] = None
+) -> TypeAdapter:
+    """Adapter serializing a list of rows as ``schema`` narrowed to ``fields``."""
+    if fields is not None:
+        schema = create_model(
+            f"{schema.__name__}Fields",
+            __config__=ConfigDict(from_attributes=True),
+            **{
+                name: (field.annotation, field)
+                for name, field in schema.model_fields.items()
+                if name in fields
+            },
+        )
+
+    return TypeAdapter(List[schema])
+
+
+def load_columns(model: type, fields: AbstractSet[str], *required: str) -> Load:
+    """``load_only`` option for the columns of ``model`` among ``fields``.
+
+    ``required`` columns, e.g. the pagination key, are loaded regardless;
+    names that are not columns of ``model`` (relationships) are skipped.
+    """
+    columns = model.__table__.columns.keys()
+    names = sorted(name for name in {*fields, *required} if name in columns)
+
+    return load_only(*(getattr(model, name) for name in names))
@@ -0,0 +1,241 @@
+"""Incremental ingestion of bulk request bodies.
+
+Bodies are read from ``request.stream()`` as they arrive and parsed element by
+element, either as NDJSON (one object per line) or as a single JSON array.
+Elements are grouped into chunks, each validated with a ``TypeAdapter`` and
+handed to an insert callable before the next chunk is read, so memory is
+bounded by the chunk size rather than by the size of the body.
+"""
+
+import codecs
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, List
+
+from fastapi import HTTPException, Request, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from core.exceptions import InvalidPayloadError
+from schemas.ingest_schemas import ChunkReport, IngestReport
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# an element still incomplete past this many characters is treated as invalid
+# instead of buffering the rest of the body looking for its end
+MAX_ELEMENT_SIZE = 1024 * 1024
+
+_WHITESPACE = " \t\r\n"
+
+# the body is read by the handler itself, so document it for OpenAPI by hand
+STREAMING_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {}}},
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+async def _decode(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    try:
+        async for chunk in stream:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+
+        text = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise InvalidPayloadError("Request body is not valid UTF-8") from exc
+
+    if text:
+        yield text
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise InvalidPayloadError(f"Invalid JSON line: {exc}") from exc
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    buffer = ""
+
+    async for text in _decode(stream):
+        *lines, buffer = (buffer + text).split("\n")
+
+        for line in lines:
+            if line.strip():
+                yield _loads(line)
+
+        if len(buffer) > MAX_ELEMENT_SIZE:
+            raise InvalidPayloadError("NDJSON line exceeds the maximum size")
+
+    if buffer.strip():
+        yield _loads(buffer)
+
+
+class JSONArrayParser:
+    """Push parser yielding the elements of a top level JSON array.
+
+    Each element is decoded with the C accelerated ``raw_decode`` once its
+    text is complete; only the unparsed tail of the input is kept.
+    """
+
+    def __init__(self) -> None:
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        # "start" -> "first" -> ("separator" <-> "value") -> "end"
+        self.state = "start"
+
+    def feed(self, text: str, final: bool = False) -> List[Any]:
+        buffer = self.buffer + text
+        items, pos = [], 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+
+            if self.state == "start":
+                if char != "[":
+                    raise InvalidPayloadError("Request body is not a JSON array")
+                self.state, pos = "first", pos + 1
+            elif self.state == "separator" or (self.state == "first" and char == "]"):
+                if char == "]":
+                    self.state, pos = "end", pos + 1
+                elif char == ",":
+                    self.state, pos = "value", pos + 1
+                else:
+                    raise InvalidPayloadError(f"Expected ',' or ']' at {char!r}")
+            elif self.state in ("first", "value"):
+                try:
+                    item, end = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if final or len(buffer) - pos > MAX_ELEMENT_SIZE:
+                        raise InvalidPayloadError(f"Invalid JSON: {exc}") from exc
+                    break
+
+                # a number or literal running into the end of the input may
+                # continue in the next chunk
+                if end == len(buffer) and not final:
+                    break
+
+                items.append(item)
+                self.state, pos = "separator", end
+            else:
+                raise InvalidPayloadError("Unexpected data after the JSON array")
+
+        self.buffer = buffer[pos:]
+
+        if final and self.state != "end":
+            raise InvalidPayloadError("Request body ended inside the JSON array")
+
+        return items
+
+
+async def iter_json_array(stream: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    parser = JSONArrayParser()
+
+    async for text in _decode(stream):
+        for item in parser.feed(text):
+            yield item
+
+    for item in parser.feed("", final=True):
+        yield item
+
+
+async def iter_chunks(items: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    chunk = []
+
+    async for item in items:
+        chunk.append(item)
+
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+async def ingest(
+    request: Request,
+    adapter: TypeAdapter,
+    insert: Callable[[List[Any]], Awaitable[Any]],
+    chunk_size: int,
+) -> IngestReport:
+    """Validate and ``insert`` the request body one chunk at a time.
+
+    Chunks are committed as they go: on a malformed body, a validation error
+    or a chunk conflicting with existing rows the response reports how many
+    rows were inserted before it. The failing chunk itself is rolled back.
+    """
+    content_type = request.headers.get("content-type", "")
+    parse = (
+        iter_ndjson if content_type.startswith(NDJSON_MEDIA_TYPE) else iter_json_array
+    )
+    chunks: List[ChunkReport] = []
+    rows, start = 0, time.perf_counter()
+
+    try:
+        async for chunk in iter_chunks(parse(request.stream()), chunk_size):
+            chunk_start = time.perf_counter()
+            await insert(adapter.validate_python(chunk))
+            seconds = time.perf_counter() - chunk_start
+
+            rows += len(chunk)
+            chunks.append(
+                ChunkReport(
+                    rows=len(chunk),
+                    seconds=seconds,
+                    rows_per_second=len(chunk) / seconds if seconds else 0.0,
+                )
+            )
+    except InvalidPayloadError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": str(exc), "rows": rows},
+        ) from exc
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": f"Invalid row in the chunk starting at row {rows}",
+                "rows": rows,
+                "errors": exc.errors(include_url=False, include_context=False),
+            },
+        ) from exc
+    except IntegrityError as exc:
+        # rows of a chunk are inserted together, so the conflict is only known
+        # to be within the chunk
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": (
+                    f"A row in rows {rows} to {rows + len(chunk) - 1} conflicts "
+                    "with existing data"
+                ),
+                "rows": rows,
+                "first_row": rows,
+                "last_row": rows + len(chunk) - 1,
+            },
+        ) from exc
+
+    seconds = time.perf_counter() - start
+
+    return IngestReport(
+        rows=rows,
+        seconds=seconds,
+        rows_per_second=rows / seconds if seconds else 0.0,
+        chunks=chunks,
+    )
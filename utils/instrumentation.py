@@ -0,0 +1,84 @@
+"""Per-request instrumentation middleware.
+
+Besides the timings of ``core.instrumentation`` it records the request
+metrics served on ``/metrics``: latency, body sizes and requests in flight.
+
+Written as plain ASGI rather than ``BaseHTTPMiddleware`` so that it adds
+no task or body buffering of its own, and so that streamed responses are
+timed until their last chunk is sent.
+"""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.instrumentation import (
+    RequestTimings,
+    current_timings,
+    route_name,
+    route_stats,
+)
+from core.settings import Settings
+from utils.metrics import (
+    request_duration,
+    request_size,
+    requests_in_flight,
+    requests_total,
+    response_size,
+)
+
+
+class InstrumentationMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope)
+        token = current_timings.set(timings)
+        method = scope["method"]
+        # request and response body bytes
+        sizes = [0, 0]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def receive_counting() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes[0] += len(message.get("body", b""))
+            return message
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if Settings.SERVER_TIMING:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        timings.server_timing(time.perf_counter() - start),
+                    )
+            elif message["type"] == "http.response.body":
+                sizes[1] += len(message.get("body", b""))
+            await send(message)
+
+        requests_in_flight.inc(labels=(method,))
+        try:
+            await self.app(scope, receive_counting, send_with_timing)
+        finally:
+            wall = time.perf_counter() - start
+            route = route_name(scope)
+            labels = (method, route)
+
+            requests_in_flight.dec(labels=(method,))
+            requests_total.inc(labels=(method, route, str(status_code)))
+            request_duration.observe(wall, labels)
+            request_size.observe(sizes[0], labels)
+            response_size.observe(sizes[1], labels)
+            route_stats.record(route, wall, timings)
+            current_timings.reset(token)
@@ -0,0 +1,94 @@
+import uuid
+from typing import Any, Dict, List
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.hashing import get_password_hashes_async
+from core.jobs import JobQueue, create_job_store
+from core.settings import Settings
+from crud.aio.courses_import import db_import_courses
+from models.session import AsyncSessionLocal
+from models.user_models import UserModel
+from schemas import CourseBase
+from schemas.job_schemas import JobStatus
+
+COURSES_JOB = "courses"
+USERS_JOB = "users"
+
+_courses = TypeAdapter(List[CourseBase])
+
+
+async def import_courses(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    _, report = await db_import_courses(db, _courses.validate_python(rows))
+    return report.rows
+
+
+# password reference -> password of a queued user, kept out of the job store
+_passwords: Dict[str, str] = {}
+
+
+async def create_users(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    # every row is looked up, so that a failed batch leaves none behind
+    passwords = [_passwords.pop(row["password"], None) for row in rows]
+
+    if None in passwords:
+        raise LookupError("Passwords of the queued users are no longer available")
+
+    hashes = await get_password_hashes_async(passwords)
+    db.add_all(
+        [
+            UserModel(**{**row, "password": password_hash})
+            for row, password_hash in zip(rows, hashes)
+        ]
+    )
+    await db.commit()
+    return len(rows)
+
+
+def users_payload(users: List[BaseModel]) -> List[Dict[str, Any]]:
+    """Users rows as queued, with references in place of the passwords."""
+    rows = []
+
+    for user in users:
+        reference = uuid.uuid4().hex
+        _passwords[reference] = user.password
+        rows.append({**user.model_dump(mode="json"), "password": reference})
+
+    return rows
+
+
+job_queue = JobQueue(
+    create_job_store(
+        Settings.JOB_QUEUE_BACKEND,
+        Settings.JOB_QUEUE_PATH,
+        Settings.JOB_LEASE_SECONDS,
+    ),
+    session_factory=AsyncSessionLocal,
+    workers=Settings.JOB_WORKERS,
+)
+job_queue.register(COURSES_JOB, import_courses)
+# the passwords only exist in the memory of the process that accepted the job
+job_queue.register(USERS_JOB, create_users, pinned=True)
+
+
+async def accept_job(kind: str, rows: List[BaseModel]) -> Response:
+    """Queue ``rows`` as a ``kind`` job and answer 202 with where to poll it.
+
+    Rows wait in the job store as JSON until a worker takes their batch.
+    """
+    if kind == USERS_JOB:
+        payload = users_payload(rows)
+    else:
+        payload = [row.model_dump(mode="json") for row in rows]
+
+    job_id = await job_queue.submit(kind, payload, Settings.JOB_BATCH_SIZE)
+    job = JobStatus(**await job_queue.get(job_id))
+
+    return Response(
+        content=job.model_dump_json(),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/jobs/{job_id}"},
+        media_type="application/json",
+    )
@@ -0,0 +1,138 @@
+"""Application metrics served on ``/metrics``.
+
+Request metrics are recorded by ``InstrumentationMiddleware``; connection
+pool, password hashing and cache metrics are copied from the statistics
+those components already keep whenever a snapshot is taken.
+"""
+
+from auth.cache import principal_cache, token_cache
+from auth.hashing import hashing_pool
+from core.metrics import LIVEALL, Exporter, Registry
+from core.settings import Settings
+from models.session import async_pool_metrics, pool_metrics
+from utils.response_cache import response_cache
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+registry = Registry()
+
+requests_total = registry.counter(
+    "http_requests_total", "HTTP requests", ("method", "route", "status")
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body chunk is sent",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+request_size = registry.histogram(
+    "http_request_size_bytes",
+    "HTTP request body size",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+response_size = registry.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests being handled", ("method",)
+)
+
+pool_gauges = {
+    stat: registry.gauge(f"db_pool_{stat}", f"Database pool {description}", ("engine",))
+    for stat, description in (
+        ("size", "size"),
+        ("checked_out", "connections checked out"),
+        ("idle", "idle connections"),
+        ("overflow", "overflow connections"),
+    )
+}
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Database connection checkouts", ("engine",)
+)
+pool_connects = registry.counter(
+    "db_pool_connects_total", "Database connections opened", ("engine",)
+)
+
+hashing_queue_depth = registry.gauge(
+    "hashing_queue_depth", "Password hashes waiting for a bcrypt worker"
+)
+hashing_in_flight = registry.gauge(
+    "hashing_in_flight", "Password hashes queued or running"
+)
+hashing_completed = registry.counter(
+    "hashing_completed_total", "Password hashes computed"
+)
+hashing_rejected = registry.counter(
+    "hashing_rejected_total", "Password hashes refused by a full queue"
+)
+
+cache_hits = registry.counter("cache_hits_total", "Cache hits", ("cache",))
+cache_misses = registry.counter("cache_misses_total", "Cache misses", ("cache",))
+cache_hit_ratio = registry.gauge(
+    "cache_hit_ratio", "Cache hit ratio of a worker", ("cache",), mode=LIVEALL
+)
+
+
+@registry.collector
+def collect_pools() -> None:
+    for engine, metrics in (("sync", pool_metrics), ("async", async_pool_metrics)):
+        stats = metrics.stats()
+
+        for stat, gauge in pool_gauges.items():
+            # pools without a size (SQLite) leave these unset
+            if stats[stat] is not None:
+                gauge.set(stats[stat], (engine,))
+        pool_checkouts.set(stats["checkouts"], (engine,))
+        pool_connects.set(stats["connects"], (engine,))
+
+
+@registry.collector
+def collect_hashing() -> None:
+    stats = hashing_pool.stats()
+    hashing_queue_depth.set(stats["queue_depth"])
+    hashing_in_flight.set(stats["in_flight"])
+    hashing_completed.set(stats["completed"])
+    hashing_rejected.set(stats["rejected"])
+
+
+@registry.collector
+def collect_caches() -> None:
+    for name, stats in (
+        (token_cache.name, token_cache.stats()),
+        (principal_cache.name, principal_cache.stats()),
+        ("responses", response_cache.stats()),
+    ):
+        cache_hits.set(stats["hits"], (name,))
+        cache_misses.set(stats["misses"], (name,))
+        cache_hit_ratio.set(stats["hit_ratio"], (name,))
+
+
+exporter = Exporter(registry, Settings.METRICS_MULTIPROC_DIR)
+
+
+def start_metrics() -> None:
+    """Share this worker's metrics with the others, in multi-process mode."""
+    exporter.start(Settings.METRICS_FLUSH_SECONDS)
+
+
+async def stop_metrics() -> None:
+    await exporter.stop()
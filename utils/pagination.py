@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination helpers.
+
+Pages are ordered by a unique, stable key such as ``(created, id)`` and each
+page continues strictly after the key of the previous page's last row, so a
+page costs O(limit) regardless of how deep the client has paged.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.exceptions import InvalidCursorError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the key of the last row of a page into an opaque token."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, columns: Sequence[InstrumentedAttribute]
+) -> Sequence[Any]:
+    """Decode a token produced by ``encode_cursor`` for the given key columns."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursorError()
+
+        return [
+            (
+                datetime.fromisoformat(value)
+                if isinstance(column.type, DateTime)
+                else value
+            )
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError() from exc
+
+
+def paginate(
+    statement: Select,
+    columns: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Select:
+    """Restrict ``statement`` to the page of ``limit`` rows following ``cursor``."""
+    if cursor is not None:
+        statement = statement.where(
+            tuple_(*columns) > tuple_(*decode_cursor(cursor, columns))
+        )
+
+    return statement.order_by(*columns).limit(limit)
+
+
+def next_cursor(
+    items: Sequence[Any], limit: int, columns: Sequence[InstrumentedAttribute]
+) -> Optional[str]:
+    """Return the cursor of the page after ``items``, or None on the last page."""
+    if len(items) < limit:
+        return None
+
+    last = items[-1]
+    return encode_cursor(*(getattr(last, column.key) for column in columns))
+
+
+def set_next_cursor(
+    response: Response,
+    items: Sequence[Any],
+    limit: int,
+    columns: Sequence[InstrumentedAttribute],
+) -> None:
+    """Advertise the cursor of the next page, if any, in the response headers."""
+    cursor = next_cursor(items, limit, columns)
+
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,111 @@
+"""Per-request profiling with ``?profile=1``.
+
+The app-wide ``authorize_profile`` dependency checks that the caller of a
+request carrying ``profile=1`` is a super user and only then starts sampling
+the worker. ``ProfileMiddleware`` stops the profiler once the request is
+handled and sends the speedscope profile in place of the response. Requests
+that fail the check get its 401 or 403 and are never sampled; streamed
+responses, e.g. ``/courses/export``, are sent as they are, unprofiled.
+"""
+
+import json
+from typing import Annotated, Optional
+from urllib.parse import parse_qs
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from auth.authenticate import get_current_user
+from core.profiler import ProfilerBusyError, SamplingProfiler
+from core.settings import Settings
+from utils.dependencies import get_async_sessionmaker, verify_super_user
+
+PROFILE_PARAMETER = "profile"
+
+# unlike oauth2_scheme, lets the requests that are not profiled through
+profile_scheme = OAuth2PasswordBearer(tokenUrl="/user/login", auto_error=False)
+
+
+async def authorize_profile(
+    request: Request,
+    token: Annotated[Optional[str], Depends(profile_scheme)],
+    sessionmaker: Annotated[async_sessionmaker, Depends(get_async_sessionmaker)],
+) -> None:
+    if request.query_params.get(PROFILE_PARAMETER) != "1":
+        return
+
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # a session of its own, so that requests which are not profiled do not
+    # check a connection out for this dependency
+    async with sessionmaker() as db:
+        await verify_super_user(db, get_current_user(token))
+
+    profiler = SamplingProfiler(Settings.PROFILER_INTERVAL_MS / 1000)
+    try:
+        profiler.start()
+    except ProfilerBusyError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+
+    request.state.profiler = profiler
+
+
+class ProfileMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or parse_qs(
+            scope["query_string"].decode("latin-1")
+        ).get(PROFILE_PARAMETER) != ["1"]:
+            await self.app(scope, receive, send)
+            return
+
+        def running() -> Optional[SamplingProfiler]:
+            return scope.get("state", {}).get("profiler")
+
+        async def replace(message: Message) -> None:
+            profiler = running()
+
+            if profiler is not None and message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                # streamed responses can be too long to sample and discard
+                if b"content-length" not in headers:
+                    profiler.stop()
+                    scope["state"]["profiler"] = profiler = None
+
+            # the profiled response is discarded
+            if profiler is None:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, replace)
+        finally:
+            profiler = running()
+            if profiler is not None:
+                profiler.stop()
+
+        if profiler is None:
+            return
+
+        content = json.dumps(
+            profiler.speedscope(f"{scope['method']} {scope['path']}")
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status.HTTP_200_OK,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
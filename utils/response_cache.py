@@ -0,0 +1,87 @@
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from core.cache_backend import CacheBackend, create_cache_backend
+from core.instrumentation import record_serialization
+from core.settings import Settings
+from utils.conditional import conditional_response, make_etag
+
+
+class ResponseCache:
+    """Read-through cache of serialized responses, keyed by namespace and ID.
+
+    Entries hold the JSON body exactly as it is sent, preceded by a line with
+    its ETag and Last-Modified validators, so a hit costs neither a database
+    round trip nor a serialization pass. Handlers that change a row must call
+    ``invalidate`` for every namespace whose bodies embed it.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def read_through(
+        self,
+        request: Request,
+        namespace: str,
+        key: str,
+        schema: Type[BaseModel],
+        load: Callable[[], Awaitable[Any]],
+        last_modified: Optional[Callable[[Any], Optional[datetime]]] = None,
+    ) -> Optional[Response]:
+        entry: Optional[bytes] = await self.backend.get(f"{namespace}:{key}")
+
+        if entry is None:
+            self.misses += 1
+            instance = await load()
+
+            if instance is None:
+                return None
+
+            start = time.perf_counter()
+            body = (
+                schema.model_validate(instance, from_attributes=True)
+                .model_dump_json()
+                .encode()
+            )
+            record_serialization(time.perf_counter() - start)
+            etag = make_etag(body)
+            modified = last_modified(instance) if last_modified else None
+            entry = b"%s %s\n%s" % (
+                etag.encode(),
+                modified.isoformat().encode() if modified else b"-",
+                body,
+            )
+            await self.backend.set(f"{namespace}:{key}", entry, self.ttl)
+        else:
+            self.hits += 1
+            validators, body = entry.split(b"\n", 1)
+            etag, stamp = validators.decode().split(" ")
+            modified = None if stamp == "-" else datetime.fromisoformat(stamp)
+
+        return conditional_response(request, body, etag=etag, last_modified=modified)
+
+    async def invalidate(self, namespace: str, *keys: Any) -> None:
+        await self.backend.delete(*(f"{namespace}:{key}" for key in keys))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    create_cache_backend(Settings.RESPONSE_CACHE_URL, Settings.RESPONSE_CACHE_SIZE),
+    ttl=Settings.RESPONSE_CACHE_TTL,
+)
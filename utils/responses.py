@@ -0,0 +1,73 @@
+"""JSON response rendering.
+
+Routes answer with ``model_response``: the ORM rows are validated once into
+the response schema and pydantic-core writes the JSON bytes straight from the
+validated models. Returning the rows and leaving it to ``response_model``
+costs a validation pass, a ``model_dump`` into plain Python objects and a
+third pass in the response class to encode those.
+
+The default response class only renders what routes still hand to FastAPI
+as Python objects (error details, plain dicts), for which orjson or msgspec
+are much faster encoders than the standard library.
+"""
+
+import importlib.util
+from typing import Any, Dict, Mapping, Optional, Type
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from utils.conditional import dump_json
+
+
+class MsgspecJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        import msgspec
+
+        return msgspec.json.encode(content)
+
+
+RESPONSE_CLASSES: Dict[str, Type[JSONResponse]] = {
+    "orjson": ORJSONResponse,
+    "msgspec": MsgspecJSONResponse,
+    "json": JSONResponse,
+}
+
+
+def _installed(name: str) -> bool:
+    return name == "json" or importlib.util.find_spec(name) is not None
+
+
+def get_response_class(name: str) -> Type[JSONResponse]:
+    """Response class for ``name``: "orjson", "msgspec", "json" or "auto".
+
+    "auto" picks the first of those whose package is installed.
+    """
+    if name == "auto":
+        name = next(name for name in RESPONSE_CLASSES if _installed(name))
+
+    if name not in RESPONSE_CLASSES:
+        raise ValueError(f"Unknown JSON response class: {name!r}")
+
+    if not _installed(name):
+        raise RuntimeError(
+            f"The {name} JSON response class requires the {name} package"
+        )
+
+    return RESPONSE_CLASSES[name]
+
+
+def model_response(
+    adapter: TypeAdapter,
+    instance: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Answer with ``instance`` serialized through ``adapter``."""
+    return Response(
+        content=dump_json(adapter, instance),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -6,3 +6,7 @@ class Tags(Enum):
     subjects = "Subjects"
     modules = "Modules"
     users = "Users"
+    admin = "Admin"
+    jobs = "Jobs"
+    autocomplete = "Autocomplete"
+    metrics = "Metrics"